@@ -0,0 +1,3 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
@@ -0,0 +1,97 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: apply_overrides.py
+
+Brief: Compares time and peak memory for generating documentation with DocFormatter.apply_overrides
+as it is (a shallow overlay) and with the deep copy it replaced.
+
+Run from the doc-generator directory, against a synthetic tree:
+
+    python -m benchmarks.apply_overrides
+
+or against a schema bundle (a directory of Redfish JSON schemas):
+
+    python -m benchmarks.apply_overrides --schemas /path/to/DSP8010/json-schema
+"""
+
+import argparse
+import copy
+import os
+import tempfile
+import time
+import tracemalloc
+import warnings
+from unittest.mock import patch
+from benchmarks import synthetic_corpus
+from doc_formatter import DocFormatter
+from doc_generator import DocGenerator
+
+apply_overrides = DocFormatter.apply_overrides
+
+
+def deepcopy_apply_overrides(self, prop_info, schema_name=None, prop_name=None):
+    """ The deep-copying apply_overrides, for comparison """
+    return apply_overrides(self, copy.deepcopy(prop_info), schema_name, prop_name)
+
+
+def generate(schema_dir, output_format):
+    """ Generate documentation for schema_dir; return (seconds, peak bytes allocated, output) """
+    config = {'output_format': output_format,
+              'excluded_by_match': ['@odata.count', '@odata.navigationLink'],
+              'excluded_annotations_by_match': ['@odata.count', '@odata.navigationLink'],
+              'excluded_properties': ['@odata.id', '@odata.context', '@odata.type'],
+              'excluded_schemas': [],
+              'profile': {},
+              'escape_chars': [],
+              'units_translation': {'s': 'seconds', 'W': 'Watts'},
+              'property_description_overrides': {'Property0': 'The first property.', 'Name': 'The name.'},
+              'uri_to_local': {'redfish.dmtf.org/schemas/v1': schema_dir},
+              'local_to_uri': {schema_dir: 'redfish.dmtf.org/schemas/v1'}}
+    doc_gen = DocGenerator([schema_dir], os.devnull, config)
+    tracemalloc.start()
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        output = doc_gen.generate_docs()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, output
+
+
+def compare(schema_dir, output_format):
+    with patch.object(DocFormatter, 'apply_overrides', deepcopy_apply_overrides):
+        deep_time, deep_peak, deep_output = generate(schema_dir, output_format)
+    time_taken, peak, output = generate(schema_dir, output_format)
+    assert output == deep_output, 'output differs'
+    print('%-9s %12.2f %12.2f %16.1f %16.1f' % (output_format, deep_time, time_taken,
+                                                deep_peak / 1048576, peak / 1048576))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time apply_overrides: shallow overlay against deep copy.')
+    parser.add_argument('--schemas', help='Directory of schemas to document. Default: a synthetic tree.')
+    parser.add_argument('--resources', type=int, default=60, help='Resources in the synthetic tree.')
+    parser.add_argument('--versions', type=int, default=8, help='Versions of each synthetic resource.')
+    parser.add_argument('--format', dest='formats', action='append', choices=['markdown', 'html', 'csv'],
+                        help='Output format(s) to compare. Default: markdown and html.')
+    args = parser.parse_args()
+    formats = args.formats or ['markdown', 'html']
+
+    print('%-9s %12s %12s %16s %16s' % ('format', 'deepcopy sec', 'overlay sec', 'deepcopy peak MB', 'overlay peak MB'))
+    if args.schemas:
+        for output_format in formats:
+            compare(os.path.abspath(args.schemas), output_format)
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        synthetic_corpus.write_corpus(tmpdir, args.resources, args.versions)
+        for output_format in formats:
+            compare(tmpdir, output_format)
+
+
+if __name__ == '__main__':
+    main()
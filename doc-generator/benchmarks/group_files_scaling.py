@@ -0,0 +1,65 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: group_files_scaling.py
+
+Brief: Times DocGenerator.group_files on synthetic schema trees of increasing size.
+
+Run from the doc-generator directory:
+
+    python -m benchmarks.group_files_scaling
+
+Time per file should stay roughly flat as the tree grows (that is, grouping is linear).
+Files are loaded once before timing, so the schema cache takes JSON decoding out of
+the picture and the numbers reflect grouping itself.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from benchmarks import synthetic_corpus
+from doc_gen_util import DocGenUtilities
+from doc_generator import DocGenerator
+
+
+def time_grouping(num_files, num_versions=4):
+    """ Build a corpus of about num_files files and return (files, seconds) for group_files """
+    num_resources = max(1, num_files // (num_versions + 1))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        count = synthetic_corpus.write_corpus(tmpdir, num_resources, num_versions)
+        config = {'local_to_uri': {tmpdir: 'redfish.dmtf.org/schemas/v1'},
+                  'uri_to_local': {'redfish.dmtf.org/schemas/v1': tmpdir}}
+        doc_gen = DocGenerator([tmpdir], os.devnull, config)
+        files = doc_gen.get_files([tmpdir])
+
+        DocGenUtilities.schema_cache.clear()
+        DocGenUtilities.schema_cache.max_entries = count
+        for filename in files:
+            DocGenUtilities.load_as_json(filename)
+
+        start = time.perf_counter()
+        doc_gen.group_files(files)
+        elapsed = time.perf_counter() - start
+        DocGenUtilities.schema_cache.clear()
+
+    return count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time DocGenerator.group_files against synthetic schema trees.')
+    parser.add_argument('sizes', metavar='N', type=int, nargs='*',
+                        default=[1250, 2500, 5000, 10000, 20000],
+                        help='Approximate number of files for each run.')
+    args = parser.parse_args()
+
+    print('%8s %10s %12s' % ('files', 'seconds', 'usec/file'))
+    for size in args.sizes:
+        count, elapsed = time_grouping(size)
+        print('%8d %10.3f %12.1f' % (count, elapsed, 1000000 * elapsed / count))
+
+
+if __name__ == '__main__':
+    main()
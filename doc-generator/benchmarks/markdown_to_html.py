@@ -0,0 +1,89 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: markdown_to_html.py
+
+Brief: Compares time for generating HTML documentation with HtmlUtils.markdown_to_html as it is
+(one reused converter and an LRU of converted fragments) and with a new converter for every call.
+
+Run from the doc-generator directory, against a synthetic tree:
+
+    python -m benchmarks.markdown_to_html
+
+or against a schema bundle (a directory of Redfish JSON schemas):
+
+    python -m benchmarks.markdown_to_html --schemas /path/to/DSP8010/json-schema
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import warnings
+from unittest.mock import patch
+from benchmarks import synthetic_corpus
+from doc_generator import DocGenerator
+from format_utils import HtmlUtils
+
+
+def uncached_markdown_to_html(self, markdown_blob, **args):
+    """ markdown_to_html with a new converter for every call and no cache, for comparison """
+    self.markdown = None
+    html_blob, headings = self._markdown_to_html(markdown_blob, **args)
+    if headings:
+        self.add_headings(headings)
+    return html_blob
+
+
+def generate(schema_dir):
+    """ Generate HTML documentation for schema_dir; return (seconds, output, cache stats) """
+    config = {'output_format': 'html',
+              'excluded_by_match': ['@odata.count', '@odata.navigationLink'],
+              'excluded_annotations_by_match': ['@odata.count', '@odata.navigationLink'],
+              'excluded_properties': ['@odata.id', '@odata.context', '@odata.type'],
+              'excluded_schemas': [],
+              'profile': {},
+              'escape_chars': [],
+              'units_translation': {'s': 'seconds', 'W': 'Watts'},
+              'uri_to_local': {'redfish.dmtf.org/schemas/v1': schema_dir},
+              'local_to_uri': {schema_dir: 'redfish.dmtf.org/schemas/v1'}}
+    doc_gen = DocGenerator([schema_dir], os.devnull, config)
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        output = doc_gen.generate_docs()
+    elapsed = time.perf_counter() - start
+    stats = doc_gen.cache_stats().get('markdown_to_html', {})
+    return elapsed, output, stats
+
+
+def compare(schema_dir):
+    with patch.object(HtmlUtils, 'markdown_to_html', uncached_markdown_to_html):
+        uncached_time, uncached_output, _ = generate(schema_dir)
+    time_taken, output, stats = generate(schema_dir)
+    assert output == uncached_output, 'output differs'
+    calls = stats.get('hits', 0) + stats.get('misses', 0)
+    print('%14.2f %12.2f %10d %10d' % (uncached_time, time_taken, calls, stats.get('hits', 0)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time markdown_to_html: cached against a new converter per call.')
+    parser.add_argument('--schemas', help='Directory of schemas to document. Default: a synthetic tree.')
+    parser.add_argument('--resources', type=int, default=60, help='Resources in the synthetic tree.')
+    parser.add_argument('--versions', type=int, default=8, help='Versions of each synthetic resource.')
+    args = parser.parse_args()
+
+    print('%14s %12s %10s %10s' % ('uncached sec', 'cached sec', 'calls', 'hits'))
+    if args.schemas:
+        compare(os.path.abspath(args.schemas))
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        synthetic_corpus.write_corpus(tmpdir, args.resources, args.versions)
+        compare(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: metadata_merge.py
+
+Brief: Measures version comparison and metadata merge throughput: Version against the string-splitting
+comparison it replaced, and DocFormatter.merge_full_metadata on metadata trees shaped like those
+DocGenerator builds for a schema's versions.
+
+Run from the doc-generator directory:
+
+    python -m benchmarks.metadata_merge
+"""
+
+import argparse
+import functools
+import timeit
+from doc_formatter import DocFormatter
+from doc_gen_util import Version
+
+
+def legacy_compare_versions(version, context_version):
+    """ The string comparison Version replaced (which ordered "10" before "9") """
+    if version == context_version:
+        return 0
+    version_parts = version.split('_' if '_' in version else '.')
+    context_parts = context_version.split('_' if '_' in context_version else '.')
+    for i in range(3):
+        if version_parts[i] > context_parts[i]:
+            return 1
+        if version_parts[i] < context_parts[i]:
+            return -1
+    return 0
+
+
+def make_metadata(num_props, depth, version_offset):
+    """ Metadata for num_props properties, each with nested objects depth levels deep """
+    meta = {'version': '1.%d.0' % version_offset}
+    for i in range(num_props):
+        node = meta.setdefault('Property%d' % i, {'version': '1.%d.0' % ((i + version_offset) % 15)})
+        for level in range(depth):
+            node = node.setdefault('Nested%d' % level, {'version': '1.%d.%d' % (level + version_offset, i % 3)})
+        if i % 5 == 0:
+            node['version_deprecated'] = '1.%d.0' % (12 + version_offset)
+            node['version_deprecated_explanation'] = 'Deprecated in favor of Property%d.' % (i + 1)
+    return meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time version comparisons and metadata merges.')
+    parser.add_argument('--props', type=int, default=200, help='Properties per metadata tree.')
+    parser.add_argument('--depth', type=int, default=3, help='Nesting depth of each property.')
+    parser.add_argument('--number', type=int, default=20, help='Merges per measurement.')
+    args = parser.parse_args()
+
+    versions = ['1.%d.%d' % (minor, errata) for minor in range(20) for errata in range(3)]
+    versions += ['v1_%d_%d' % (minor, errata) for minor in range(20) for errata in range(3)]
+    dotted = [x.lstrip('v').replace('_', '.') for x in versions]
+    legacy_sort = min(timeit.repeat(lambda: sorted(dotted, key=functools.cmp_to_key(legacy_compare_versions)),
+                                    number=200, repeat=3))
+    version_sort = min(timeit.repeat(lambda: sorted(versions, key=Version.parse), number=200, repeat=3))
+    print('sort %d versions:   legacy %8.1f usec   Version %8.1f usec' %
+          (len(versions), legacy_sort * 1000000 / 200, version_sort * 1000000 / 200))
+
+    formatter = DocFormatter.__new__(DocFormatter)
+    meta_a = make_metadata(args.props, args.depth, 0)
+    meta_b = make_metadata(args.props, args.depth, 1)
+    merge = min(timeit.repeat(lambda: formatter.merge_full_metadata(meta_a, meta_b), number=args.number, repeat=3))
+    nodes = args.props * (args.depth + 1) + 1
+    print('merge_full_metadata: %d nodes, %.2f msec per merge, %.0f nodes/sec' %
+          (nodes, merge * 1000 / args.number, nodes * args.number / merge))
+
+
+if __name__ == '__main__':
+    main()
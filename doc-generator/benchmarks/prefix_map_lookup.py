@@ -0,0 +1,62 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: prefix_map_lookup.py
+
+Brief: Compares PrefixMap lookups with a linear startswith scan of a URI mapping, as the number
+of mapped repositories grows.
+
+Run from the doc-generator directory:
+
+    python -m benchmarks.prefix_map_lookup
+"""
+
+import argparse
+import timeit
+from doc_gen_util import PrefixMap
+
+
+def make_mapping(num_mappings):
+    """ The DMTF repository plus num_mappings - 1 OEM repositories, as uri_to_local would have them """
+    mapping = {'redfish.dmtf.org/schemas/v1': '/schemas/dmtf'}
+    for i in range(1, num_mappings):
+        mapping['oem%04d.example.com/redfish/schemas/v1' % i] = '/schemas/oem%04d' % i
+    return mapping
+
+
+def linear_scan(mapping, uri):
+    """ The lookup PrefixMap replaces: first key (in dict order) that is a prefix of uri """
+    for partial_uri in mapping.keys():
+        if uri.startswith(partial_uri):
+            return partial_uri, mapping[partial_uri]
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time longest-prefix lookups against a linear scan.')
+    parser.add_argument('sizes', metavar='N', type=int, nargs='*', default=[1, 10, 50, 200, 1000],
+                        help='Numbers of mappings to try.')
+    parser.add_argument('--lookups', type=int, default=100000, help='Lookups per measurement.')
+    args = parser.parse_args()
+
+    print('%8s %14s %14s' % ('mappings', 'scan usec', 'prefix usec'))
+    for size in args.sizes:
+        mapping = make_mapping(size)
+        prefix_map = PrefixMap(mapping)
+        # A mix of DMTF refs, OEM refs (the last-mapped repo is the worst case for a scan), and unmapped refs.
+        uris = ['redfish.dmtf.org/schemas/v1/Resource.json',
+                'oem%04d.example.com/redfish/schemas/v1/OemChassis.v1_0_0.json' % (size - 1),
+                'unmapped.example.org/schemas/Thing.json']
+        for uri in uris:
+            assert linear_scan(mapping, uri) == prefix_map.longest_match(uri)
+
+        scan = min(timeit.repeat(lambda: [linear_scan(mapping, x) for x in uris], number=args.lookups // 3, repeat=3))
+        prefix = min(timeit.repeat(lambda: [prefix_map.longest_match(x) for x in uris], number=args.lookups // 3, repeat=3))
+        per_lookup = 1000000.0 / (3 * (args.lookups // 3))
+        print('%8d %14.2f %14.2f' % (size, scan * per_lookup, prefix * per_lookup))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: suite.py
+
+Brief: Benchmark scenarios for the main stages of a doc-generator run (grouping, schema processing,
+$ref traversal, markdown/HTML/CSV rendering, and the property index), over a synthetic corpus,
+compared against stored baselines.
+
+Run from the doc-generator directory:
+
+    python -m benchmarks.suite                        # compare with benchmarks/baselines/default.json
+    python -m benchmarks.suite --corpus large         # a bigger corpus, with its own baseline
+    python -m benchmarks.suite --save                 # record new baselines
+    python -m benchmarks.suite --scenario render_html --repeat 5
+
+Each scenario is timed on its own, with the schema files already decoded, so JSON parsing stays out
+of the numbers. A measurement averages as many runs as fit in 0.2 seconds, and the best of --repeat
+measurements is reported. The exit status is 1 if any scenario takes longer than
+--threshold times its baseline. Baselines are only comparable on the machine that recorded them;
+re-record them (--save) when moving to a new one.
+"""
+
+import argparse
+import copy
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import warnings
+from benchmarks import synthetic_corpus
+from doc_gen_util import DocGenUtilities
+from doc_generator import DocGenerator
+from schema_traverser import SchemaTraverser
+
+baseline_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+# Synthetic corpus shapes: arguments to synthetic_corpus.write_corpus.
+corpora = {
+    'small': {'num_resources': 10, 'num_versions': 3, 'depth': 2, 'num_common': 3, 'fanout': 2},
+    'default': {'num_resources': 40, 'num_versions': 6, 'depth': 3, 'num_common': 8, 'fanout': 4},
+    'large': {'num_resources': 150, 'num_versions': 10, 'depth': 4, 'num_common': 20, 'fanout': 8},
+}
+
+
+def make_config(schema_dir, output_format='markdown', property_index=False):
+    """ Configuration for a run over schema_dir, like build_config's """
+    config = {'output_format': output_format,
+              'output_content': 'property_index' if property_index else 'full_doc',
+              'supplemental': {'Introduction': '# Common Objects\n\n[insert_common_objects]\n'},
+              'excluded_annotations': [],
+              'excluded_annotations_by_match': ['@odata.count', '@odata.navigationLink'],
+              'excluded_properties': ['@odata.id', '@odata.context', '@odata.type'],
+              'excluded_by_match': ['@odata.count', '@odata.navigationLink'],
+              'excluded_schemas': [],
+              'excluded_schemas_by_match': [],
+              'escape_chars': [],
+              'uri_replacements': {},
+              'units_translation': {'s': 'seconds', 'W': 'Watts'},
+              'wants_common_objects': True,
+              'profile_mode': False,
+              'profile': {},
+              'profile_resources': {},
+              'uri_to_local': {'redfish.dmtf.org/schemas/v1': schema_dir},
+              'local_to_uri': {schema_dir: 'redfish.dmtf.org/schemas/v1'}}
+    if property_index:
+        config['property_index_config'] = {'DescriptionOverrides': {}, 'ExcludedProperties': []}
+    return config
+
+
+class Scenarios:
+    """ The benchmark scenarios for one corpus. prepare() sets up a scenario and returns just the work
+    to be timed; the schemas are processed once, when the corpus is loaded, for the scenarios that
+    start from processed schemas. """
+
+    names = ['group_files', 'process_schemas', 'traversal', 'render_markdown', 'render_html', 'render_csv',
+             'property_index']
+
+    def __init__(self, schema_dir):
+        self.schema_dir = schema_dir
+        self.doc_gen = DocGenerator([schema_dir], os.devnull, make_config(schema_dir))
+        self.files = self.doc_gen.get_files([schema_dir])
+
+        # Decode every file up front, so that scenarios measure their own work rather than JSON parsing.
+        DocGenUtilities.schema_cache.clear()
+        DocGenUtilities.schema_cache.max_entries = max(DocGenUtilities.schema_cache.max_entries, len(self.files))
+        for filename in self.files:
+            DocGenUtilities.load_as_json(filename)
+
+        self.parsed = self.doc_gen.process_schemas()
+        self.refs = sorted(set(self.find_refs(self.parsed[1])))
+
+
+    @staticmethod
+    def find_refs(data):
+        """ Every $ref in data """
+        if isinstance(data, dict):
+            for key, value in data.items():
+                if key == '$ref' and isinstance(value, str):
+                    yield value
+                else:
+                    yield from Scenarios.find_refs(value)
+        elif isinstance(data, list):
+            for value in data:
+                yield from Scenarios.find_refs(value)
+
+
+    def prepare(self, name):
+        """ Return the function to time for the named scenario """
+        if name == 'group_files':
+            return lambda: self.doc_gen.group_files(self.files)
+        if name == 'process_schemas':
+            return self.doc_gen.process_schemas
+        if name == 'traversal':
+            _, schema_data, meta = self.parsed
+            traverser = SchemaTraverser(schema_data, meta, self.doc_gen.config['uri_to_local'])
+            return lambda: [traverser.find_ref_data(x) for x in self.refs]
+
+        output_format = {'render_markdown': 'markdown', 'render_html': 'html', 'render_csv': 'csv',
+                         'property_index': 'markdown'}[name]
+        config = make_config(self.schema_dir, output_format, property_index=name == 'property_index')
+        parsed = copy.deepcopy(self.parsed)
+        return lambda: self.doc_gen.render(config, *parsed)
+
+
+    def time(self, name, repeat, min_time=0.2):
+        """ Seconds per run of the named scenario: the best, over repeat measurements, of the average
+        over as many runs as it takes to fill min_time seconds. """
+        best = None
+        for _ in range(repeat):
+            total = 0.0
+            runs = 0
+            while runs == 0 or total < min_time:
+                run = self.prepare(name)
+                gc.collect()
+                gc.disable() # as timeit does, so collections don't land in some runs and not others
+                try:
+                    with warnings.catch_warnings():
+                        warnings.simplefilter('ignore')
+                        start = time.perf_counter()
+                        run()
+                        total += time.perf_counter() - start
+                finally:
+                    gc.enable()
+                runs += 1
+            best = total / runs if best is None else min(best, total / runs)
+        return best
+
+
+def compare(results, baseline, threshold):
+    """ Print results against baseline; return the names of scenarios slower than threshold times baseline """
+    regressions = []
+    print('%-18s %12s %12s %8s' % ('scenario', 'seconds', 'baseline', 'ratio'))
+    for name, seconds in results.items():
+        base = baseline.get('scenarios', {}).get(name)
+        if base:
+            ratio = seconds / base
+            flag = ''
+            if ratio > threshold:
+                regressions.append(name)
+                flag = '  REGRESSION'
+            print('%-18s %12.4f %12.4f %8.2f%s' % (name, seconds, base, ratio, flag))
+        else:
+            print('%-18s %12.4f %12s %8s' % (name, seconds, '-', '-'))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the doc-generator benchmark scenarios against a synthetic corpus.')
+    parser.add_argument('--corpus', choices=sorted(corpora.keys()), default='default', help='Corpus shape. Default: default')
+    parser.add_argument('--scenario', dest='scenarios', action='append', choices=Scenarios.names,
+                        help='Scenario(s) to run. Default: all.')
+    parser.add_argument('--repeat', type=int, default=5, help='Measurements of each scenario; the best is reported. Default: 5')
+    parser.add_argument('--baseline', help='Baseline file. Default: benchmarks/baselines/CORPUS.json')
+    parser.add_argument('--save', action='store_true', help='Record the results as the baseline.')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Ratio to baseline above which a scenario counts as a regression. Default: 1.25')
+    args = parser.parse_args()
+
+    corpus = corpora[args.corpus]
+    baseline_file = args.baseline or os.path.join(baseline_dir, args.corpus + '.json')
+    names = args.scenarios or Scenarios.names
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        count = synthetic_corpus.write_corpus(tmpdir, **corpus)
+        print('Corpus %s: %d files (%s)' % (args.corpus, count, ', '.join(['%s %d' % x for x in sorted(corpus.items())])))
+        scenarios = Scenarios(tmpdir)
+        results = {x: scenarios.time(x, args.repeat) for x in names}
+
+    baseline = {}
+    if os.path.exists(baseline_file):
+        with open(baseline_file, encoding='utf8') as f:
+            baseline = json.load(f)
+        if baseline.get('corpus') != corpus:
+            print('Baseline ' + baseline_file + ' is for a different corpus; not comparing.')
+            baseline = {}
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save:
+        scenario_results = dict(baseline.get('scenarios', {}))
+        scenario_results.update({x: round(y, 6) for x, y in results.items()})
+        os.makedirs(os.path.dirname(baseline_file), exist_ok=True)
+        with open(baseline_file, 'w', encoding='utf8') as f:
+            json.dump({'corpus': corpus, 'scenarios': scenario_results}, f, indent=4, sort_keys=True)
+            f.write('\n')
+        print(baseline_file + ' written.')
+    elif regressions:
+        print('Slower than %.2f times baseline: %s' % (args.threshold, ', '.join(regressions)))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: synthetic_corpus.py
+
+Brief: Writes a synthetic tree of Redfish-style JSON schemas, for benchmarking.
+
+Each resource gets an unversioned schema whose definition is an anyOf of $refs to
+its versioned schemas, just as the DMTF-published schemas do.
+
+Optionally, each versioned schema also has a chain of nested object definitions (depth), and
+properties referring to common objects: schemas like Resource.json, with no top-level $ref, whose
+definitions are each an anyOf of $refs to several versions (fan-out).
+"""
+
+import json
+import os
+
+SCHEMA_URI = 'http://redfish.dmtf.org/schemas/v1/'
+
+
+def resource_name(index):
+    """ Name for the index-th synthetic resource """
+    return 'Resource' + str(index)
+
+
+def version_string(index):
+    """ Version for the index-th version of a resource: 1_0_0, 1_1_0, ... """
+    return '1_' + str(index) + '_0'
+
+
+def common_name(index):
+    """ Name for the index-th synthetic common object """
+    return 'Common' + str(index)
+
+
+def unversioned_schema(name, num_versions):
+    """ The unversioned schema, with an anyOf listing each version """
+    any_of = [{'$ref': SCHEMA_URI + 'odata.v4_0_2.json#/definitions/idRef'}]
+    for i in range(num_versions):
+        any_of.append({'$ref': SCHEMA_URI + name + '.v' + version_string(i) + '.json#/definitions/' + name})
+    return {
+        '$id': SCHEMA_URI + name + '.json',
+        '$ref': '#/definitions/' + name,
+        '$schema': 'http://redfish.dmtf.org/schemas/v1/redfish-schema-v1.json',
+        'title': '#' + name,
+        'definitions': {
+            name: {
+                'anyOf': any_of,
+                'description': 'The ' + name + ' schema.',
+                'uris': ['/redfish/v1/' + name + 's/{' + name + 'Id}'],
+            },
+        },
+    }
+
+
+def versioned_schema(name, version_index, depth=0, num_common=0):
+    """ A versioned schema; each version adds one property.
+
+    depth: levels of nested object definitions under the Nested property (none if 0)
+    num_common: number of common objects referred to, one property each
+    """
+    version = version_string(version_index)
+    schema_uri = SCHEMA_URI + name + '.v' + version + '.json'
+    properties = {
+        'Id': {'type': 'string', 'readonly': True, 'description': 'The identifier.'},
+        'Name': {'type': 'string', 'readonly': True, 'description': 'The name.'},
+    }
+    for i in range(version_index + 1):
+        properties['Property' + str(i)] = {
+            'type': ['string', 'null'],
+            'readonly': False,
+            'description': 'Property added in version ' + str(i) + '.',
+            'longDescription': 'This property shall contain a value added in version ' + str(i) + '.',
+        }
+    for i in range(num_common):
+        common = common_name(i)
+        properties[common] = {
+            'anyOf': [{'$ref': SCHEMA_URI + common + '.json#/definitions/' + common}, {'type': 'null'}],
+            'description': 'The ' + common + ' of this resource.',
+        }
+    definitions = {
+        name: {
+            'type': 'object',
+            'additionalProperties': False,
+            'description': 'The ' + name + ' schema.',
+            'longDescription': 'This resource shall represent a ' + name + '.',
+            'properties': properties,
+        },
+    }
+    if depth:
+        properties['Nested'] = {'$ref': schema_uri + '#/definitions/Level1', 'description': 'Nested objects.'}
+        for level in range(1, depth + 1):
+            level_properties = {
+                'Value': {'type': 'integer', 'readonly': True, 'description': 'The value at level ' + str(level) + '.'},
+            }
+            if level < depth:
+                level_properties['Child'] = {'$ref': schema_uri + '#/definitions/Level' + str(level + 1),
+                                             'description': 'The next level down.'}
+            definitions['Level' + str(level)] = {
+                'type': 'object',
+                'additionalProperties': False,
+                'description': 'Nesting level ' + str(level) + '.',
+                'properties': level_properties,
+            }
+    return {
+        '$id': schema_uri,
+        '$ref': '#/definitions/' + name,
+        '$schema': 'http://redfish.dmtf.org/schemas/v1/redfish-schema-v1.json',
+        'title': '#' + name + '.v' + version + '.' + name,
+        'definitions': definitions,
+    }
+
+
+def unversioned_common_schema(name, fanout):
+    """ A common object schema (like Resource.json): the definition is an anyOf of fanout versions """
+    return {
+        '$id': SCHEMA_URI + name + '.json',
+        '$schema': 'http://redfish.dmtf.org/schemas/v1/redfish-schema-v1.json',
+        'title': '#' + name,
+        'definitions': {
+            name: {
+                'anyOf': [{'$ref': SCHEMA_URI + name + '.v' + version_string(i) + '.json#/definitions/' + name}
+                          for i in range(fanout)],
+                'description': 'The ' + name + ' common object.',
+            },
+        },
+    }
+
+
+def versioned_common_schema(name, version_index):
+    """ A version of a common object schema; each version adds one property """
+    version = version_string(version_index)
+    properties = {}
+    for i in range(version_index + 1):
+        properties['Field' + str(i)] = {
+            'type': ['string', 'null'],
+            'readonly': True,
+            'description': 'Field added in version ' + str(i) + '.',
+        }
+    return {
+        '$id': SCHEMA_URI + name + '.v' + version + '.json',
+        '$schema': 'http://redfish.dmtf.org/schemas/v1/redfish-schema-v1.json',
+        'title': '#' + name + '.v' + version,
+        'definitions': {
+            name: {
+                'type': 'object',
+                'additionalProperties': False,
+                'description': 'The ' + name + ' common object.',
+                'properties': properties,
+            },
+        },
+    }
+
+
+def write_corpus(target_dir, num_resources, num_versions, depth=0, num_common=0, fanout=1):
+    """ Write num_resources resources, each with num_versions versions, to target_dir.
+
+    depth: levels of nested objects in each versioned resource schema
+    num_common: number of common object schemas, each referred to by every versioned resource schema
+    fanout: number of versions of each common object, listed in its anyOf
+
+    Returns the number of files written. """
+    os.makedirs(target_dir, exist_ok=True)
+    count = 0
+    for r in range(num_resources):
+        name = resource_name(r)
+        _write(os.path.join(target_dir, name + '.json'), unversioned_schema(name, num_versions))
+        count += 1
+        for v in range(num_versions):
+            filename = name + '.v' + version_string(v) + '.json'
+            _write(os.path.join(target_dir, filename), versioned_schema(name, v, depth, num_common))
+            count += 1
+    for c in range(num_common):
+        name = common_name(c)
+        _write(os.path.join(target_dir, name + '.json'), unversioned_common_schema(name, fanout))
+        count += 1
+        for v in range(fanout):
+            filename = name + '.v' + version_string(v) + '.json'
+            _write(os.path.join(target_dir, filename), versioned_common_schema(name, v))
+            count += 1
+    return count
+
+
+def _write(path, data):
+    with open(path, 'w', encoding='utf8') as f:
+        json.dump(data, f, indent=4)
@@ -2,6 +2,8 @@
 # Copyright 2016, 2017 Distributed Management Task Force, Inc. All rights reserved.
 # License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
 
+from .section_cache import SectionCache
+from .output_sink import OutputSink
 from .doc_formatter import DocFormatter
 from .markdown_generator import MarkdownGenerator
 from .toc_parser import ToCParser
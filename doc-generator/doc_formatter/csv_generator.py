@@ -19,6 +19,7 @@ from . import DocFormatter
 class CsvGenerator(DocFormatter):
     """Provides methods for generating CSV docs from Redfish schemas."""
 
+    section_state_attrs = DocFormatter.section_state_attrs + ('output', 'writer')
 
     def __init__(self, property_data, traverser, config, level=0):
         super(CsvGenerator, self).__init__(property_data, traverser, config, level)
@@ -70,6 +71,37 @@ class CsvGenerator(DocFormatter):
         self.writer.writerow(headings)
 
 
+    def __getstate__(self):
+        """ Support pickling for worker processes. The CSV buffer and writer are recreated, empty. """
+        state = super().__getstate__()
+        del state['output']
+        del state['writer']
+        return state
+
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.output = io.StringIO()
+        self.writer = csv.writer(self.output)
+
+
+    def reset_section_output(self):
+        """ Start a fresh CSV buffer (used by worker processes). """
+        super().reset_section_output()
+        self.output = io.StringIO()
+        self.writer = csv.writer(self.output)
+
+
+    def get_section_output(self):
+        """ CSV rows written since reset_section_output. """
+        return self.output.getvalue()
+
+
+    def add_section_output(self, section_output):
+        """ Append CSV rows written elsewhere (by get_section_output). """
+        self.output.write(section_output)
+
+
     def format_property_row(self, schema_ref, prop_name, prop_info, prop_path=[], in_array=False):
         """Format information for a single property.
 
@@ -11,17 +11,42 @@ Initial author: Second Rise LLC.
 """
 
 import os
+import concurrent.futures
 import copy
-import re
 import warnings
 import sys
 import functools
-from doc_gen_util import DocGenUtilities
+import marshal
+import pickle
+from doc_gen_util import DocGenUtilities, NameMatcher, UriReplacementIndex, Version
 from format_utils import FormatUtils
+from .output_sink import OutputSink
+
+
+# State for worker processes when sections are rendered in a process pool (see render_sections).
+# The formatter goes to the workers pickled, with each batch of tasks (ProcessPoolExecutor has no
+# initializer before Python 3.7); each worker unpickles a given copy once.
+_worker_formatter = (None, None) # (pickled, formatter)
+
+def _render_sections_in_worker(pickled_formatter, schema_refs):
+    """ Process pool task: render a batch of schema sections (see DocFormatter.render_section). """
+    global _worker_formatter
+    if _worker_formatter[0] != pickled_formatter:
+        _worker_formatter = (pickled_formatter, pickle.loads(pickled_formatter))
+    return [_worker_formatter[1].render_section(x) for x in schema_refs]
+
 
 class DocFormatter:
     """Generic class for schema documentation formatter"""
 
+    # Sections can be rendered in isolation (in worker processes, or reused by incremental builds) if all
+    # per-section output goes through get_section_output/add_section_output. Formatters that accumulate
+    # other state should set this False.
+    supports_parallel_rendering = True
+
+    # Attributes holding per-section output, saved and restored around render_section.
+    section_state_attrs = ('sections', 'common_properties')
+
     def __init__(self, property_data, traverser, config, level=0):
         """Set up the markdown generator.
 
@@ -39,8 +64,22 @@ class DocFormatter:
         self.current_depth = 0
         self.sections = []
         self.registry_sections = []
+        self.body_started = False # see write_body
         self.collapse_list_of_simple_type = True
         self.formatter = FormatUtils() # Non-markdown formatters will override this.
+        self.section_cache = None # SectionCache, for incremental builds
+        self.description_overrides = {} # schema_name: overrides; see get_description_overrides
+        self.property_info_memo = {} # (schema_ref, marshalled prop_info): results; see extend_property_info
+        self.property_info_memo_hits = self.property_info_memo_misses = 0
+        self.memo_recordings = [] # memo entries being recorded, innermost last
+
+        # Exclusion lists, compiled once; see exclude_prop_names and skip_schema.
+        self.property_exclusions = NameMatcher(self.config.get('excluded_properties'),
+                                               self.config.get('excluded_by_match'))
+        self.annotation_exclusions = NameMatcher(self.config.get('excluded_annotations'),
+                                                 self.config.get('excluded_annotations_by_match'))
+        self.schema_exclusions = NameMatcher(self.config.get('excluded_schemas'),
+                                             self.config.get('excluded_schemas_by_match'))
 
         # Get a list of schemas that will appear in the documentation. We need this to know
         # when to create an internal link, versus a link to a URI.
@@ -52,12 +91,17 @@ class DocFormatter:
                 continue
             if len(details['properties']):
                 self.documented_schemas.append(schema_ref)
+        self.documented_schemas.sort(key=str.lower) # the order of sections in the output
+
+        # Indexes for is_documented_schema and get_ref_for_documented_schema_name:
+        self.documented_schema_set = set(self.documented_schemas)
+        self.documented_schema_refs_by_name = {} # schema_name: first schema_ref (in output order) with that name
+        for schema_ref in self.documented_schemas:
+            schema_name = self.property_data[schema_ref]['schema_name']
+            if schema_name in schema_ref:
+                self.documented_schema_refs_by_name.setdefault(schema_name, schema_ref)
 
-        self.uri_match_keys = None
-        if self.config.get('uri_replacements'):
-            map_keys = list(self.config['uri_replacements'].keys())
-            map_keys.sort(key=len, reverse=True)
-            self.uri_match_keys = map_keys
+        self.uri_replacements = UriReplacementIndex(self.config.get('uri_replacements'))
 
         self.separators = {
             'inline': ', ',
@@ -304,126 +348,302 @@ class DocFormatter:
         return body
 
 
-    def generate_output(self):
+    def begin_document(self, sink):
+        """ Start the document in sink (an OutputSink). Formatters that write each section to the sink as soon
+        as it is rendered override this, write_sections, and end_document; others produce the whole document
+        in end_document, with output_document. """
+        pass
+
+
+    def write_sections(self, sink):
+        """ Write the sections rendered since the last call to sink """
+        pass
+
+
+    def end_document(self, sink):
+        """ Finish the document in sink, filling in its slots """
+        sink.write(self.output_document())
+
+
+    def write_body(self, sink, contents, notes=None):
+        """ Write contents (a list of strings) to sink, continuing the newline-separated body of the document.
+        notes are passed on to the sink. """
+        if contents:
+            if self.body_started:
+                sink.write('\n')
+            sink.write('\n'.join(contents), notes)
+            self.body_started = True
+
+
+    def generate_output(self, outfile=None):
         """Generate formatted from schemas and supplemental data.
 
         Iterates through property_data and traverses schemas for details.
         Format of output will depend on the format_* methods of the class.
+
+        If outfile is given, the document is written to it, and None is returned; otherwise the document
+        is returned.
         """
+        config = self.config
+        sink = OutputSink(outfile)
+        self.begin_document(sink)
+
+        schema_keys = self.documented_schemas
+
+        jobs = config.get('jobs') or 1
+        if not self.supports_parallel_rendering:
+            self.section_cache = None
+            jobs = 1
+
+        if self.section_cache:
+            # Incremental build: reuse sections whose inputs are unchanged, render the rest.
+            cached_sections = {}
+            for schema_ref in schema_keys:
+                cached = self.section_cache.get('sections', schema_ref)
+                if cached is not None:
+                    cached_sections[schema_ref] = (cached['output'], cached['common_properties'])
+            stale_keys = [x for x in schema_keys if x not in cached_sections]
+            for schema_ref, section_output, common_properties, touched_refs in self.render_sections(stale_keys, jobs):
+                self.section_cache.put('sections', schema_ref, section_output, common_properties, touched_refs)
+                cached_sections[schema_ref] = (section_output, common_properties)
+            for schema_ref in schema_keys:
+                self.add_rendered_section(*cached_sections[schema_ref])
+                self.write_sections(sink)
+
+        elif jobs > 1 and len(schema_keys) > 1:
+            for schema_ref, section_output, common_properties, touched_refs in self.render_sections(schema_keys, jobs):
+                self.add_rendered_section(section_output, common_properties)
+                self.write_sections(sink)
+        else:
+            for schema_ref in schema_keys:
+                with DocGenUtilities.timings.phase('render_section', schema_ref):
+                    self.generate_schema_section(schema_ref)
+                self.write_sections(sink)
+
+        if self.config.get('profile_mode'):
+            # Add registry messages, if in profile.
+            registry_reqs = config.get('profile').get('registries_annotated', {})
+            if registry_reqs:
+                self.add_registry_reqs(registry_reqs)
+
+        self.end_document(sink)
+        with DocGenUtilities.timings.phase('write_output'):
+            output = sink.finish()
+        if self.section_cache:
+            self.section_cache.save()
+        return output
+
+
+    def generate_schema_section(self, schema_ref):
+        """Generate the documentation section for one schema in property_data."""
         property_data = self.property_data
-        traverser = self.traverser
         config = self.config
         schema_supplement = config.get('schema_supplement', {})
-        profile_mode = config.get('profile_mode')
 
-        schema_keys = self.documented_schemas
-        schema_keys.sort(key=str.lower)
+        details = property_data[schema_ref]
+        schema_name = details['schema_name']
+        profile = config.get('profile_resources', {}).get(schema_ref, {})
 
-        for schema_ref in schema_keys:
-            details = property_data[schema_ref]
-            schema_name = details['schema_name']
-            profile = config.get('profile_resources', {}).get(schema_ref, {})
+        # Look up supplemental details for this schema/version
+        version = details.get('latest_version', '1')
+        major_version = version.split('.')[0]
+        schema_key = schema_name + '_' + major_version
+        supplemental = schema_supplement.get(schema_key,
+                                             schema_supplement.get(schema_name, {}))
 
-            # Look up supplemental details for this schema/version
-            version = details.get('latest_version', '1')
-            major_version = version.split('.')[0]
-            schema_key = schema_name + '_' + major_version
-            supplemental = schema_supplement.get(schema_key,
-                                                 schema_supplement.get(schema_name, {}))
+        definitions = details['definitions']
 
-            definitions = details['definitions']
+        if config.get('omit_version_in_headers'):
+            section_name = schema_name
+        else:
+            section_name = details['name_and_version']
+        self.add_section(section_name, schema_name)
+        self.current_version = {}
 
-            if config.get('omit_version_in_headers'):
-                section_name = schema_name
-            else:
-                section_name = details['name_and_version']
-            self.add_section(section_name, schema_name)
-            self.current_version = {}
+        uris = details['uris']
 
-            uris = details['uris']
+        # Normative docs prefer longDescription to description
+        if config.get('normative') and 'longDescription' in definitions[schema_name]:
+            description = definitions[schema_name].get('longDescription')
+        else:
+            description = definitions[schema_name].get('description')
+
+        required = definitions[schema_name].get('required', [])
+        required_on_create = definitions[schema_name].get('requiredOnCreate', [])
+
+        # Override with supplemental schema description, if provided
+        # If there is a supplemental Description or Schema-Intro, it replaces
+        # the description in the schema. If both are present, the Description
+        # should be output, followed by the Schema-Intro.
+        if supplemental.get('description') and supplemental.get('schema-intro'):
+            description = (supplemental.get('description') + '\n\n' +
+                           supplemental.get('schema-intro'))
+        elif supplemental.get('description'):
+            description = supplemental.get('description')
+        else:
+            description = supplemental.get('schema-intro', description)
 
-            # Normative docs prefer longDescription to description
-            if config.get('normative') and 'longDescription' in definitions[schema_name]:
-                description = definitions[schema_name].get('longDescription')
-            else:
-                description = definitions[schema_name].get('description')
-
-            required = definitions[schema_name].get('required', [])
-            required_on_create = definitions[schema_name].get('requiredOnCreate', [])
-
-            # Override with supplemental schema description, if provided
-            # If there is a supplemental Description or Schema-Intro, it replaces
-            # the description in the schema. If both are present, the Description
-            # should be output, followed by the Schema-Intro.
-            if supplemental.get('description') and supplemental.get('schema-intro'):
-                description = (supplemental.get('description') + '\n\n' +
-                               supplemental.get('schema-intro'))
-            elif supplemental.get('description'):
-                description = supplemental.get('description')
-            else:
-                description = supplemental.get('schema-intro', description)
+        # Profile purpose overrides all:
+        if profile:
+            description = profile.get('Purpose')
 
-            # Profile purpose overrides all:
-            if profile:
-                description = profile.get('Purpose')
+        if description:
+            self.add_description(description)
 
-            if description:
-                self.add_description(description)
+        if len(uris):
+            self.add_uris(uris)
 
-            if len(uris):
-                self.add_uris(uris)
+        self.add_json_payload(supplemental.get('jsonpayload'))
 
-            self.add_json_payload(supplemental.get('jsonpayload'))
+        if 'properties' in details.keys():
+            prop_details = {}
+            conditional_details = {}
 
-            if 'properties' in details.keys():
-                prop_details = {}
-                conditional_details = {}
-
-                properties = details['properties']
-                prop_names = [x for x in properties.keys()]
-                prop_names = self.organize_prop_names(prop_names, profile)
-
-                for prop_name in prop_names:
-                    prop_info = properties[prop_name]
-
-                    prop_info['prop_required'] = prop_name in required
-                    prop_info['prop_required_on_create'] = prop_name in required_on_create
-                    prop_info['parent_requires'] = required
-                    prop_info['parent_requires_on_create'] = required_on_create
-                    prop_info['required_parameter'] = prop_info.get('requiredParameter') == True
-
-                    meta = prop_info.get('_doc_generator_meta', {})
-                    prop_infos = self.extend_property_info(schema_ref, prop_info, properties.get('_doc_generator_meta'))
-
-                    formatted = self.format_property_row(schema_ref, prop_name, prop_infos, [])
-                    if formatted:
-                        self.add_property_row(formatted['row'])
-                        if formatted['details']:
-                            prop_details.update(formatted['details'])
-                        if formatted['action_details']:
-                            self.add_action_details(formatted['action_details'])
-                        if formatted.get('profile_conditional_details'):
-                            conditional_details.update(formatted['profile_conditional_details'])
-
-                if len(prop_details):
-                    detail_names = [x for x in prop_details.keys()]
-                    detail_names.sort(key=str.lower)
-                    for detail_name in detail_names:
-                        self.add_property_details(prop_details[detail_name])
+            properties = details['properties']
+            prop_names = [x for x in properties.keys()]
+            prop_names = self.organize_prop_names(prop_names, profile)
 
-                if len(conditional_details):
-                    cond_names = [x for x in conditional_details.keys()]
-                    cond_names.sort(key=str.lower)
-                    for cond_name in cond_names:
-                        self.add_profile_conditional_details(conditional_details[cond_name])
+            for prop_name in prop_names:
+                prop_info = properties[prop_name]
 
-        if self.config.get('profile_mode'):
-            # Add registry messages, if in profile.
-            registry_reqs = config.get('profile').get('registries_annotated', {})
-            if registry_reqs:
-                self.add_registry_reqs(registry_reqs)
+                prop_info['prop_required'] = prop_name in required
+                prop_info['prop_required_on_create'] = prop_name in required_on_create
+                prop_info['parent_requires'] = required
+                prop_info['parent_requires_on_create'] = required_on_create
+                prop_info['required_parameter'] = prop_info.get('requiredParameter') == True
 
-        return self.output_document()
+                meta = prop_info.get('_doc_generator_meta', {})
+                prop_infos = self.extend_property_info(schema_ref, prop_info, properties.get('_doc_generator_meta'))
+
+                formatted = self.format_property_row(schema_ref, prop_name, prop_infos, [])
+                if formatted:
+                    self.add_property_row(formatted['row'])
+                    if formatted['details']:
+                        prop_details.update(formatted['details'])
+                    if formatted['action_details']:
+                        self.add_action_details(formatted['action_details'])
+                    if formatted.get('profile_conditional_details'):
+                        conditional_details.update(formatted['profile_conditional_details'])
+
+            if len(prop_details):
+                detail_names = [x for x in prop_details.keys()]
+                detail_names.sort(key=str.lower)
+                for detail_name in detail_names:
+                    self.add_property_details(prop_details[detail_name])
+
+            if len(conditional_details):
+                cond_names = [x for x in conditional_details.keys()]
+                cond_names.sort(key=str.lower)
+                for cond_name in cond_names:
+                    self.add_profile_conditional_details(conditional_details[cond_name])
+
+
+    def render_sections(self, schema_keys, jobs=1):
+        """Render the sections for schema_keys in isolation, using a pool of worker processes if jobs > 1.
+
+        Yields (schema_ref, section_output, common_properties, touched_refs) in schema_keys order.
+        Each section starts with an empty buffer and no common properties, so merging the results in
+        order (see add_rendered_section) produces the same document as a serial run.
+        """
+        if jobs > 1 and len(schema_keys) > 1:
+            chunksize = max(1, len(schema_keys) // (jobs * 4))
+            batches = [schema_keys[i:i + chunksize] for i in range(0, len(schema_keys), chunksize)]
+            pickled_self = pickle.dumps(self)
+            with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = executor.map(_render_sections_in_worker, [pickled_self] * len(batches), batches)
+                for batch, batch_results in zip(batches, results):
+                    for schema_ref, result in zip(batch, batch_results):
+                        yield (schema_ref,) + result
+        else:
+            for schema_ref in schema_keys:
+                yield (schema_ref,) + self.render_section(schema_ref)
+
+
+    def render_section(self, schema_ref):
+        """Render the section for schema_ref without disturbing the output accumulated so far.
+
+        Returns (section_output, common_properties, touched_refs), where touched_refs lists the schema
+        refs resolved along the way (the section's dependencies, for incremental builds).
+        """
+        saved_state = {x: getattr(self, x) for x in self.section_state_attrs}
+        recording = self.traverser.touched_refs
+        self.reset_section_output()
+        self.traverser.touched_refs = set([schema_ref])
+        try:
+            with DocGenUtilities.timings.phase('render_section', schema_ref):
+                self.generate_schema_section(schema_ref)
+            result = (self.get_section_output(), self.common_properties, sorted(self.traverser.touched_refs))
+        finally:
+            self.traverser.touched_refs = recording
+            for attr, value in saved_state.items():
+                setattr(self, attr, value)
+        return result
+
+
+    def add_rendered_section(self, section_output, common_properties):
+        """Add a section produced by render_section, keeping the first-seen value of each common property."""
+        self.add_section_output(section_output)
+        for ref_key, ref_info in common_properties.items():
+            if self.common_properties.get(ref_key) is None:
+                self.common_properties[ref_key] = ref_info
+
+
+    def render_with_section_cache(self, kind, key, own_refs, render):
+        """Return render(), or its output from a previous run if the section cache has it and it's still valid.
+
+        Common properties discovered by render() are saved with its output and merged back in on reuse.
+        """
+        if not self.section_cache:
+            return render()
+
+        cached = self.section_cache.get(kind, key)
+        if cached is not None:
+            for ref_key, ref_info in cached['common_properties'].items():
+                if self.common_properties.get(ref_key) is None:
+                    self.common_properties[ref_key] = ref_info
+            self.formatter.add_headings(cached['headings'])
+            return cached['output']
+
+        known_common_properties = set(self.common_properties.keys())
+        recording = self.traverser.touched_refs
+        self.traverser.touched_refs = set(own_refs)
+        self.formatter.record_headings()
+        try:
+            output = render()
+            touched_refs = self.traverser.touched_refs
+        finally:
+            self.traverser.touched_refs = recording
+            headings = self.formatter.stop_recording_headings()
+        if recording is not None:
+            recording.update(touched_refs)
+
+        common_properties = {x: y for x, y in self.common_properties.items() if x not in known_common_properties}
+        self.section_cache.put(kind, key, output, common_properties, sorted(touched_refs), headings)
+        return output
+
+
+    def __getstate__(self):
+        """ Support pickling for worker processes. The section cache stays behind. """
+        state = self.__dict__.copy()
+        state['section_cache'] = None
+        state['property_info_memo'] = {}
+        return state
+
+
+    def reset_section_output(self):
+        """Start a fresh buffer of rendered sections."""
+        self.sections = []
+        self.common_properties = {}
+
+
+    def get_section_output(self):
+        """Sections rendered since reset_section_output, in a form add_section_output accepts."""
+        return self.sections
+
+
+    def add_section_output(self, section_output):
+        """Append sections rendered elsewhere (by get_section_output) to this formatter's output."""
+        self.sections.extend(section_output)
 
 
     def generate_fragment_doc(self, ref, config):
@@ -431,6 +651,11 @@ class DocFormatter:
 
         Used to generate documentation for schema fragments.
         """
+        return self.render_with_section_cache('fragments', ref, [ref],
+                                              lambda: self._generate_fragment_doc(ref, config))
+
+
+    def _generate_fragment_doc(self, ref, config):
 
         # If /properties is specified, expand the object and output just its contents.
         if ref.endswith('/properties'):
@@ -443,6 +668,7 @@ class DocFormatter:
             return ''
 
         frag_gen = self.__class__(self.property_data, self.traverser, config, self.level)
+        frag_gen.formatter = self.formatter # so that headings are recorded with ours
 
         if "://" not in ref:
             # Try to find the file locally
@@ -496,11 +722,19 @@ class DocFormatter:
 
     def generate_common_properties_doc(self):
         """ Generate output for common object properties """
+        ref_keys = sorted(self.common_properties.keys())
+        with DocGenUtilities.timings.phase('common_objects'):
+            return self.render_with_section_cache('common_objects', '\n'.join(ref_keys), ref_keys,
+                                                  self._generate_common_properties_doc)
+
+
+    def _generate_common_properties_doc(self):
         config = copy.deepcopy(self.config)
         config['strip_top_object'] = True
         schema_supplement = config.get('schema_supplement', {})
 
         cp_gen = self.__class__(self.property_data, self.traverser, config, self.level)
+        cp_gen.formatter = self.formatter # so that headings are recorded with ours
 
         # Sort the properties by prop_name
         def sortkey(elt):
@@ -615,12 +849,73 @@ class DocFormatter:
         """If prop_info contains a $ref or anyOf attribute, extend it with that information.
 
         Returns an array of objects. Arrays of arrays of objects are possible but not expected.
+
+        Results are memoized by schema_ref and the content of prop_info. A memoized result is reused if
+        the parts of context_meta it was computed from are unchanged; the common properties and schema
+        refs found while computing it are replayed. The returned objects are shallow copies, so their
+        top-level keys may be changed, but the values they share with the memo must not be modified.
         """
+        if not context_meta:
+            context_meta = {}
+        if not (prop_info.get('$ref') or prop_info.get('anyOf')):
+            return [prop_info]
+
+        try:
+            key = (schema_ref, marshal.dumps(prop_info))
+        except ValueError:
+            return self._extend_property_info(schema_ref, prop_info, context_meta)
+
+        variants = self.property_info_memo.setdefault(key, [])
+        for entry in variants:
+            if all([context_meta.get(x, {}) == y for x, y in entry['context_reads']]):
+                self.property_info_memo_hits += 1
+                self.replay_memo_entry(entry)
+                return [dict(x) for x in entry['prop_infos']]
+
+        self.property_info_memo_misses += 1
+        entry = {'context_reads': [], 'common_properties': [], 'touched_refs': set()}
+        touched_refs = self.traverser.touched_refs
+        self.memo_recordings.append(entry)
+        self.traverser.touched_refs = entry['touched_refs']
+        try:
+            prop_infos = self._extend_property_info(schema_ref, prop_info, context_meta)
+        finally:
+            self.traverser.touched_refs = touched_refs
+            self.memo_recordings.pop()
+        entry['prop_infos'] = [dict(x) for x in prop_infos]
+        variants.append(entry)
+        self.replay_memo_entry(entry, common_properties=False)
+        return prop_infos
+
+
+    def replay_memo_entry(self, entry, common_properties=True):
+        """ Repeat the side effects of the extend_property_info call that produced a memo entry, and pass
+        its dependencies on to any enclosing call that is being recorded. """
+        if self.traverser.touched_refs is not None:
+            self.traverser.touched_refs.update(entry['touched_refs'])
+        if common_properties:
+            for ref_key, ref_info in entry['common_properties']:
+                if self.common_properties.get(ref_key) is None:
+                    self.common_properties[ref_key] = ref_info
+        if self.memo_recordings:
+            outer = self.memo_recordings[-1]
+            outer['context_reads'].extend(entry['context_reads'])
+            outer['common_properties'].extend(entry['common_properties'])
+            outer['touched_refs'].update(entry['touched_refs'])
+
+
+    def memo_stats(self):
+        """ Summary of extend_property_info memo activity, as a dict """
+        return {'entries': sum([len(x) for x in self.property_info_memo.values()]),
+                'hits': self.property_info_memo_hits,
+                'misses': self.property_info_memo_misses}
+
+
+    def _extend_property_info(self, schema_ref, prop_info, context_meta):
+        """ extend_property_info, without the memo """
         traverser = self.traverser
         prop_ref = prop_info.get('$ref', None)
         prop_anyof = prop_info.get('anyOf', None)
-        if not context_meta:
-            context_meta = {}
 
         prop_infos = []
         outside_ref = None
@@ -672,6 +967,8 @@ class DocFormatter:
                 else:
                     meta = prop_meta
                 node_name = traverser.get_node_from_ref(prop_ref)
+                if self.memo_recordings:
+                    self.memo_recordings[-1]['context_reads'].append((node_name, context_meta.get(node_name, {})))
                 meta = self.merge_metadata(node_name, meta, context_meta)
 
                 is_documented_schema = self.is_documented_schema(from_schema_ref)
@@ -742,6 +1039,8 @@ class DocFormatter:
 
                                     if self.common_properties.get(ref_key) is None:
                                         self.common_properties[ref_key] = ref_info
+                                    if self.memo_recordings:
+                                        self.memo_recordings[-1]['common_properties'].append((ref_key, ref_info))
 
                                     if not self.skip_schema(ref_info.get('_prop_name')):
                                         specific_version = DocGenUtilities.get_ref_version(requested_ref_uri)
@@ -843,6 +1142,7 @@ class DocFormatter:
             for elt in prop_anyof:
                 if skip_null and (elt.get('type') == 'null'):
                     continue
+                elt = dict(elt) # prop_anyof may be shared with the schema data
                 if '$ref' in elt:
                     for x in prop_info.keys():
                         if x in self.parent_props:
@@ -869,8 +1169,7 @@ class DocFormatter:
 
         if self.config.get('profile_mode'):
             prop_names = self.filter_props_by_profile(prop_names, profile)
-        prop_names = self.exclude_prop_names(prop_names, self.config['excluded_properties'],
-                                       self.config['excluded_by_match'])
+        prop_names = self.exclude_prop_names(prop_names, self.property_exclusions)
         prop_names.sort(key=str.lower)
         return prop_names
 
@@ -907,27 +1206,13 @@ class DocFormatter:
     def exclude_annotations(self, prop_names):
         """ Strip out excluded annotations, sorting the remainder """
 
-        return self.exclude_prop_names(prop_names, self.config.get('excluded_annotations', []),
-                                       self.config.get('excluded_annotations_by_match', []))
-
+        return self.exclude_prop_names(prop_names, self.annotation_exclusions)
 
-    def exclude_prop_names(self, prop_names, props_to_exclude, props_to_exclude_by_match):
-        """Strip out excluded property names, and sort the remainder."""
 
-        # Strip out properties based on exact match:
-        prop_names = [x for x in prop_names if x not in props_to_exclude]
-
-        # Strip out properties based on partial match:
-        included_prop_names = []
-        for prop_name in prop_names:
-            excluded = False
-            for prop in props_to_exclude_by_match:
-                if prop in prop_name:
-                    excluded = True
-                    break
-            if not excluded:
-                included_prop_names.append(prop_name)
+    def exclude_prop_names(self, prop_names, exclusions):
+        """Strip out property names matched by exclusions (a NameMatcher), and sort the remainder."""
 
+        included_prop_names = exclusions.exclude(prop_names)
         included_prop_names.sort(key=str.lower)
         return included_prop_names
 
@@ -939,12 +1224,7 @@ class DocFormatter:
             if schema_name in self.config.get('profile', {}).get('Resources', {}):
                 return False
 
-        if schema_name in self.config.get('excluded_schemas', []):
-            return True
-        for pattern in self.config.get('excluded_schemas_by_match', []):
-            if pattern in schema_name:
-                return True
-        return False
+        return self.schema_exclusions.matches(schema_name)
 
 
     def parse_property_info(self, schema_ref, prop_name, prop_infos, prop_path, within_action=False):
@@ -1169,11 +1449,8 @@ class DocFormatter:
         add_link_text = prop_info.get('add_link_text', '')
 
         if within_action:
-            # Extend and parse parameter info
-            for action_param in action_parameters.keys():
-                params = action_parameters[action_param]
-                params = self.extend_property_info(schema_ref, params, {})
-                action_parameters[action_param] = self.extend_property_info(schema_ref, action_parameters[action_param], {})
+            # Extend and parse parameter info. This makes a new dict: prop_info's belongs to the schema data.
+            action_parameters = {x: self.extend_property_info(schema_ref, y, {}) for x, y in action_parameters.items()}
 
             action_details = self.format_action_parameters(schema_ref, prop_name, descr, action_parameters)
 
@@ -1287,7 +1564,7 @@ class DocFormatter:
                 if self.collapse_list_of_simple_type:
                     # We want to combine the array and its item(s) into a single row. Create a combined
                     # prop_item to make it work.
-                    combined_prop_item = prop_items[0]
+                    combined_prop_item = dict(prop_items[0])
                     combined_prop_item['_prop_name'] = prop_name
                     combined_prop_item['readonly'] = prop_info.get('readonly', False)
                     if self.config.get('normative') and 'longDescription' in combined_prop_item:
@@ -1471,17 +1748,16 @@ class DocFormatter:
                 filtered_properties = {}
                 for k in prop_names:
                     filtered_properties[k] = properties[k]
-                prop_info['properties'] = properties = filtered_properties
+                properties = filtered_properties
 
 
             if is_action:
                 prop_names = [x for x in prop_names if x.startswith('#')]
 
             for prop_name in prop_names:
-                base_detail_info = properties[prop_name]
+                base_detail_info = self.apply_overrides(properties[prop_name], schema_name, prop_name)
                 base_detail_info['prop_required'] = prop_name in parent_requires
                 base_detail_info['prop_required_on_create'] = prop_name in parent_requires_on_create
-                base_detail_info = self.apply_overrides(base_detail_info, schema_name, prop_name)
                 meta = self.merge_metadata(prop_name, base_detail_info.get('_doc_generator_meta', {}), context_meta)
                 detail_info = self.extend_property_info(schema_ref, base_detail_info, meta)
                 meta = self.merge_full_metadata(detail_info[0].get('_doc_generator_meta', {}), meta)
@@ -1490,8 +1766,7 @@ class DocFormatter:
                     # Trim out the properties; these are always Target and Title:
                     detail_info[0]['properties'] = {}
 
-                meta['within_action'] = is_action
-                detail_info[0]['_doc_generator_meta'] = meta
+                detail_info[0]['_doc_generator_meta'] = dict(meta, within_action=is_action)
 
                 new_path = prop_path.copy()
 
@@ -1556,23 +1831,7 @@ class DocFormatter:
 
     def get_documentation_uri(self, ref_uri):
         """ If ref_uri is matched in self.config['uri_replacements'], provide a reference to that """
-
-        if not self.uri_match_keys:
-            return None
-
-        replacement = None
-        for key in self.uri_match_keys:
-            if key in ref_uri:
-                match_list = self.config['uri_replacements'][key]
-                for match_spec in match_list:
-                    if match_spec.get('full_match') and match_spec['full_match'] == ref_uri:
-                        replacement = match_spec.get('replace_with')
-                    elif match_spec.get('wild_match'):
-                        pattern = '.*' + ''.join(match_spec['wild_match']) + '.*'
-                        if re.search(pattern, ref_uri):
-                            replacement = match_spec.get('replace_with')
-
-        return replacement
+        return self.uri_replacements.lookup(ref_uri)
 
 
     # Override in HTML formatter to get actual links.
@@ -1585,22 +1844,20 @@ class DocFormatter:
 
     def is_documented_schema(self, schema_ref):
         """ True if the schema will appear as a section in the output documentation """
-        return schema_ref in self.documented_schemas
+        return schema_ref in self.documented_schema_set
 
 
     def get_ref_for_documented_schema_name(self, schema_name):
         """ Get the schema_ref for the schema_name, if it is a documented schema. """
-        candidates = [x for x in self.documented_schemas if schema_name in x]
-        for x in candidates:
-            if self.property_data[x]['schema_name'] == schema_name:
-                return x
-        return False
+        return self.documented_schema_refs_by_name.get(schema_name, False)
 
 
     def apply_overrides(self, prop_info, schema_name=None, prop_name=None):
-        """ Apply overrides from config to prop_info. Returns a modified copy of prop_info. """
+        """ Apply overrides from config to prop_info. Returns a modified copy of prop_info.
 
-        prop_info = copy.deepcopy(prop_info)
+        The copy is shallow: the override fields are layered over a new top-level dict, and everything
+        below that (properties, items, anyOf, _doc_generator_meta ...) is shared with prop_info. Copy a
+        nested node before modifying it. """
 
         if not schema_name:
             schema_name = prop_info.get('_schema_name')
@@ -1608,28 +1865,47 @@ class DocFormatter:
         if not prop_name:
             prop_name = prop_info.get('_prop_name')
 
-        local_overrides = self.config.get('schema_supplement', {}).get(schema_name, {}).get('description overrides', {})
-        local_full_overrides = self.config.get('schema_supplement', {}).get(schema_name, {}).get('fulldescription overrides', {})
-        prop_info['fulldescription_override'] = False
-
-        if (prop_name in local_overrides) or (prop_name in local_full_overrides):
-            if prop_name in local_overrides:
-                prop_info['description'] = prop_info['longDescription'] = local_overrides[prop_name]
-            if prop_name in local_full_overrides:
-                prop_info['description'] = prop_info['longDescription'] = local_full_overrides[prop_name]
-                prop_info['fulldescription_override'] = True
-            return prop_info
-        if prop_name in self.config.get('property_description_overrides', {}):
-            prop_info['description'] = prop_info['longDescription'] = self.config['property_description_overrides'][prop_name]
-        if prop_name in self.config.get('property_fulldescription_overrides', {}):
-            prop_info['description'] = prop_info['longDescription'] = self.config['property_fulldescription_overrides'][prop_name]
-            prop_info['fulldescription_override'] = True
+        overlay = dict(prop_info)
+        overlay['fulldescription_override'] = False
+
+        override = self.get_description_overrides(schema_name).get(prop_name)
+        if override:
+            description, is_full_override, is_schema_override = override
+            overlay['description'] = overlay['longDescription'] = description
+            overlay['fulldescription_override'] = is_full_override
+            if is_schema_override:
+                return overlay
 
         units_trans = self.config.get('units_translation', {}).get(prop_info.get('units'))
         if units_trans:
-            prop_info['units'] = units_trans
+            overlay['units'] = units_trans
 
-        return prop_info
+        return overlay
+
+
+    def get_description_overrides(self, schema_name):
+        """ Description overrides that apply to properties of schema_name, as a dict of
+        prop_name: (description, is_full_override, is_schema_override). Built once per schema.
+
+        Overrides for the schema (from the schema supplement) win over overrides for all properties of
+        that name, and full description overrides win over description overrides. """
+
+        overrides = self.description_overrides.get(schema_name)
+        if overrides is None:
+            overrides = {}
+            for prop_name, description in self.config.get('property_description_overrides', {}).items():
+                overrides[prop_name] = (description, False, False)
+            for prop_name, description in self.config.get('property_fulldescription_overrides', {}).items():
+                overrides[prop_name] = (description, True, False)
+
+            schema_supplement = self.config.get('schema_supplement', {}).get(schema_name, {})
+            for prop_name, description in schema_supplement.get('description overrides', {}).items():
+                overrides[prop_name] = (description, False, True)
+            for prop_name, description in schema_supplement.get('fulldescription overrides', {}).items():
+                overrides[prop_name] = (description, True, True)
+            self.description_overrides[schema_name] = overrides
+
+        return overrides
 
 
     def merge_metadata(self, node_name, meta, context_meta):
@@ -1654,50 +1930,58 @@ class DocFormatter:
 
     def merge_full_metadata(self, meta_a, meta_b):
         """ Recursively merge two metadata structures.
-        We want to capture the earlier of version and version_deprecated values for all nodes. """
+        We want to capture the earlier of version and version_deprecated values for all nodes.
+
+        Metadata is treated as immutable once built: neither input is modified, and the result shares
+        every node that the merge doesn't change (it is meta_a itself if nothing changes). Make a
+        shallow copy of a node before modifying it. """
 
-        meta1 = copy.deepcopy(meta_a)
-        meta2 = copy.deepcopy(meta_b)
+        updates = {}
+        drop_deprecated = False
 
-        if ('version' in meta1) and ('version' in meta2):
-            compare = DocGenUtilities.compare_versions(meta1['version'], meta2['version'])
+        if 'version' in meta_b:
             # We want the "first seen" entry, so use the older one.
-            if compare > 0:
-                meta1['version'] = meta2['version']
-        elif 'version' in meta2:
-            meta1['version'] = meta2['version']
-
-        # If any of this data is from the unversioned schema, that wins (expected is that it will be from meta2):
-        if meta1.get('unversioned'):
-            if 'version_deprecated' in meta2:
-                del(meta2['version_deprecated'])
+            if ('version' not in meta_a) or (Version.parse(meta_a['version']) > Version.parse(meta_b['version'])):
+                updates['version'] = meta_b['version']
+
+        # If any of this data is from the unversioned schema, that wins (expected is that it will be from meta_b).
+        # If it's meta_a, meta_a's deprecation information stands.
+        if meta_a.get('unversioned'):
+            pass
+        elif meta_b.get('unversioned'):
+            drop_deprecated = 'version_deprecated' in meta_a
             # It's still possible for an unversioned schema to include a deprecation notice!
-            meta2['version_deprecated_explanation'] = meta1.get('version_deprecated_explanation', '')
-        elif meta2.get('unversioned'):
-            if 'version_deprecated' in meta1:
-                del(meta1['version_deprecated'])
-            # It's still possible for an unversioned schema to include a deprecation notice!
-            meta1['version_deprecated_explanation'] = meta2.get('version_deprecated_explanation', '')
-
-        elif ('version_deprecated' in meta1) and ('version_deprecated' in meta2):
-            compare = DocGenUtilities.compare_versions(meta1['version_deprecated'], meta2['version_deprecated'])
-            if compare > 0:
-                # meta2 is older, use that:
-                meta1['version_deprecated'] = meta2['version_deprecated']
-        elif 'version_deprecated' in meta2:
-            meta1['version_deprecated'] = meta2['version_deprecated']
-            meta1['version_deprecated_explanation'] = meta2.get('version_deprecated_explanation', '')
-
-        for key, val in meta1.items():
+            updates['version_deprecated_explanation'] = meta_b.get('version_deprecated_explanation', '')
+
+        elif ('version_deprecated' in meta_a) and ('version_deprecated' in meta_b):
+            if Version.parse(meta_a['version_deprecated']) > Version.parse(meta_b['version_deprecated']):
+                # meta_b is older, use that:
+                updates['version_deprecated'] = meta_b['version_deprecated']
+        elif 'version_deprecated' in meta_b:
+            updates['version_deprecated'] = meta_b['version_deprecated']
+            updates['version_deprecated_explanation'] = meta_b.get('version_deprecated_explanation', '')
+
+        for key, val in meta_a.items():
             if isinstance(val, dict):
-                if meta2.get(key):
-                    meta1[key] = self.merge_full_metadata(meta1[key], meta2[key])
-        for key, val in meta2.items():
+                if meta_b.get(key):
+                    updates[key] = self.merge_full_metadata(val, meta_b[key])
+        for key, val in meta_b.items():
             if isinstance(val, dict):
                 # Just pick up the missed items.
-                if not meta1.get(key):
-                    meta1[key] = meta2[key]
-        return meta1
+                if not updates.get(key, meta_a.get(key)):
+                    updates[key] = val
+
+        # Allocate a new node only if something actually changed:
+        changes = [(key, val) for key, val in updates.items()
+                   if (key not in meta_a) or ((meta_a[key] is not val) and (isinstance(val, dict) or meta_a[key] != val))]
+        if not (changes or drop_deprecated):
+            return meta_a
+
+        merged = dict(meta_a)
+        if drop_deprecated:
+            del merged['version_deprecated']
+        merged.update(changes)
+        return merged
 
 
     def get_prop_profile(self, schema_ref, prop_path, section):
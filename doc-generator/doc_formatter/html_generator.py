@@ -10,7 +10,6 @@ Brief : Defines HtmlGenerator class.
 Initial author: Second Rise LLC.
 """
 
-import copy
 import html
 import markdown
 import warnings
@@ -213,7 +212,7 @@ pre.code{
             meta = {}
 
         # We want to modify a local copy of meta, deleting redundant version info
-        meta = copy.deepcopy(meta)
+        meta = dict(meta)
 
         name_and_version = self.formatter.bold(html.escape(prop_name, False))
         deprecated_descr = None
@@ -629,6 +628,15 @@ pre.code{
     def emit(self):
         """ Output contents thus far """
 
+        contents = self.format_sections()
+        contents.extend(self.format_registry_sections())
+        contents = '\n'.join(contents)
+        return contents
+
+
+    def format_sections(self):
+        """ The sections rendered so far, formatted as a list of strings. The sections are cleared. """
+
         contents = []
 
         for section in self.sections:
@@ -670,8 +678,13 @@ pre.code{
                 contents.append(section['json_payload'])
 
         self.sections = []
+        return contents
 
-        # Profile output may include registry sections
+
+    def format_registry_sections(self):
+        """ Profile output may include registry sections. Returns them formatted as a list of strings. """
+
+        contents = []
         for section in self.registry_sections:
             contents.append(section.get('heading'))
             contents.append(section.get('requirement'))
@@ -686,75 +699,118 @@ pre.code{
                 header_row = self.formatter.make_row(header_cells)
                 contents.append(self.formatter.make_table(message_rows, [header_row], 'messages'))
 
-        contents = '\n'.join(contents)
         return contents
 
 
-    def output_document(self):
-        """Return full contents of document"""
+    def generate_schema_section(self, schema_ref):
+        """Generate the documentation section for one schema, keeping the headings for its TOC entries with it."""
+        num_sections = len(self.sections)
+        self.formatter.record_headings()
+        try:
+            super().generate_schema_section(schema_ref)
+        finally:
+            headings = self.formatter.stop_recording_headings()
+        if len(self.sections) > num_sections:
+            self.sections[num_sections]['headings'] = headings
+
+
+    def write_headed(self, sink, text, headings):
+        """ Write text to sink, noting where the headings recorded for it are """
+        notes = []
+        offset = 0
+        for heading in headings:
+            found = text.find(' id="' + heading['link_id'] + '"', offset)
+            if found != -1:
+                offset = found
+            notes.append((offset, heading))
+        sink.write(text, notes)
+
+
+    def fragment_headings(self, text, recorded):
+        """ The TOC headings in text, a supplemental fragment (introduction or postscript): those recorded as it
+        was made, and any written in it as raw HTML, which only the HTML itself shows. In document order. """
+        parser = ToCParser(self.formatter.toc_levels)
+        parser.feed(text)
+        recorded_by_id = {x['link_id']: x for x in recorded}
+        headings = [recorded_by_id.pop(x['link_id'], x) for x in parser.close()]
+        return headings + [x for x in recorded if x['link_id'] in recorded_by_id]
+
+
+    def begin_document(self, sink):
+        """ Write the head and introduction, leaving slots for the common objects, collections, and TOC """
 
         supplemental = self.config.get('supplemental', {})
-        body = ''
+
+        doc_title = supplemental.get('Title')
+        if not doc_title:
+            doc_title = ''
+
+        headlines = ['<head>', '<meta charset="utf-8">', '<title>' + doc_title + '</title>']
+        styles = self.css_content
+        headlines.append(styles)
+        headlines.append('</head>')
+        head = '\n'.join(headlines)
+        sink.write('\n'.join(['<!doctype html>', '<html>', head, '<body>', '']))
+
+        if self.config.get('add_toc'):
+            # The TOC goes at the [add_toc] marker, or failing that, at the top of the body.
+            sink.slot('toc_top')
+            sink.add_marker('toc', '[add_toc]')
+        sink.add_marker('common_objects', '<p>[insert_common_objects]</p>', '[insert_common_objects]')
+        sink.add_marker('collections', '<p>[insert_collections]</p>', '[insert_collections]')
 
         intro = supplemental.get('Introduction')
         if intro:
+            self.formatter.record_headings()
             intro = self.process_intro(intro)
-            body += intro
+            self.write_headed(sink, intro, self.fragment_headings(intro, self.formatter.stop_recording_headings()))
 
-        body += self.emit()
+
+    def write_sections(self, sink):
+        """ Write the sections rendered since the last call to sink """
+        headings = [x for section in self.sections for x in section.get('headings', [])]
+        self.write_body(sink, self.format_sections(), [(0, x) for x in headings])
+
+
+    def end_document(self, sink):
+        """ Write the registry sections and postscript, and fill in the common objects, collections, and TOC """
+
+        supplemental = self.config.get('supplemental', {})
+        self.write_body(sink, self.format_registry_sections())
 
         if 'Postscript' in supplemental:
-            body += self.formatter.markdown_to_html(supplemental['Postscript'])
+            self.formatter.record_headings()
+            postscript = self.formatter.markdown_to_html(supplemental['Postscript'])
+            self.write_headed(sink, postscript,
+                              self.fragment_headings(postscript, self.formatter.stop_recording_headings()))
 
+        self.formatter.record_headings()
         common_properties = self.generate_common_properties_doc()
-        marker = False
-        if '<p>[insert_common_objects]</p>' in body:
-            marker = '<p>[insert_common_objects]</p>'
-        elif '[insert_common_objects]' in body:
-            marker = '[insert_common_objects]'
-        if marker:
-            body = body.replace(marker, common_properties, 1)
+        headings = self.formatter.stop_recording_headings()
+        if sink.has_slot('common_objects'):
+            sink.fill('common_objects', common_properties, headings)
         else:
             if common_properties:
                 warnings.warn('Supplemental file lacks "[insert_common_objects]" marker. Common object properties were found but will be omitted.')
 
-
-        marker = False
-        if '<p>[insert_collections]</p>' in body:
-            marker = '<p>[insert_collections]</p>'
-        elif '[insert_collections]' in body:
-            marker = '[insert_collections]'
-        if marker:
-            collections_doc = self.generate_collections_doc()
-            body = body.replace(marker, collections_doc, 1)
+        if sink.has_slot('collections'):
+            sink.fill('collections', self.generate_collections_doc())
 
         if self.config.get('add_toc'):
-            toc = self.generate_toc(body)
-            if '[add_toc]' in body:
-                body = body.replace('[add_toc]', toc, 1)
+            toc = self.generate_toc(sink.notes())
+            if sink.has_slot('toc'):
+                sink.fill('toc', toc)
             else:
-                body = toc + body
-
-        doc_title = supplemental.get('Title')
-        if not doc_title:
-            doc_title = ''
+                sink.fill('toc_top', toc)
 
-        headlines = ['<head>', '<meta charset="utf-8">', '<title>' + doc_title + '</title>']
-        styles = self.css_content
-        headlines.append(styles)
-        headlines.append('</head>')
-        head = '\n'.join(headlines)
-        return '\n'.join(['<!doctype html>', '<html>', head, '<body>', body, '</body></html>'])
+        sink.write('\n</body></html>')
 
 
-    def generate_toc(self, html_blob):
-        """ Generate a TOC for an HTML blob (probably the body of this document) """
+    def generate_toc(self, toc_data):
+        """ Generate a TOC from headings (dicts of level, link_id, and text, as recorded by the formatter) """
 
         toc = ''
-        levels = ['h1', 'h2']
-        parser = ToCParser(levels)
-        parser.feed(html_blob)
-        toc_data = parser.close()
+        levels = self.formatter.toc_levels
 
         current_level = 0
         for entry in toc_data:
@@ -10,7 +10,6 @@ Brief : This file contains definitions for the MarkdownGenerator class.
 Initial author: Second Rise LLC.
 """
 
-import copy
 import warnings
 from doc_gen_util import DocGenUtilities
 from . import DocFormatter
@@ -92,7 +91,7 @@ class MarkdownGenerator(DocFormatter):
             meta = {}
 
         # We want to modify a local copy of meta, deleting redundant version info
-        meta = copy.deepcopy(meta)
+        meta = dict(meta)
 
         if prop_name:
             name_and_version = self.formatter.bold(self.escape_for_markdown(prop_name,
@@ -525,6 +524,14 @@ class MarkdownGenerator(DocFormatter):
     def emit(self):
         """ Output contents thus far """
 
+        contents = self.format_sections()
+        contents.extend(self.format_registry_sections())
+        return '\n'.join(contents)
+
+
+    def format_sections(self):
+        """ The sections rendered so far, formatted as a list of strings. The sections are cleared. """
+
         contents = []
 
         for section in self.sections:
@@ -555,8 +562,13 @@ class MarkdownGenerator(DocFormatter):
                 contents.append('\n'.join(section['property_details']))
 
         self.sections = []
+        return contents
+
 
-        # Profile output may include registry sections
+    def format_registry_sections(self):
+        """ Profile output may include registry sections. Returns them formatted as a list of strings. """
+
+        contents = []
         for section in self.registry_sections:
             contents.append(section.get('heading'))
             contents.append(section.get('requirement'))
@@ -572,14 +584,11 @@ class MarkdownGenerator(DocFormatter):
                 contents.append(self.formatter.make_table(message_rows, [header_row], 'messages'))
                 contents.append('\n')
 
-        return '\n'.join(contents)
-
+        return contents
 
-    def output_document(self):
-        """Return full contents of document"""
-        body = self.emit()
-        common_properties = self.generate_common_properties_doc()
 
+    def begin_document(self, sink):
+        """ Write the title and introduction, leaving slots for the common objects and collections """
         supplemental = self.config.get('supplemental', {})
 
         if 'Title' in supplemental:
@@ -598,19 +607,30 @@ search: true
             intro = self.process_intro(intro)
             prelude += '\n' + intro + '\n'
 
-        contents = [prelude, body]
-        if 'Postscript' in supplemental:
-            contents.append('\n' + supplemental['Postscript'])
+        sink.add_marker('common_objects', '[insert_common_objects]')
+        sink.add_marker('collections', '[insert_collections]')
+        sink.write(prelude + '\n')
+
+
+    def write_sections(self, sink):
+        """ Write the sections rendered since the last call to sink """
+        self.write_body(sink, self.format_sections())
+
 
-        output = '\n'.join(contents)
-        if '[insert_common_objects]' in output:
-            output = output.replace('[insert_common_objects]', common_properties, 1)
+    def end_document(self, sink):
+        """ Write the registry sections and postscript, and fill in the common objects and collections """
+        self.write_body(sink, self.format_registry_sections())
 
-        if '[insert_collections]' in output:
-            collections_doc = self.generate_collections_doc()
-            output = output.replace('[insert_collections]', collections_doc, 1)
+        supplemental = self.config.get('supplemental', {})
+        if 'Postscript' in supplemental:
+            sink.write('\n\n' + supplemental['Postscript'])
+
+        common_properties = self.generate_common_properties_doc()
+        if sink.has_slot('common_objects'):
+            sink.fill('common_objects', common_properties)
 
-        return output
+        if sink.has_slot('collections'):
+            sink.fill('collections', self.generate_collections_doc())
 
 
     def process_intro(self, intro_blob):
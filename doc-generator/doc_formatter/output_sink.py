@@ -0,0 +1,140 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: output_sink.py
+
+Brief: Destination for a document that is written a piece at a time, with slots for content
+(such as the common objects or a table of contents) that can only be produced at the end.
+"""
+
+import io
+import tempfile
+from doc_gen_util import DocGenUtilities
+
+
+class OutputSink:
+    """ A document, written in order, with slots to be filled in later.
+
+    Text is spooled as it is written: to a temporary file if the document is going to outfile,
+    otherwise to memory. A slot is a place in the document whose content is supplied by fill():
+    either the current position (see slot), or the first occurrence of a marker such as
+    "[insert_common_objects]" in text written after the marker is added (see add_marker). A marker
+    slot that is never filled keeps the marker text. finish() writes out the completed document.
+
+    Text may be written with notes about it (headings, for example), which notes() returns in document
+    order, without reading the text back.
+    """
+
+    READ_SIZE = 1048576 # characters copied from the spool at a time
+
+    def __init__(self, outfile=None):
+        self.outfile = outfile
+        if outfile:
+            self.spool = tempfile.TemporaryFile('w+', encoding='utf-8', newline='')
+        else:
+            self.spool = io.StringIO()
+        self.parts = [] # [start, length] of spooled text, or the name of a slot
+        self.markers = [] # (marker, slot name) for marker slots not yet found
+        self.slots = {} # slot name: content
+        self.notes_by_part = {} # index in parts, or slot name: notes
+
+
+    def write(self, text, notes=None):
+        """ Add text to the document, making slots of any markers found in it.
+
+        notes: optional list of (offset in text, note), in order.
+        """
+        notes = notes or []
+        while self.markers:
+            found = [(text.find(marker), -len(marker), marker, name) for marker, name in self.markers if marker in text]
+            if not found:
+                break
+            position, _, marker, name = min(found)
+            self._spool(text[:position], [x for x in notes if x[0] < position])
+            self._add_slot(name, marker)
+            self.markers = [x for x in self.markers if x[1] != name]
+            notes = [(x - position - len(marker), y) for x, y in notes if x >= position]
+            text = text[position + len(marker):]
+        self._spool(text, notes)
+
+
+    def slot(self, name):
+        """ Add an empty slot named name at the current position """
+        self._add_slot(name, '')
+
+
+    def add_marker(self, name, *markers):
+        """ Make the first occurrence of any of markers in text written from now on the slot named name.
+        Where markers overlap (like "<p>[add_toc]</p>" and "[add_toc]"), the longer one is used. """
+        for marker in markers:
+            self.markers.append((marker, name))
+
+
+    def has_slot(self, name):
+        """ True if the slot named name is in the document """
+        return name in self.slots
+
+
+    def fill(self, name, text, notes=None):
+        """ Set the content of the slot named name, with notes (a list) about it """
+        self.slots[name] = text
+        self.notes_by_part[name] = notes or []
+
+
+    def notes(self):
+        """ Yield the notes made so far, in document order """
+        for i, part in enumerate(self.parts):
+            for note in self.notes_by_part.get(part if isinstance(part, str) else i, []):
+                yield note
+
+
+    def chunks(self):
+        """ Yield the text of the document so far, in order, a piece at a time """
+        for part in self.parts:
+            if isinstance(part, str):
+                if self.slots[part]:
+                    yield self.slots[part]
+                continue
+            start, remaining = part
+            self.spool.seek(start)
+            while remaining > 0:
+                text = self.spool.read(min(remaining, self.READ_SIZE))
+                if not text:
+                    break
+                remaining -= len(text)
+                yield text
+
+
+    def finish(self):
+        """ Write the document to outfile, and return None; or, if there is no outfile, return the document. """
+        try:
+            if not self.outfile:
+                return ''.join(self.chunks())
+            timings = DocGenUtilities.timings
+            for text in self.chunks():
+                self.outfile.write(text)
+                if timings.enabled:
+                    timings.count('bytes_written', len(text.encode('utf-8')))
+            return None
+        finally:
+            self.spool.close()
+
+
+    def _spool(self, text, notes):
+        if not text:
+            return
+        self.spool.seek(0, io.SEEK_END) # chunks() may have moved it
+        if self.parts and not isinstance(self.parts[-1], str):
+            self.parts[-1][1] += len(text)
+        else:
+            self.parts.append([self.spool.tell(), len(text)])
+        self.spool.write(text)
+        if notes:
+            self.notes_by_part.setdefault(len(self.parts) - 1, []).extend([x[1] for x in notes])
+
+
+    def _add_slot(self, name, text):
+        self.parts.append(name)
+        self.slots[name] = text
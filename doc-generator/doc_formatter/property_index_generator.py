@@ -33,6 +33,9 @@ warnings.formatwarning = simple_warning_format
 class PropertyIndexGenerator(DocFormatter):
     """Provides methods for generating Property Index docs from Redfish schemas."""
 
+    # Properties are gathered into properties_by_name across all schemas.
+    supports_parallel_rendering = False
+
     def __init__(self, property_data, traverser, config, level=0):
         """
         property_data: pre-processed schemas.
@@ -199,12 +202,7 @@ class PropertyIndexGenerator(DocFormatter):
 
         Many properties are excluded in the parent doc_generator code, but for other output
         modes we sometimes include them in sub-properties. """
-        if prop_name in self.config['excluded_properties']:
-            return True
-        if prop_name in self.config['excluded_by_match']:
-            pass
-
-        return False
+        return self.property_exclusions.matches(prop_name)
 
 
     def coalesce_properties(self):
@@ -212,9 +210,7 @@ class PropertyIndexGenerator(DocFormatter):
 
         # Group the property info by prop_name, type, description:
         coalesced_info = {}
-        prop_names = self.exclude_prop_names(self.properties_by_name.keys(),
-                                             self.config['excluded_properties'],
-                                             self.config['excluded_by_match'])
+        prop_names = self.exclude_prop_names(self.properties_by_name.keys(), self.property_exclusions)
 
         for property_name in prop_names:
             property_infos = self.properties_by_name[property_name]
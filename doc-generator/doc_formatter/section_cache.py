@@ -0,0 +1,121 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: section_cache.py
+
+Brief: Rendered documentation sections from a previous run, with the schema files each one
+depended on, so that an incremental build re-renders only what has changed.
+"""
+
+import hashlib
+import marshal
+import os
+from doc_gen_util import DocGenUtilities
+
+
+class SectionCache:
+    """ Rendered output for schema sections, the common objects section, and intro fragments.
+
+    Dependencies are tracked per schema "family": an unversioned schema URI together with all of its
+    versioned files, since the data we render for any one of them is assembled from the whole group.
+    Each entry records the families whose refs were resolved while it was rendered, with the family
+    fingerprints at the time. An entry is reused only if every one of those fingerprints still matches.
+
+    Anything else that can affect the output (configuration, supplemental content, the set of
+    documented schemas) belongs in build_key; a change there discards every entry.
+    """
+
+    result_name = 'sections-2' # the number changes with what's kept for each entry, so older entries are ignored
+
+    def __init__(self, schema_cache, family_fingerprints, build_key, results=None):
+        """ schema_cache: the SchemaCache used for persistence (if it has a cache_dir) and fingerprinting.
+        family_fingerprints: dict of family: fingerprint for the input files (see family_fingerprints).
+        build_key: marshal-able, hashable key for everything else the output depends on.
+        results: optional dict to keep entries in memory between builds in one process. They're held in
+        marshal form, since the data we hand out gets modified.
+        """
+        self.schema_cache = schema_cache
+        self.fingerprints = dict(family_fingerprints)
+        self.build_key = build_key
+        self.results = results
+        self.previous = None
+        if results is not None and build_key in results:
+            self.previous = marshal.loads(results[build_key])
+        if self.previous is None:
+            self.previous = schema_cache.get_result(self.result_name, build_key) or {}
+        self.current = {}
+        self.reused = []
+        self.rendered = []
+
+
+    @staticmethod
+    def family_for(ref):
+        """ Dependency key for a ref: the normalized, unversioned schema URI (with no path part). """
+        if '#' in ref:
+            ref = ref.split('#')[0]
+        if '://' in ref:
+            ref = ref.split('://')[1]
+        return DocGenUtilities.make_unversioned_ref(ref) or ref
+
+
+    @staticmethod
+    def family_fingerprints(schema_cache, uris_and_filenames):
+        """ Compute fingerprints by family for an iterable of (normalized_uri, filename) pairs. """
+        by_family = {}
+        for normalized_uri, filename in uris_and_filenames:
+            family = SectionCache.family_for(normalized_uri)
+            by_family.setdefault(family, []).append(normalized_uri + ' ' + str(schema_cache.fingerprint(filename)))
+
+        fingerprints = {}
+        for family, parts in by_family.items():
+            fingerprints[family] = hashlib.sha256('\n'.join(sorted(parts)).encode('utf-8')).hexdigest()
+        return fingerprints
+
+
+    def fingerprint(self, family):
+        """ Current fingerprint for a family. Local files outside the input set (fragments, for example)
+        are fingerprinted directly; anything else we can't see is None. """
+        if family not in self.fingerprints:
+            fingerprint = None
+            if os.path.isfile(family):
+                fingerprint = self.schema_cache.fingerprint(family)
+            self.fingerprints[family] = fingerprint
+        return self.fingerprints[family]
+
+
+    def get(self, kind, key):
+        """ Return the cached entry (a dict with 'output', 'common_properties', and 'headings') for kind and key,
+        if its dependencies are unchanged. Otherwise None. """
+        entry = self.previous.get(kind, {}).get(key)
+        if entry is None:
+            return None
+        for family, fingerprint in entry['dependencies'].items():
+            if self.fingerprint(family) != fingerprint:
+                return None
+        self.current.setdefault(kind, {})[key] = entry
+        self.reused.append((kind, key))
+        return entry
+
+
+    def put(self, kind, key, output, common_properties, touched_refs, headings=None):
+        """ Record freshly rendered output for kind and key, with the refs it touched, and the headings
+        recorded while rendering it (see FormatUtils.record_headings). """
+        dependencies = {}
+        for ref in touched_refs:
+            family = self.family_for(ref)
+            dependencies[family] = self.fingerprint(family)
+        self.current.setdefault(kind, {})[key] = {'output': output,
+                                                  'common_properties': common_properties,
+                                                  'headings': headings or [],
+                                                  'dependencies': dependencies}
+        self.rendered.append((kind, key))
+
+
+    def save(self):
+        """ Persist this run's entries. Entries that weren't used this time are dropped. """
+        if self.results is not None:
+            self.results.clear()
+            self.results[self.build_key] = marshal.dumps(self.current)
+        self.schema_cache.put_result(self.result_name, self.build_key, self.current)
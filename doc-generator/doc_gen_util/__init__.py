@@ -2,4 +2,12 @@
 # Copyright 2016, 2017 Distributed Management Task Force, Inc. All rights reserved.
 # License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
 
+from .schema_cache import SchemaCache
+from .prefix_map import PrefixMap
+from .name_matcher import NameMatcher
+from .uri_replacement_index import UriReplacementIndex
+from .http_fetcher import HttpFetcher
+from .timings import Timings
+from .version import Version
+from .version_index import VersionIndex
 from .doc_gen_util import DocGenUtilities
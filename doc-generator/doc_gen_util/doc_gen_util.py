@@ -16,12 +16,24 @@ import urllib.request
 import json
 import os
 import re
+import functools
 import warnings
+from .schema_cache import SchemaCache
+from .http_fetcher import HttpFetcher
+from .timings import Timings
+from .version import Version
+
+VERSIONED_REF_PATTERN = re.compile(r'(.+)\.v([^\.]+)\.json(#.+)?')
+ODATA_REF_PATTERN = re.compile(r'(.+/odata)\.(.+)\.json(#.+)?')
+REF_VERSION_PATTERN = re.compile(r'.+\.v([^\.]+)\.json.*')
 
 class DocGenUtilities:
     """ Redfish Documentation Generator Utilities. """
 
     timeout = 4 # Seconds for HTTP timeout
+    schema_cache = SchemaCache() # Decoded JSON files, shared across the run
+    http_fetcher = HttpFetcher(timeout) # Remote content (and failures), shared across the run
+    timings = Timings() # Phase timings and counters, for --timings
 
     @staticmethod
     def load_as_json(filename):
@@ -32,12 +44,17 @@ class DocGenUtilities:
         if '/odata.json' in filename:
             return None
 
+        data = DocGenUtilities.schema_cache.get(filename)
+        if data is not None:
+            return data
+
         data = {}
         try:
             # Parse file as json
             jsondata = open(filename, 'r', encoding="utf8")
             data = json.load(jsondata)
             jsondata.close()
+            DocGenUtilities.schema_cache.put(filename, data)
         except (OSError, json.JSONDecodeError) as ex:
             warnings.warn('Unable to read ' + filename + ': ' + str(ex))
 
@@ -57,8 +74,9 @@ class DocGenUtilities:
             if 'odata.json' in uri:
                 return None
 
-            f = urllib.request.urlopen(uri, None, DocGenUtilities.timeout)
-            json_string = f.read().decode('utf-8')
+            json_string = DocGenUtilities.http_fetcher.fetch(uri)
+            if json_string is None:
+                return None
             json_data = json.loads(json_string)
             return json_data
 
@@ -70,16 +88,10 @@ class DocGenUtilities:
     @staticmethod
     def http_load(uri):
         """ Load URI and return response """
-        try:
-            if '://' not in uri:
-                uri = 'http://' + uri
+        if '://' not in uri:
+            uri = 'http://' + uri
 
-            f = urllib.request.urlopen(uri, None, DocGenUtilities.timeout)
-            return f.read().decode('utf-8')
-
-        except Exception as ex:
-            warnings.warn("Unable to retrieve data from '" + uri + "': " + str(ex))
-            return None
+        return DocGenUtilities.http_fetcher.fetch(uri)
 
 
     @staticmethod
@@ -118,38 +130,27 @@ class DocGenUtilities:
 
     @staticmethod
     def compare_versions(version, context_version):
-        """ Returns +1 if version is newer than context_version, -1 if version is older, 0 if equal """
+        """ Returns +1 if version is newer than context_version, -1 if version is older, 0 if equal.
+        Either may be a string or a Version. """
 
         if version == context_version:
             return 0
-        else:
-            if '_' in version:
-                sep = '_'
-            else:
-                sep = '.'
-            version_parts = version.split(sep)
-            if '_' in context_version:
-                sep = '_'
-            else:
-                sep = '.'
-            context_parts = context_version.split(sep)
-            # versions are expected to have three parts
-            for i in range(3):
-                if version_parts[i] > context_parts[i]:
-                    return 1
-                if version_parts[i] < context_parts[i]:
-                    return -1
-            return 0
+        version = Version.parse(version)
+        context_version = Version.parse(context_version)
+        if version > context_version:
+            return 1
+        if version < context_version:
+            return -1
+        return 0
 
     @staticmethod
+    @functools.lru_cache(maxsize=8192)
     def make_unversioned_ref(this_ref):
         """Get the un-versioned string based on a (possibly versioned) ref"""
         unversioned = None
-        pattern = re.compile(r'(.+)\.v([^\.]+)\.json(#.+)?')
-        match = pattern.fullmatch(this_ref)
+        match = VERSIONED_REF_PATTERN.fullmatch(this_ref)
         if not match and 'odata' in this_ref:
-            pattern = re.compile(r'(.+/odata)\.(.+)\.json(#.+)?')
-            match = pattern.fullmatch(this_ref)
+            match = ODATA_REF_PATTERN.fullmatch(this_ref)
         if match:
             unversioned = match.group(1) + '.json'
             if match.group(3):
@@ -159,12 +160,12 @@ class DocGenUtilities:
 
 
     @staticmethod
+    @functools.lru_cache(maxsize=8192)
     def get_ref_version(this_ref):
         """Get the version string based on a (possibly versioned) ref"""
 
         version_string = None
-        pattern = re.compile(r'.+\.v([^\.]+)\.json.*')
-        match = pattern.fullmatch(this_ref)
+        match = REF_VERSION_PATTERN.fullmatch(this_ref)
         if match:
             version_string = match.group(1)
             version_string = version_string.replace('_', '.')
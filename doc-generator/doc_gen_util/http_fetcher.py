@@ -0,0 +1,326 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: http_fetcher.py
+
+Brief: HTTP(S) retrieval for remote schemas, profiles, and registries: keep-alive connection reuse,
+concurrent prefetching, caching of both results and failures, and an optional on-disk mirror
+for conditional revalidation and offline runs.
+"""
+
+import concurrent.futures
+import http.client
+import io
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+import urllib.response
+import warnings
+from .http_mirror import HttpMirror
+
+
+class ConnectionPool:
+    """ Idle keep-alive connections, by (connection class, host, tunnel host, timeout). Thread-safe.
+
+    Connections aren't shared with child processes: after a fork, the child starts with an empty pool.
+    """
+
+    def __init__(self, max_idle_per_key=8):
+        self.max_idle_per_key = max_idle_per_key
+        self.idle = {}
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.connections_opened = 0
+
+
+    def acquire(self, key):
+        """ Return an idle connection for key, or None. """
+        with self.lock:
+            self._check_pid()
+            connections = self.idle.get(key)
+            if connections:
+                return connections.pop()
+        return None
+
+
+    def release(self, key, connection):
+        """ Return a connection, with its response fully read, to the pool. """
+        with self.lock:
+            self._check_pid()
+            connections = self.idle.setdefault(key, [])
+            if len(connections) < self.max_idle_per_key:
+                connections.append(connection)
+                return
+        connection.close()
+
+
+    def opened(self):
+        """ Count a newly opened connection. """
+        with self.lock:
+            self.connections_opened += 1
+
+
+    def clear(self):
+        """ Close all idle connections. """
+        with self.lock:
+            for connections in self.idle.values():
+                for connection in connections:
+                    connection.close()
+            self.idle = {}
+
+
+    def _check_pid(self):
+        if self.pid != os.getpid():
+            # We've been forked; the sockets belong to our parent.
+            self.idle = {}
+            self.pid = os.getpid()
+
+
+connection_pool = ConnectionPool()
+
+
+class KeepAliveMixin:
+    """ urllib handler behavior: send requests over pooled keep-alive connections. """
+
+    def open_pooled(self, req, connection_class, **kwargs):
+        host = req.host
+        if not host:
+            raise urllib.error.URLError('no host given')
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items() if k not in headers})
+        headers = {name.title(): value for name, value in headers.items()}
+        headers['Connection'] = 'keep-alive'
+
+        tunnel_host = getattr(req, '_tunnel_host', None)
+        tunnel_headers = {}
+        if tunnel_host and 'Proxy-Authorization' in headers:
+            tunnel_headers['Proxy-Authorization'] = headers.pop('Proxy-Authorization')
+
+        key = (connection_class.__name__, host, tunnel_host, req.timeout)
+        while True:
+            connection = connection_pool.acquire(key)
+            is_new = connection is None
+            if is_new:
+                connection = connection_class(host, timeout=req.timeout, **kwargs)
+                if tunnel_host:
+                    connection.set_tunnel(tunnel_host, headers=tunnel_headers)
+                connection_pool.opened()
+            try:
+                connection.request(req.get_method(), req.selector, req.data, headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (ConnectionError, http.client.BadStatusLine) as ex:
+                connection.close()
+                if is_new:
+                    raise urllib.error.URLError(ex)
+                continue # The server closed an idle connection; try again with a new one.
+            except OSError as ex:
+                connection.close()
+                raise urllib.error.URLError(ex)
+            break
+
+        if response.will_close:
+            connection.close()
+        else:
+            connection_pool.release(key, connection)
+
+        result = urllib.response.addinfourl(io.BytesIO(body), response.msg, req.get_full_url(), response.status)
+        result.msg = response.reason
+        return result
+
+
+class KeepAliveHTTPHandler(KeepAliveMixin, urllib.request.HTTPHandler):
+
+    def http_open(self, req):
+        return self.open_pooled(req, http.client.HTTPConnection)
+
+
+class KeepAliveHTTPSHandler(KeepAliveMixin, urllib.request.HTTPSHandler):
+
+    def https_open(self, req):
+        return self.open_pooled(req, http.client.HTTPSConnection, context=self._context)
+
+
+_keep_alive_opener = (None, None) # (the urllib.request it was built with, opener); tests may swap in a mock
+
+def keep_alive_opener():
+    """ An opener that sends http and https requests over pooled keep-alive connections. Built on first use,
+    and used only by HttpFetcher: urllib's global opener (urllib.request.urlopen) is left alone. """
+    global _keep_alive_opener
+    if _keep_alive_opener[0] is not urllib.request:
+        _keep_alive_opener = (urllib.request,
+                              urllib.request.build_opener(KeepAliveHTTPHandler, KeepAliveHTTPSHandler))
+    return _keep_alive_opener[1]
+
+
+class HttpFetcher:
+    """ Fetches text content by URI, remembering results and failures for the rest of the run.
+
+    Failures are remembered for failure_ttl seconds, so an unreachable URI costs one timeout rather than
+    one per reference, and is reported once. prefetch() retrieves a batch of URIs concurrently, with at
+    most max_workers requests in flight, so that later fetches are served from memory.
+
+    With a mirror directory, retrieved content is also saved to disk along with its ETag and Last-Modified
+    headers. Later runs revalidate saved content with a conditional GET, and fall back on it if the server
+    can't be reached. If offline is set, no requests are made at all: content comes from the mirror or
+    not at all.
+    """
+
+    def __init__(self, timeout=4, max_workers=8, failure_ttl=300, mirror_dir=None, offline=False):
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.failure_ttl = failure_ttl
+        self.responses = {} # uri: text
+        self.failures = {}  # uri: {'time', 'error', 'reported'}
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.hits = 0
+        self.revalidated = 0 # requests answered "304 Not Modified"
+        self.mirror_hits = 0 # fetches served from the mirror without a request (offline, or server unreachable)
+        self.mirror = None
+        self.offline = False
+        self.set_mirror(mirror_dir, offline)
+
+
+    def set_mirror(self, mirror_dir, offline=False):
+        """ Save content to (and revalidate it from) mirror_dir; None turns the mirror off.
+        If offline, make no requests. """
+        self.mirror = HttpMirror(mirror_dir) if mirror_dir else None
+        self.offline = offline
+
+
+    def fetch(self, uri, warn=True):
+        """ Return the content at uri, decoded as UTF-8, or None (with a warning, if warn) on failure. """
+        with self.lock:
+            text = self.responses.get(uri)
+            if text is not None:
+                self.hits += 1
+                return text
+            failure = self.failures.get(uri)
+            if failure and time.monotonic() - failure['time'] < self.failure_ttl:
+                self.hits += 1
+                if warn and not failure['reported']:
+                    failure['reported'] = True
+                    warnings.warn("Unable to retrieve data from '" + uri + "': " + failure['error'])
+                return None
+            if not self.offline:
+                self.requests += 1
+
+        entry = self.mirror.get(uri) if self.mirror else None
+        try:
+            if self.offline:
+                if entry is None:
+                    raise LookupError('not available offline')
+                text = entry['body']
+                with self.lock:
+                    self.mirror_hits += 1
+            else:
+                text = self.retrieve(uri, entry)
+        except Exception as ex:
+            if entry is not None and not self.offline and self.is_transient_failure(ex):
+                # Use what we saved last time; the server is (we hope) only temporarily unreachable.
+                text = entry['body']
+                with self.lock:
+                    self.mirror_hits += 1
+            else:
+                with self.lock:
+                    self.failures[uri] = {'time': time.monotonic(), 'error': str(ex), 'reported': warn}
+                if warn:
+                    warnings.warn("Unable to retrieve data from '" + uri + "': " + str(ex))
+                return None
+
+        with self.lock:
+            self.responses[uri] = text
+            self.failures.pop(uri, None)
+        return text
+
+
+    def retrieve(self, uri, entry=None):
+        """ Request uri and return its content. If we have a mirror entry for it, make the request conditional
+        on the entry's validators, and return its body if the server says it's unchanged. """
+        opener = keep_alive_opener()
+        if self.mirror is None:
+            f = opener.open(uri, None, self.timeout)
+            return self.decode(f.read())
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        try:
+            f = opener.open(urllib.request.Request(uri, headers=headers), None, self.timeout)
+        except urllib.error.HTTPError as ex:
+            if ex.code == 304 and entry:
+                with self.lock:
+                    self.revalidated += 1
+                return entry['body']
+            raise
+
+        text = self.decode(f.read())
+        self.mirror.put(uri, text, f.headers.get('ETag'), f.headers.get('Last-Modified'))
+        return text
+
+
+    @staticmethod
+    def is_transient_failure(ex):
+        """ Whether ex, raised by retrieve, means the server couldn't be reached or couldn't answer (a connection
+        failure, a timeout, or a 5xx status), rather than that the content is gone or unusable. """
+        if isinstance(ex, urllib.error.HTTPError):
+            return ex.code >= 500
+        return isinstance(ex, (urllib.error.URLError, http.client.HTTPException, OSError))
+
+
+    @staticmethod
+    def decode(content):
+        text = content.decode('utf-8')
+        if not isinstance(text, str):
+            raise TypeError('unexpected response content')
+        return text
+
+
+    def prefetch(self, uris):
+        """ Fetch any of uris we don't already have, concurrently. Failures are reported when the URI is
+        next fetched. Returns the number of URIs requested. """
+        if self.offline and not self.mirror:
+            return 0
+        with self.lock:
+            pending = []
+            for uri in uris:
+                if uri not in self.responses and uri not in self.failures and uri not in pending:
+                    pending.append(uri)
+        if not pending:
+            return 0
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+            list(executor.map(lambda uri: self.fetch(uri, warn=False), pending))
+        return len(pending)
+
+
+    def clear(self):
+        """ Forget all results and failures, and reset the counters. """
+        with self.lock:
+            self.responses = {}
+            self.failures = {}
+            self.requests = 0
+            self.hits = 0
+            self.revalidated = 0
+            self.mirror_hits = 0
+
+
+    def stats(self):
+        """ Summary of fetch activity, as a dict """
+        with self.lock:
+            return {'requests': self.requests,
+                    'hits': self.hits,
+                    'responses': len(self.responses),
+                    'failures': len(self.failures),
+                    'revalidated': self.revalidated,
+                    'mirror_hits': self.mirror_hits,
+                    'connections_opened': connection_pool.connections_opened}
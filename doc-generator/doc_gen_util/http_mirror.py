@@ -0,0 +1,67 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: http_mirror.py
+
+Brief: On-disk store of remote content (schemas, profiles, registries, directory listings) and the
+validators needed to revalidate it, so that runs can use conditional requests or work offline.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import warnings
+
+
+class HttpMirror:
+    """ Saved HTTP responses, one JSON file per URI, each with the body and its ETag and Last-Modified headers. """
+
+    def __init__(self, mirror_dir):
+        self.mirror_dir = mirror_dir
+        try:
+            os.makedirs(mirror_dir, exist_ok=True)
+        except OSError as ex:
+            warnings.warn('Unable to use HTTP mirror directory ' + mirror_dir + ': ' + str(ex))
+            self.mirror_dir = None
+
+
+    def get(self, uri):
+        """ Return the saved entry for uri, as a dict with 'uri', 'body', 'etag', 'last_modified' and
+        'fetched' (a timestamp), or None. """
+        if not self.mirror_dir:
+            return None
+        try:
+            with open(self._entry_path(uri), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get('uri') != uri or not isinstance(entry.get('body'), str):
+            return None
+        return entry
+
+
+    def put(self, uri, body, etag=None, last_modified=None):
+        """ Save body for uri, with the validators the server sent along with it. """
+        if not self.mirror_dir:
+            return
+        entry = {'uri': uri,
+                 'body': body,
+                 'etag': etag,
+                 'last_modified': last_modified,
+                 'fetched': time.time()}
+        path = self._entry_path(uri)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.mirror_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as ex:
+            warnings.warn('Unable to write HTTP mirror entry ' + path + ': ' + str(ex))
+
+
+    def _entry_path(self, uri):
+        return os.path.join(self.mirror_dir, hashlib.sha256(uri.encode('utf-8')).hexdigest() + '.json')
@@ -0,0 +1,47 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: name_matcher.py
+
+Brief: Matcher for the exclusion lists (excluded_properties with excluded_by_match, excluded_annotations
+with excluded_annotations_by_match, excluded_schemas with excluded_schemas_by_match).
+"""
+
+import re
+
+
+class NameMatcher:
+    """ Tests names against a list of exact names and a list of substrings.
+
+    The exact names are held in a set, and the substrings are compiled into one alternation regex, so
+    a name is checked in a single search rather than a loop over every substring. Results are
+    remembered per name, as the same property names come up in every schema.
+    """
+
+    def __init__(self, exact=None, substrings=None):
+        self.exact = frozenset(exact or [])
+        self.substrings = [x for x in (substrings or []) if x]
+        self.pattern = None
+        if self.substrings:
+            # Longest first, so the regex engine tries the most specific alternatives first.
+            alternatives = sorted(set(self.substrings), key=len, reverse=True)
+            self.pattern = re.compile('|'.join([re.escape(x) for x in alternatives]))
+        self.matches_empty = len(self.substrings) != len(substrings or []) # '' is in every name
+        self.results = {} # name: result of matches
+
+
+    def matches(self, name):
+        """ True if name is one of the exact names, or contains one of the substrings """
+        result = self.results.get(name)
+        if result is None:
+            result = (name in self.exact or self.matches_empty
+                      or (self.pattern is not None and self.pattern.search(name) is not None))
+            self.results[name] = result
+        return result
+
+
+    def exclude(self, names):
+        """ The names that don't match, in their original order """
+        return [x for x in names if not self.matches(x)]
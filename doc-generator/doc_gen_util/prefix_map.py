@@ -0,0 +1,70 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: prefix_map.py
+
+Brief: Longest-prefix lookup for the URI <-> local path mappings (uri_to_local, local_to_uri,
+profile_uri_to_local).
+"""
+
+import bisect
+import os
+
+
+class PrefixMap:
+    """ Read-only map of string prefixes to values, for finding the keys that are prefixes of a string.
+
+    Keys are held in sorted order. The greatest key that sorts at or before a string is the only
+    candidate for its longest prefix; if that candidate doesn't match, any shorter match must also
+    be a prefix of what the candidate and the string have in common, so we narrow the search and repeat.
+    Each step is a binary search, rather than a scan of every key.
+    """
+
+    def __init__(self, mapping=None):
+        self.mapping = dict(mapping or {})
+        self.keys = sorted(self.mapping.keys())
+
+
+    def __len__(self):
+        return len(self.keys)
+
+
+    def matches(self, text):
+        """ Generate (prefix, value) for each key that is a prefix of text, longest first. """
+        hi = len(self.keys)
+        while True:
+            i = self._search(text, hi)
+            if i < 0:
+                return
+            candidate = self.keys[i]
+            yield candidate, self.mapping[candidate]
+            if not candidate:
+                return
+            text = candidate[:-1]
+            hi = i
+
+
+    def longest_match(self, text):
+        """ Return (prefix, value) for the longest key that is a prefix of text, or None. """
+        i = self._search(text, len(self.keys))
+        if i < 0:
+            return None
+        candidate = self.keys[i]
+        return candidate, self.mapping[candidate]
+
+
+    def _search(self, text, hi):
+        """ Index of the longest key in keys[:hi] that is a prefix of text, or -1. """
+        keys = self.keys
+        while hi:
+            i = bisect.bisect_right(keys, text, 0, hi) - 1
+            if i < 0:
+                return -1
+            candidate = keys[i]
+            if text.startswith(candidate):
+                return i
+            text = os.path.commonprefix((candidate, text))
+            hi = i
+        return -1
@@ -0,0 +1,237 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: schema_cache.py
+
+Brief: Size-bounded cache of decoded JSON schema files, shared by everything that
+calls DocGenUtilities.load_as_json. Optionally backed by a cache directory that
+persists between runs.
+"""
+
+import collections
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+import warnings
+
+
+class SchemaCache:
+    """ LRU cache of decoded JSON documents, keyed by absolute filename.
+
+    Callers routinely annotate the data they load (_schema_name, _doc_generator_meta, and so on),
+    so every hit returns a private copy. Entries are held in marshal form, which reconstitutes
+    considerably faster than re-reading and re-decoding the JSON.
+
+    If cache_dir is set, entries are also written there, one file per schema, along with any
+    derived results saved with put_result. A persisted entry is used as long as the source file's
+    mtime and size are unchanged or, failing that, its content hash still matches.
+    """
+
+    # Bump this if the layout of persisted entries changes.
+    format_tag = 'schema-cache-1-py' + '.'.join([str(x) for x in sys.version_info[:2]])
+
+    def __init__(self, max_entries=4096, cache_dir=None):
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.cache_dir = None
+        if cache_dir:
+            self.set_cache_dir(cache_dir)
+
+
+    @staticmethod
+    def make_key(filename):
+        """ Normalize filename for use as a cache key """
+        return os.path.abspath(filename)
+
+
+    def set_cache_dir(self, cache_dir):
+        """ Persist entries to cache_dir (created if necessary). None turns persistence off. """
+        if cache_dir:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+            except OSError as ex:
+                warnings.warn('Unable to use cache directory ' + cache_dir + ': ' + str(ex))
+                cache_dir = None
+        self.cache_dir = cache_dir
+
+
+    def get(self, filename):
+        """ Return a fresh copy of the decoded data for filename, or None if it is not cached. """
+        key = self.make_key(filename)
+        blob = self.entries.get(key)
+        if blob is None and self.cache_dir:
+            blob = self._disk_get(key)
+            if blob is not None:
+                self.disk_hits += 1
+                self._remember(key, blob)
+
+        if blob is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return marshal.loads(blob)
+
+
+    def put(self, filename, data):
+        """ Save decoded data for filename, evicting the least recently used entry if we're full. """
+        key = self.make_key(filename)
+        blob = marshal.dumps(data)
+        self._remember(key, blob)
+        if self.cache_dir:
+            self._disk_put(key, blob)
+
+
+    def invalidate(self, filename):
+        """ Drop any cached data for filename """
+        key = self.make_key(filename)
+        self.entries.pop(key, None)
+        if self.cache_dir:
+            try:
+                os.remove(self._entry_path('schema', key))
+            except OSError:
+                pass
+
+
+    def clear(self):
+        """ Drop all in-memory entries and reset the counters. Persisted entries are kept. """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+
+    def stats(self):
+        """ Summary of cache activity, as a dict """
+        return {'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits}
+
+
+    def fingerprint(self, filename):
+        """ Content hash for filename, reusing the persisted hash if the file's mtime and size are unchanged. """
+        key = self.make_key(filename)
+        if self.cache_dir:
+            entry = self._read_entry(self._entry_path('schema', key))
+            if entry and entry.get('path') == key:
+                try:
+                    stat = os.stat(key)
+                except OSError:
+                    return None
+                if entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                    return entry['hash']
+        return self._hash_file(key)
+
+
+    def get_result(self, name, key_parts):
+        """ Retrieve a persisted derived result (for example, file groupings) saved under name and key_parts.
+
+        key_parts must be marshal-able and should include whatever the result depends on,
+        typically the fingerprints of the input files. Returns None if there is no such result. """
+        if not self.cache_dir:
+            return None
+        entry = self._read_entry(self._entry_path(name, key_parts))
+        if entry is None:
+            return None
+        return entry.get('result')
+
+
+    def put_result(self, name, key_parts, result):
+        """ Persist a derived result (which must be marshal-able) under name and key_parts. """
+        if not self.cache_dir:
+            return
+        self._write_entry(self._entry_path(name, key_parts), {'result': result})
+
+
+    def _remember(self, key, blob):
+        if not self.max_entries:
+            return
+        self.entries[key] = blob
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+    def _disk_get(self, key):
+        """ Get the marshalled data for key from the cache dir, if it is still valid. """
+        path = self._entry_path('schema', key)
+        entry = self._read_entry(path)
+        if not entry or entry.get('path') != key:
+            return None
+
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return None
+
+        if entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry['data']
+
+        # The file was touched; it's still good if the content is unchanged.
+        if self._hash_file(key) == entry['hash']:
+            entry['mtime'] = stat.st_mtime_ns
+            entry['size'] = stat.st_size
+            self._write_entry(path, entry)
+            return entry['data']
+
+        return None
+
+
+    def _disk_put(self, key, blob):
+        try:
+            stat = os.stat(key)
+        except OSError:
+            return
+        entry = {'path': key,
+                 'mtime': stat.st_mtime_ns,
+                 'size': stat.st_size,
+                 'hash': self._hash_file(key),
+                 'data': blob}
+        self._write_entry(self._entry_path('schema', key), entry)
+
+
+    def _entry_path(self, name, key_parts):
+        digest = hashlib.sha256(marshal.dumps((self.format_tag, key_parts))).hexdigest()
+        return os.path.join(self.cache_dir, name + '-' + digest + '.cache')
+
+
+    @staticmethod
+    def _hash_file(filename):
+        try:
+            with open(filename, 'rb') as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+
+
+    @staticmethod
+    def _read_entry(path):
+        try:
+            with open(path, 'rb') as f:
+                entry = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if not isinstance(entry, dict):
+            return None
+        return entry
+
+
+    def _write_entry(self, path, entry):
+        """ Write entry atomically, so concurrent runs sharing a cache dir don't see partial files. """
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                marshal.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as ex:
+            warnings.warn('Unable to write cache entry ' + path + ': ' + str(ex))
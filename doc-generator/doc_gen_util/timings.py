@@ -0,0 +1,87 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: timings.py
+
+Brief: Records time spent in the phases of a run, and counts of hot-path events, for --timings.
+"""
+
+import contextlib
+import time
+
+
+class NoTiming:
+    """ A context manager that does nothing: what Timings.phase returns while timings are off.
+    (contextlib.nullcontext is newer than some of the Python versions we support.) """
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+no_timing = NoTiming()
+
+
+class Timings:
+    """ Phase timings and event counters for a run.
+
+    Nothing is recorded until enabled is set, and phase() and count() cost little while it isn't.
+    A phase may be timed per item (a schema, for example) as well as in total. Phases can nest
+    (markdown conversion happens while rendering a section), so their times overlap.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+
+    def reset(self):
+        """ Forget everything recorded so far """
+        self.phases = {} # name: [seconds, calls]
+        self.items = {} # name: {item: seconds}
+        self.counters = {} # name: count
+
+
+    def phase(self, name, item=None):
+        """ Context manager timing a phase, and the item it's for, if given """
+        if not self.enabled:
+            return no_timing
+        return self._timed(name, item)
+
+
+    @contextlib.contextmanager
+    def _timed(self, name, item):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, item)
+
+
+    def add(self, name, seconds, item=None):
+        """ Record seconds spent in a phase """
+        totals = self.phases.setdefault(name, [0.0, 0])
+        totals[0] += seconds
+        totals[1] += 1
+        if item is not None:
+            items = self.items.setdefault(name, {})
+            items[item] = items.get(item, 0.0) + seconds
+
+
+    def count(self, name, n=1):
+        """ Add n to a counter """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+
+    def report(self):
+        """ Everything recorded, as a dict that can be serialized as JSON """
+        phases = {}
+        for name, (seconds, calls) in self.phases.items():
+            phases[name] = {'seconds': round(seconds, 6), 'calls': calls}
+            if name in self.items:
+                phases[name]['items'] = {x: round(y, 6) for x, y in sorted(self.items[name].items())}
+        return {'phases': phases, 'counters': dict(sorted(self.counters.items()))}
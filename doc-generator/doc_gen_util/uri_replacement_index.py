@@ -0,0 +1,69 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: uri_replacement_index.py
+
+Brief: Lookup table for the uri_replacements config (the supplement's Schema Documentation section).
+"""
+
+import re
+
+
+class UriReplacementIndex:
+    """ Finds the replacement for a ref URI in uri_replacements, which maps a key to a list of match specs
+    ({'full_match': uri, 'replace_with': ...} or {'wild_match': regex parts, 'replace_with': ...}).
+
+    A spec applies when its key is part of the URI and the URI either equals its full_match or is
+    searched by its wild_match pattern. Keys are considered longest first, and the last spec that
+    applies wins.
+
+    Specs are numbered in that order when the index is built. Full matches go in a dict by URI; the
+    wild_match patterns are compiled, and also combined into one regex that rules most URIs out in
+    a single search. Results are remembered per URI.
+    """
+
+    def __init__(self, uri_replacements=None):
+        uri_replacements = uri_replacements or {}
+        self.full_matches = {} # full_match: [(priority, key, replace_with)]
+        self.wild_matches = [] # (priority, key, compiled pattern, replace_with)
+        self.results = {} # ref_uri: replacement
+
+        priority = 0
+        for key in sorted(uri_replacements.keys(), key=len, reverse=True):
+            for match_spec in uri_replacements[key]:
+                if match_spec.get('full_match'):
+                    self.full_matches.setdefault(match_spec['full_match'], []).append(
+                        (priority, key, match_spec.get('replace_with')))
+                if match_spec.get('wild_match'):
+                    self.wild_matches.append((priority, key, re.compile(''.join(match_spec['wild_match'])),
+                                              match_spec.get('replace_with')))
+                priority += 1
+
+        self.wild_filter = None
+        if self.wild_matches:
+            self.wild_filter = re.compile('|'.join(['(?:' + x[2].pattern + ')' for x in self.wild_matches]))
+
+
+    def __len__(self):
+        return len(self.full_matches) + len(self.wild_matches)
+
+
+    def lookup(self, ref_uri):
+        """ The replacement for ref_uri, or None """
+        if ref_uri in self.results:
+            return self.results[ref_uri]
+
+        best_priority = -1
+        replacement = None
+        for priority, key, replace_with in self.full_matches.get(ref_uri, []):
+            if priority > best_priority and key in ref_uri:
+                best_priority, replacement = priority, replace_with
+        if self.wild_filter is not None and self.wild_filter.search(ref_uri):
+            for priority, key, pattern, replace_with in self.wild_matches:
+                if priority > best_priority and key in ref_uri and pattern.search(ref_uri):
+                    best_priority, replacement = priority, replace_with
+
+        self.results[ref_uri] = replacement
+        return replacement
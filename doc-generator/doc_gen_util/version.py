@@ -0,0 +1,91 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: version.py
+
+Brief: Parsed, comparable schema version numbers.
+"""
+
+import functools
+import re
+
+VERSION_PART_PATTERN = re.compile(r'\d+')
+
+
+class Version:
+    """ A schema version, such as "1.2.0", "1_2_0", or "v1_2_0", compared numerically part by part.
+
+    Missing parts count as 0, so "1.2" == "1.2.0". Use Version.parse, which caches what it parses and
+    returns the same instance for the same string; the numeric parts are computed only once per string.
+    """
+
+    __slots__ = ('parts', 'key')
+
+    def __init__(self, parts):
+        self.parts = tuple(parts)
+        self.key = self.parts + (0, ) * (3 - len(self.parts))
+        # Trailing zeros beyond the third part don't distinguish versions either:
+        while len(self.key) > 3 and self.key[-1] == 0:
+            self.key = self.key[:-1]
+
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def parse(text):
+        """ The Version for text (a string, or a Version). None, the version of an unversioned file (see
+        DocGenUtilities.get_ref_version), is Version([]), which sorts before every version. """
+        if isinstance(text, Version):
+            return text
+        if text is None:
+            return Version([])
+        return Version([int(x) for x in VERSION_PART_PATTERN.findall(text)])
+
+
+    def __str__(self):
+        return '.'.join([str(x) for x in self.parts])
+
+
+    def __repr__(self):
+        return 'Version(' + repr(str(self)) + ')'
+
+
+    def __hash__(self):
+        return hash(self.key)
+
+
+    def __eq__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.key == other.key
+
+
+    def __ne__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.key != other.key
+
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+
+    def __le__(self, other):
+        return self.key <= other.key
+
+
+    def __gt__(self, other):
+        return self.key > other.key
+
+
+    def __ge__(self, other):
+        return self.key >= other.key
+
+
+    def __getstate__(self):
+        return self.parts
+
+
+    def __setstate__(self, parts):
+        Version.__init__(self, parts)
@@ -0,0 +1,63 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: version_index.py
+
+Brief: Index of the versioned files (profiles, registries) in a repository listing, for finding
+the latest version compatible with a minimum version.
+"""
+
+import bisect
+import re
+
+
+class VersionIndex:
+    """ The versioned .json files linked from a repository, by base name.
+
+    Each base name maps to a list of (version, link) sorted by version, where version is a tuple of ints
+    parsed from the file name: "Base.1.2.0.json" and "Base.v1_2_0.json" both have base name "Base" and
+    version (1, 2, 0). If a version is listed more than once, the first link wins.
+    """
+
+    def __init__(self, repo, links):
+        self.repo = repo
+        self.num_links = len(links)
+        self.versions = {}
+        for link in links:
+            if not (link.startswith(repo) and link.endswith('.json')):
+                continue
+            filename = re.split(r'[/\\]', link)[-1]
+            base_name, _, suffix = filename[:-5].partition('.')
+            version = tuple([int(x) for x in re.findall(r'(\d+)', suffix)])
+            if len(version) < 2:
+                continue
+            entries = self.versions.setdefault(base_name, [])
+            i = bisect.bisect_right(entries, (version, ))
+            if i < len(entries) and entries[i][0] == version:
+                continue
+            entries.insert(i, (version, link))
+
+
+    def find(self, base_name, min_version):
+        """ Return the link for the latest version of base_name that has the same major version as
+        min_version, and is no older than min_version; or None. Missing version parts count as 0. """
+        entries = self.versions.get(base_name)
+        min_parts = tuple([int(x) for x in re.findall(r'(\d+)', min_version)])
+        if not entries or not min_parts:
+            return None
+
+        # The last entry before the next major version:
+        i = bisect.bisect_left(entries, ((min_parts[0] + 1, ), )) - 1
+        if i < 0:
+            return None
+        version, link = entries[i]
+        if version[0] == min_parts[0] and self.pad(version, 3) >= self.pad(min_parts, 3):
+            return link
+        return None
+
+
+    @staticmethod
+    def pad(version, length):
+        return version + (0, ) * (length - len(version))
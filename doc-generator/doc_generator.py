@@ -16,11 +16,16 @@ Initial author: Second Rise LLC.
 import os
 import re
 import argparse
+import cProfile
+import concurrent.futures
 import json
+import marshal
+import pickle
 import copy
+import hashlib
 import functools
 import warnings
-from doc_gen_util import DocGenUtilities
+from doc_gen_util import DocGenUtilities, PrefixMap, Version, VersionIndex
 from schema_traverser import SchemaTraverser
 import parse_supplement
 
@@ -32,6 +37,30 @@ def simple_warning_format(message, category, filename, lineno, file=None, line=N
 
 warnings.formatwarning = simple_warning_format
 
+
+# State for worker processes when group processing is spread across a process pool (--jobs).
+# The DocGenerator goes to the workers pickled, with each batch of tasks (ProcessPoolExecutor has no
+# initializer before Python 3.7); each worker unpickles a given copy once.
+_worker_doc_generator = (None, None) # (pickled, DocGenerator)
+
+def _worker_generator(pickled_doc_generator):
+    """ The DocGenerator for a worker's tasks, unpickled (and set up) if we haven't seen this copy yet. """
+    global _worker_doc_generator
+    if _worker_doc_generator[0] != pickled_doc_generator:
+        doc_generator = pickle.loads(pickled_doc_generator)
+        if doc_generator.config.get('cache_dir'):
+            DocGenUtilities.schema_cache.set_cache_dir(doc_generator.config['cache_dir'])
+        DocGenUtilities.http_fetcher.set_mirror(DocGenerator.http_mirror_dir(doc_generator.config),
+                                                doc_generator.config.get('offline', False))
+        _worker_doc_generator = (pickled_doc_generator, doc_generator)
+    return _worker_doc_generator[1]
+
+def _process_groups_in_worker(pickled_doc_generator, groups):
+    """ Process pool task: process a batch of (normalized_uri, refs) groups of files. """
+    doc_generator = _worker_generator(pickled_doc_generator)
+    return [doc_generator.process_group(normalized_uri, refs) for normalized_uri, refs in groups]
+
+
 class DocGenerator:
     """Redfish Documentation Generator class. Provides 'generate_docs' method."""
 
@@ -41,6 +70,20 @@ class DocGenerator:
         self.outfile = outfile
         self.property_data = {} # This is an object property for ease of testing.
         self.schema_ref_to_filename = {}
+        self.group_results = None # normalized_uri: (file stats, results); set to a dict to reuse groups between builds
+        self.section_results = None # rendered sections; set to a dict to reuse them between builds
+        self.groups_reused = 0 # number of groups reused from group_results in the last build
+        self.version_indexes = {} # (repo, is_local_file): VersionIndex of the repo's versioned files
+
+        # Longest-prefix lookups for the path <-> URI mappings:
+        self.local_to_uri = PrefixMap(config.get('local_to_uri'))
+        self.uri_to_local = PrefixMap(config.get('uri_to_local'))
+        self.profile_uri_to_local = PrefixMap(config.get('profile_uri_to_local'))
+
+        if config.get('cache_dir'):
+            DocGenUtilities.schema_cache.set_cache_dir(config['cache_dir'])
+        DocGenUtilities.http_fetcher.set_mirror(self.http_mirror_dir(config), config.get('offline', False))
+        DocGenUtilities.timings.enabled = bool(config.get('timings'))
 
         if config.get('profile_mode'):
             config['profile'] = DocGenUtilities.load_as_json(config.get('profile_doc'))
@@ -53,6 +96,9 @@ class DocGenerator:
                         config['profile']['RequiredProfiles'][req_profile_name])
 
             if 'Registries' in config['profile']:
+                # Retrieve the registry repository indexes concurrently, up front:
+                DocGenUtilities.http_fetcher.prefetch([x.get('Repository') for x in config['profile']['Registries'].values()
+                                                       if x.get('Repository')])
                 config['profile']['registries_annotated'] = {}
                 for registry_name in config['profile']['Registries'].keys():
                     registry_summary = self.process_registry(registry_name,
@@ -77,9 +123,73 @@ class DocGenerator:
             self.config['profile_resources'] = profile_resources_indexed
 
 
+    def __getstate__(self):
+        """ Support pickling for worker processes (see --jobs). The output file and formatter stay behind. """
+        state = self.__dict__.copy()
+        state['outfile'] = None
+        state['property_data'] = {}
+        state.pop('generator', None)
+        return state
+
+
     def generate_doc(self):
-        output = self.generate_docs()
-        self.write_output(output, self.outfile)
+        with DocGenUtilities.timings.phase('total'):
+            self.generate_docs(outfile=self.outfile)
+            self.write_output('', self.outfile)
+        if self.config.get('stats'):
+            self.print_stats()
+        if self.config.get('timings'):
+            self.write_timings_report(self.config['timings'])
+
+
+    def cache_stats(self):
+        """ Activity of the caches used by the last generate_docs, as a dict of dicts.
+
+        Counts cover this process only; work done by --jobs worker processes is not included. """
+        stats = {'schema_cache': DocGenUtilities.schema_cache.stats(),
+                 'http_fetcher': DocGenUtilities.http_fetcher.stats()}
+        generator = getattr(self, 'generator', None)
+        if generator:
+            stats['ref_cache'] = generator.traverser.ref_cache_stats()
+            if hasattr(generator, 'memo_stats'):
+                stats['extend_property_info'] = generator.memo_stats()
+            if hasattr(generator.formatter, 'markdown_cache_stats'):
+                stats['markdown_to_html'] = generator.formatter.markdown_cache_stats()
+        return stats
+
+
+    def print_stats(self):
+        """ Print a summary of cache_stats, with hit ratios """
+        print('Cache statistics:')
+        for name, stats in sorted(self.cache_stats().items()):
+            hits = stats.get('hits', 0)
+            lookups = hits + stats.get('misses', stats.get('requests', 0))
+            summary = ', '.join([x + ' ' + str(y) for x, y in stats.items()])
+            if lookups:
+                summary += ', hit ratio %.1f%%' % (100.0 * hits / lookups)
+            print('  ' + name + ': ' + summary)
+
+
+    def timings_report(self):
+        """ Phase timings and counters (see doc_gen_util.Timings), with cache_stats, as a dict.
+
+        Like cache_stats, this covers this process only. """
+        report = DocGenUtilities.timings.report()
+        report['caches'] = self.cache_stats()
+        return report
+
+
+    def write_timings_report(self, filename):
+        """ Write timings_report as JSON to filename, or print it if filename is "-" """
+        report = json.dumps(self.timings_report(), indent=2, sort_keys=True)
+        if filename == '-':
+            print(report)
+            return
+        try:
+            with open(filename, 'w', encoding="utf8") as report_file:
+                report_file.write(report + '\n')
+        except (OSError) as ex:
+            warnings.warn('Unable to open ' + filename + ' to write: ' + str(ex))
 
 
     def process_registry(self, reg_name, registry_profile):
@@ -129,51 +239,22 @@ class DocGenerator:
         may succeed if the repo does not provide a directory index.)
 
         Versions must match on the major version, with minor.errata equal to or greater than
-        what is specified in min_version.
+        what is specified in min_version. Each repo is listed and indexed once per DocGenerator.
         """
 
         versioned_uri = None
 
-        if is_local_file:
-            repo_links = DocGenUtilities.local_get_links(repo)
-        else:
-            repo_links = DocGenUtilities.html_get_links(repo)
-
-        if repo_links:
-            minversion_parts = re.findall(r'(\d+)', min_version)
-
-            candidate = None
-            candidate_strength = 0
-            for rl in repo_links:
-                base = base_name + '.'
-                if rl.startswith(repo) and base in rl and rl.endswith('.json'):
-                    parts = rl[0:-5].rsplit(base, 1)
-                    if len(parts) == 2:
-                        suffix = parts[1]
-                        version_parts = re.findall(r'(\d+)', suffix)
-                        # Major version must match; minor.errata must be >=.
-                        if version_parts[0] != minversion_parts[0]:
-                            continue
-                        if version_parts[1] > minversion_parts[1]:
-                            strength = self.version_index(version_parts)
-                            if strength > candidate_strength:
-                                candidate_strength = strength
-                                candidate = rl
-                            continue
-                        if version_parts[1] == minversion_parts[1]:
-                            if len(version_parts) == 3 and len(minversion_parts) == 3:
-                                if version_parts[2] >= minversion_parts[2]:
-                                    strength = self.version_index(version_parts)
-                                    if strength > candidate_strength:
-                                        candidate_strength = strength
-                                        candidate = rl
-                            elif len(version_parts) == 2:
-                                strength = self.version_index(version_parts)
-                                if strength > candidate_strength:
-                                    candidate_strength = strength
-                                    candidate = rl
-            if candidate:
-                versioned_uri = candidate
+        version_index = self.version_indexes.get((repo, is_local_file))
+        if version_index is None:
+            if is_local_file:
+                repo_links = DocGenUtilities.local_get_links(repo)
+            else:
+                repo_links = DocGenUtilities.html_get_links(repo)
+            version_index = VersionIndex(repo, repo_links)
+            self.version_indexes[(repo, is_local_file)] = version_index
+
+        if version_index.num_links:
+            versioned_uri = version_index.find(base_name, min_version)
 
         elif is_local_file:
             # Build URI from repo, name, and minversion:
@@ -198,16 +279,14 @@ class DocGenerator:
             protocol, base_uri = base_uri.split('://')
 
         is_local_file = False
-        for partial_uri in self.config['profile_uri_to_local'].keys():
-            if base_uri.startswith(partial_uri):
-                local_path = self.config['profile_uri_to_local'][partial_uri]
-                if partial_uri.endswith(req_profile_name):
-                    req_profile_repo = local_path[0:-len(req_profile_name)]
-                    pass
-                else:
-                    req_profile_repo = local_path
-                is_local_file = True
-                break
+        match = self.profile_uri_to_local.longest_match(base_uri)
+        if match:
+            partial_uri, local_path = match
+            if partial_uri.endswith(req_profile_name):
+                req_profile_repo = local_path[0:-len(req_profile_name)]
+            else:
+                req_profile_repo = local_path
+            is_local_file = True
 
         req_profile_uri = self.get_versioned_uri(req_profile_name, req_profile_repo,
                                                  version_string, is_local_file)
@@ -284,21 +363,73 @@ class DocGenerator:
         return files_to_process
 
 
-    def generate_docs(self, level=0):
+    def generate_docs(self, level=0, outfile=None):
         """Given a list of files, generate a block of documentation.
 
-        This is the main loop of the product.
+        This is the main loop of the product. If outfile is given, the documentation is written to it
+        as it is generated (rather than being built up in memory) and None is returned.
+        """
+        property_data, schema_data, doc_generator_meta = self.process_schemas()
+        return self.render(self.config, property_data, schema_data, doc_generator_meta, level, outfile)
+
+
+    def generate_targets(self, targets, level=0):
+        """Generate several documents from one pass over the schemas. Each output file is finished (closed).
+
+        targets is a list of (config, outfile), each config as build_config would make it for a separate
+        run, and each with the same parse_config_key as self.config. Every formatter gets its own copy of
+        the processed schemas and its own traverser, so what one formatter changes as it goes (prop_info
+        annotations such as prop_required, for example) can't leak into another's output.
         """
-        files_to_process = self.get_files(self.import_from)
-        grouped_files, schema_data = self.group_files(files_to_process)
+        timings = DocGenUtilities.timings
+        with timings.phase('total'):
+            parsed = self.process_schemas()
+            for i, (config, outfile) in enumerate(targets):
+                for key in self.profile_config_keys:
+                    if key in self.config:
+                        config[key] = copy.deepcopy(self.config[key])
+                # The last target can have the originals.
+                with timings.phase('copy_processed_schemas'):
+                    target_parsed = parsed if i == len(targets) - 1 else copy.deepcopy(parsed)
+                self.render(config, *target_parsed, level=level, outfile=outfile)
+                self.write_output('', outfile)
+        if self.config.get('stats'):
+            self.print_stats()
+        if self.config.get('timings'):
+            self.write_timings_report(self.config['timings'])
+
+
+    # Config keys that affect process_schemas; targets sharing a parse must agree on these.
+    parse_config_keys = ['local_to_uri', 'uri_to_local', 'profile_local_to_uri', 'profile_uri_to_local',
+                         'profile_mode', 'profile_doc', 'enum_deprecations', 'cache_dir', 'offline', 'jobs']
+
+    # Config keys that DocGenerator.__init__ fills in, in profile mode.
+    profile_config_keys = ['profile', 'profile_resources']
+
+    @staticmethod
+    def parse_config_key(config):
+        """ Key identifying the parse that config calls for. Targets with equal keys can share a parse. """
+        return json.dumps({x: config.get(x) for x in DocGenerator.parse_config_keys}, sort_keys=True, default=str)
+
+
+    def process_schemas(self):
+        """ Find, group, and process the input files: the part of generate_docs that doesn't depend on the
+        output format. Returns (property_data, schema_data, doc_generator_meta). property_data is also
+        kept in self.property_data. """
+        timings = DocGenUtilities.timings
+        with timings.phase('discover_files'):
+            files_to_process = self.get_files(self.import_from)
+        with timings.phase('group_files'):
+            grouped_files, schema_data = self.group_files(files_to_process)
+        with timings.phase('prefetch_remote_refs'):
+            self.prefetch_remote_refs(schema_data)
 
         self.property_data = {}
         collection_data = {}
         doc_generator_meta = {}
 
         # First expand the grouped files -- these are the schemas that get first-class documentation sections
-        for normalized_uri in grouped_files.keys():
-            data = self.process_files(normalized_uri, grouped_files[normalized_uri])
+        for normalized_uri, (data, latest_data) in self.process_groups(grouped_files):
             if not data:
                 # If we're in profile mode, this is probably normal.
                 if not self.config['profile_mode']:
@@ -313,40 +444,109 @@ class DocGenerator:
             self.property_data[normalized_uri] = data
 
             doc_generator_meta[normalized_uri] = self.property_data[normalized_uri]['doc_generator_meta']
-            latest_info = grouped_files[normalized_uri][-1]
-            latest_file = os.path.join(latest_info['root'], latest_info['filename'])
-            latest_data = DocGenUtilities.load_as_json(latest_file)
-            latest_data['_is_versioned_schema'] = latest_info.get('_is_versioned_schema')
-            latest_data['_is_collection_of'] = latest_info.get('_is_collection_of')
-            latest_data['_schema_name'] = latest_info.get('schema_name')
-
-            # If we have data in the unversioned file, we need to overlay that.
-            # We did this the same way for property_data. (Simplify?)
-            latest_data = self.apply_unversioned_data_file(normalized_uri, latest_data)
             schema_data[normalized_uri] = latest_data
 
         # Also process and version definitions in any "other" files. These are files without top-level $ref objects.
-        schema_data = self.process_unversioned_files(schema_data, doc_generator_meta, self.config['uri_to_local'])
+        with timings.phase('process_unversioned_files'):
+            schema_data = self.process_unversioned_files(schema_data, doc_generator_meta, self.config['uri_to_local'])
+
+        return self.property_data, schema_data, doc_generator_meta
 
-        traverser = SchemaTraverser(schema_data, doc_generator_meta, self.config['uri_to_local'])
+
+    def render(self, config, property_data, schema_data, doc_generator_meta, level=0, outfile=None):
+        """ Generate the documentation that config calls for from processed schemas (see process_schemas).
+        Returns the documentation, or None if it was written to outfile. """
+        traverser = SchemaTraverser(schema_data, doc_generator_meta, config['uri_to_local'])
 
         # Generate output
-        if self.config.get('output_content') == 'property_index':
+        if config.get('output_content') == 'property_index':
             from doc_formatter import PropertyIndexGenerator
-            self.generator = PropertyIndexGenerator(self.property_data, traverser, self.config, level)
-            return self.generator.generate_output()
+            self.generator = PropertyIndexGenerator(property_data, traverser, config, level)
+            return self.generator.generate_output(outfile)
 
-        if self.config['output_format'] == 'markdown':
+        if config['output_format'] == 'markdown':
             from doc_formatter import MarkdownGenerator
-            self.generator = MarkdownGenerator(self.property_data, traverser, self.config, level)
-        elif self.config['output_format'] == 'html':
+            self.generator = MarkdownGenerator(property_data, traverser, config, level)
+        elif config['output_format'] == 'html':
             from doc_formatter import HtmlGenerator
-            self.generator = HtmlGenerator(self.property_data, traverser, self.config, level)
-        elif self.config['output_format'] == 'csv':
+            self.generator = HtmlGenerator(property_data, traverser, config, level)
+        elif config['output_format'] == 'csv':
             from doc_formatter import CsvGenerator
-            self.generator = CsvGenerator(self.property_data, traverser, self.config, level)
+            self.generator = CsvGenerator(property_data, traverser, config, level)
+
+        if config.get('incremental') or self.section_results is not None:
+            self.generator.section_cache = self.make_section_cache(self.generator)
+
+        with DocGenUtilities.timings.phase('render', config.get('output_format')):
+            return self.generator.generate_output(outfile)
+
+
+    def make_section_cache(self, generator):
+        """ Set up a SectionCache for an incremental build, keyed on everything but the schema files themselves.
+        Returns None (with a warning) if there's nowhere to keep it. """
+        from doc_formatter import SectionCache
+
+        schema_cache = DocGenUtilities.schema_cache
+        if not schema_cache.cache_dir and self.section_results is None:
+            warnings.warn('Incremental builds require a cache directory (--cache-dir). Rebuilding everything.')
+            return None
+
+        runtime_keys = ['jobs', 'cache_dir', 'incremental', 'offline', 'stats', 'timings']
+        config = {x: y for x, y in generator.config.items() if x not in runtime_keys}
+        config_json = json.dumps(config, sort_keys=True, default=lambda x: sorted(x) if isinstance(x, set) else str(x))
+        build_key = (generator.__class__.__name__,
+                     hashlib.sha256(config_json.encode('utf-8')).hexdigest(),
+                     tuple(sorted(generator.documented_schemas)))
+        family_fingerprints = SectionCache.family_fingerprints(schema_cache, self.schema_ref_to_filename.items())
+        return SectionCache(schema_cache, family_fingerprints, build_key, self.section_results)
+
 
-        return self.generator.generate_output()
+    @staticmethod
+    def http_mirror_dir(config):
+        """ Where remote content is saved for revalidation and offline runs: "http" in the cache dir, if any. """
+        if config.get('cache_dir'):
+            return os.path.join(config['cache_dir'], 'http')
+        return None
+
+
+    def prefetch_remote_refs(self, schema_data):
+        """ Retrieve, concurrently, any schemas referenced by schema_data that we'll need to fetch over HTTP:
+        those that aren't in schema_data and aren't mapped to local files.
+
+        Refs naming one of the input files are skipped too, even where no URI mapping connects the two
+        (group_files matches versioned refs to input files by name). If such a ref does turn out to be
+        needed remotely, it's fetched when it's used, as it would be without prefetching. """
+        refs = set()
+        nodes = list(schema_data.values())
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, dict):
+                ref = node.get('$ref')
+                if isinstance(ref, str) and '://' in ref:
+                    refs.add(ref.split('#')[0])
+                nodes.extend(node.values())
+            elif isinstance(node, list):
+                nodes.extend(node)
+
+        input_filenames = set([os.path.basename(x) for x in self.schema_ref_to_filename.values()])
+        uris = []
+        for uri in refs:
+            normalized_uri = self.normalize_ref(uri)
+            # http_load_as_json skips the (nonexistent) unversioned odata schema:
+            if normalized_uri in schema_data or normalized_uri in self.schema_ref_to_filename or 'odata.json' in uri:
+                continue
+            if normalized_uri.rpartition('/')[2] in input_filenames:
+                continue
+            is_local = False
+            for partial_uri, local_path in self.uri_to_local.matches(normalized_uri):
+                if os.path.isfile(local_path + normalized_uri[len(partial_uri):]):
+                    is_local = True
+                    break
+            if not is_local:
+                uris.append(uri)
+
+        if uris:
+            DocGenUtilities.http_fetcher.prefetch(sorted(uris))
 
 
     def group_files(self, files):
@@ -359,10 +559,30 @@ class DocGenerator:
         """
 
         file_list = [os.path.abspath(filename) for filename in files]
+        self.schema_ref_to_filename = {}
+
+        # With a persistent cache, we may be able to reuse the groupings from a previous run:
+        schema_cache = DocGenUtilities.schema_cache
+        cache_key = None
+        if schema_cache.cache_dir:
+            cache_key = self.group_files_cache_key(file_list)
+            cached = schema_cache.get_result('group_files', cache_key)
+            if cached:
+                return self.restore_grouped_files(cached)
+
         grouped_files = {}
         all_schemas = {}
-        missing_files = []
-        processed_files = []
+        schema_files = [] # (normalized_uri, filename, schema_name) for everything in all_schemas
+        missing_files = [] # in order found, for reporting
+        missing_file_set = set()
+        processed_files = set()
+
+        # Index the files (and their versions) by directory and filename, so that each $ref
+        # to a file resolves with one lookup:
+        files_by_location = {}
+        for filename in file_list:
+            root, _, fname = filename.rpartition(os.sep)
+            files_by_location[(root, fname)] = (filename, DocGenUtilities.get_ref_version(fname))
 
         for filename in file_list:
             # Get the (probably versioned) filename, and save the data:
@@ -378,6 +598,7 @@ class DocGenerator:
 
             data['_schema_name'] = schema_name
             all_schemas[normalized_uri] = data
+            schema_files.append((normalized_uri, filename, schema_name))
 
             if filename in processed_files: continue
 
@@ -413,9 +634,9 @@ class DocGenerator:
                             continue
                         ref_fn = refpath_uri.split('/')[-1]
                         # Skip files that are not present.
-                        ref_filename = os.path.abspath(os.path.join(root, ref_fn))
-                        if ref_filename in file_list:
-                            version_string = DocGenUtilities.get_ref_version(ref_fn)
+                        located = files_by_location.get((root, ref_fn))
+                        if located:
+                            ref_filename, version_string = located
                             file_data = {'root': root,
                                          'filename': ref_fn,
                                          'ref': refpath_path,
@@ -425,8 +646,11 @@ class DocGenerator:
                                 ref_files_by_version[version_string] = [ file_data ]
                             else:
                                 ref_files_by_version[version_string].append(file_data) # Unexpected, but roll with it.
-                        elif ref_filename not in missing_files:
-                            missing_files.append(ref_filename)
+                        else:
+                            ref_filename = os.path.abspath(os.path.join(root, ref_fn))
+                            if ref_filename not in missing_file_set:
+                                missing_file_set.add(ref_filename)
+                                missing_files.append(ref_filename)
 
                     else:
                         # If there is anything that's not a ref, this isn't an unversioned schema.
@@ -442,7 +666,7 @@ class DocGenerator:
                         continue
 
                 # Sort the ref_files by version.
-                version_keys = sorted(ref_files_by_version.keys(), key=functools.cmp_to_key(DocGenUtilities.compare_versions))
+                version_keys = sorted(ref_files_by_version.keys(), key=Version.parse)
                 for vk in version_keys:
                     for file_data in ref_files_by_version[vk]:
                         ref_files.append(file_data)
@@ -454,14 +678,16 @@ class DocGenerator:
 
                 ref_fn = refpath_uri.split('/')[-1]
                 # Skip files that are not present.
-                ref_filename = os.path.abspath(os.path.join(root, ref_fn))
-                if ref_filename in file_list:
+                if (root, ref_fn) in files_by_location:
                     ref_files.append({'root': root,
                                       'filename': ref_fn,
                                       'ref': refpath_path,
                                       'schema_name': schema_name})
-                elif ref_filename not in missing_files:
-                    missing_files.append(ref_filename)
+                else:
+                    ref_filename = os.path.abspath(os.path.join(root, ref_fn))
+                    if ref_filename not in missing_file_set:
+                        missing_file_set.add(ref_filename)
+                        missing_files.append(ref_filename)
 
             else:
                 ref = original_ref
@@ -487,11 +713,51 @@ class DocGenerator:
                                                   '_is_collection_of': is_collection_of}]
 
             # Note these files as processed:
-            processed_files.append(filename)
+            processed_files.add(filename)
             for file_refs in grouped_files[normalized_uri]:
                 ref_filename = os.path.join(file_refs['root'], file_refs['filename'])
-                processed_files.append(ref_filename)
+                processed_files.add(ref_filename)
 
+        if cache_key:
+            schemas = [(uri, filename, schema_name, all_schemas[uri].get('_uris'))
+                       for (uri, filename, schema_name) in schema_files]
+            schema_cache.put_result('group_files', cache_key, {'grouped_files': grouped_files,
+                                                               'schemas': schemas,
+                                                               'missing_files': missing_files})
+
+        self.warn_missing_files(missing_files)
+
+        return grouped_files, all_schemas
+
+
+    def group_files_cache_key(self, file_list):
+        """ Key for persisted group_files results: the files, their content, and the URI mapping. """
+        fingerprints = [DocGenUtilities.schema_cache.fingerprint(x) for x in file_list]
+        local_to_uri = sorted(self.config.get('local_to_uri', {}).items())
+        return (file_list, fingerprints, local_to_uri)
+
+
+    def restore_grouped_files(self, cached):
+        """ Rebuild group_files output from a persisted result.
+
+        Schema data comes from the schema cache; we reapply the annotations group_files adds. """
+        all_schemas = {}
+        for normalized_uri, filename, schema_name, uris in cached['schemas']:
+            self.schema_ref_to_filename[normalized_uri] = filename
+            data = DocGenUtilities.load_as_json(filename)
+            data['_schema_name'] = schema_name
+            if uris is not None:
+                data['_uris'] = uris
+            all_schemas[normalized_uri] = data
+
+        self.warn_missing_files(cached['missing_files'])
+
+        return cached['grouped_files'], all_schemas
+
+
+    @staticmethod
+    def warn_missing_files(missing_files):
+        """ Warn about files that were referenced but not found. """
         if len(missing_files):
             numfiles = len(missing_files)
             if numfiles <= 10:
@@ -500,7 +766,104 @@ class DocGenerator:
                 missing_files_list = '\n   '.join(missing_files[0:9]) + "\n   and " + str(numfiles - 10) + " more."
             warnings.warn(str(numfiles) + " referenced files were missing: \n   " + missing_files_list)
 
-        return grouped_files, all_schemas
+
+    def process_groups(self, grouped_files):
+        """ Process each group of files (see process_group), yielding (normalized_uri, results) in grouped_files order.
+
+        Groups are independent of one another, so if config['jobs'] is more than 1 they are
+        spread across a pool of worker processes. Results are yielded in the same order either way,
+        so output does not depend on the number of jobs.
+        """
+        normalized_uris = list(grouped_files.keys())
+        self.groups_reused = 0
+        if self.group_results is None:
+            yield from self.process_group_list(normalized_uris, grouped_files)
+            return
+
+        # Reuse results from a previous build for groups whose files are unchanged. Callers modify
+        # the results, so we hold them in marshal form and hand out copies.
+        group_results = {}
+        reused = {}
+        for normalized_uri in normalized_uris:
+            file_stats = self.group_file_stats(normalized_uri, grouped_files[normalized_uri])
+            previous = self.group_results.get(normalized_uri)
+            if previous and previous[0] == file_stats:
+                reused[normalized_uri] = marshal.loads(previous[1])
+                group_results[normalized_uri] = previous
+            else:
+                group_results[normalized_uri] = (file_stats, None)
+
+        pending = self.process_group_list([x for x in normalized_uris if x not in reused], grouped_files)
+        for normalized_uri in normalized_uris:
+            if normalized_uri in reused:
+                yield normalized_uri, reused[normalized_uri]
+            else:
+                _, result = next(pending)
+                group_results[normalized_uri] = (group_results[normalized_uri][0], marshal.dumps(result))
+                yield normalized_uri, result
+
+        self.group_results.clear()
+        self.group_results.update(group_results)
+        self.groups_reused = len(reused)
+
+
+    def process_group_list(self, normalized_uris, grouped_files):
+        """ Process the groups for normalized_uris, yielding (normalized_uri, results) in order. """
+        jobs = self.config.get('jobs') or 1
+        if jobs <= 1 or len(normalized_uris) < 2:
+            for normalized_uri in normalized_uris:
+                yield normalized_uri, self.process_group(normalized_uri, grouped_files[normalized_uri])
+            return
+
+        groups = [(x, grouped_files[x]) for x in normalized_uris]
+        chunksize = max(1, len(groups) // (jobs * 4))
+        batches = [groups[i:i + chunksize] for i in range(0, len(groups), chunksize)]
+        pickled_self = pickle.dumps(self)
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = executor.map(_process_groups_in_worker, [pickled_self] * len(batches), batches)
+            for batch, batch_results in zip(batches, results):
+                for (normalized_uri, _), result in zip(batch, batch_results):
+                    yield normalized_uri, result
+
+
+    def group_file_stats(self, normalized_uri, refs):
+        """ (filename, mtime, size) for each file a group's results are built from. """
+        filenames = [os.path.join(x['root'], x['filename']) for x in refs]
+        if normalized_uri in self.schema_ref_to_filename:
+            filenames.append(self.schema_ref_to_filename[normalized_uri])
+        file_stats = []
+        for filename in filenames:
+            try:
+                stat = os.stat(filename)
+                file_stats.append((filename, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                file_stats.append((filename, None, None))
+        return tuple(file_stats)
+
+
+    def process_group(self, normalized_uri, refs):
+        """ Process the files for one schema group.
+
+        Returns a tuple of (property data, as from process_files, and the data for the latest version of
+        the schema, overlaid with its unversioned data). Both are empty if the group has nothing to document.
+        """
+        with DocGenUtilities.timings.phase('process_files', normalized_uri):
+            data = self.process_files(normalized_uri, refs)
+        if not data:
+            return data, None
+
+        latest_info = refs[-1]
+        latest_file = os.path.join(latest_info['root'], latest_info['filename'])
+        latest_data = DocGenUtilities.load_as_json(latest_file)
+        latest_data['_is_versioned_schema'] = latest_info.get('_is_versioned_schema')
+        latest_data['_is_collection_of'] = latest_info.get('_is_collection_of')
+        latest_data['_schema_name'] = latest_info.get('schema_name')
+
+        # If we have data in the unversioned file, we need to overlay that.
+        # We did this the same way for property_data. (Simplify?)
+        latest_data = self.apply_unversioned_data_file(normalized_uri, latest_data)
+
+        return data, latest_data
 
 
     def process_files(self, schema_ref, refs):
@@ -740,7 +1103,7 @@ class DocGenerator:
 
         # Walk refs_by_version, extending prop_info
         ref_keys = [x for x in refs_by_version.keys()]
-        ref_keys.sort(key=functools.cmp_to_key(DocGenUtilities.compare_versions))
+        ref_keys.sort(key=Version.parse)
 
         if not len(ref_keys):
             return prop_info # No changes to make
@@ -910,6 +1273,7 @@ class DocGenerator:
 
 
     @staticmethod
+    @functools.lru_cache(maxsize=4096)
     def get_version_string(filename):
         """Parse the version string from a filename. Returned format is, e.g., v1.0.1"""
 
@@ -923,9 +1287,10 @@ class DocGenerator:
 
     @staticmethod
     def write_output(markdown, outfile):
-        """Write output to a file."""
+        """Write output to a file (finishing what generate_docs may have written there already)."""
 
         print(markdown, file=outfile)
+        DocGenUtilities.timings.count('bytes_written', len(markdown.encode('utf-8')) + 1)
         outfile.close()
         print(outfile.name, "written.")
 
@@ -933,12 +1298,11 @@ class DocGenerator:
     def construct_uri_for_filename(self, fname):
         """Use the schema URI mapping to construct a URI for this file"""
 
-        local_to_uri = self.config.get('local_to_uri')
-        if local_to_uri:
-            for local_path in local_to_uri.keys():
-                if fname.startswith(local_path):
-                    fname = fname.replace(local_path, local_to_uri[local_path])
-                    return fname.replace(os.sep, '/')
+        match = self.local_to_uri.longest_match(fname)
+        if match:
+            local_path, uri = match
+            fname = uri + fname[len(local_path):]
+            return fname.replace(os.sep, '/')
 
         return fname
 
@@ -956,20 +1320,12 @@ class DocGenerator:
         return ref
 
 
-    @staticmethod
-    def version_index(parts):
-        """ Create a numeric index representing the "size" of a multipart version """
-
-        idx = 0
-        multiplier = 100
-        for part in parts:
-            idx = idx + (multiplier * int(part))
-            multiplier = multiplier/10
-        return idx
-
+def build_config(args):
+    """Build the configuration for a run from parsed command-line arguments.
 
-def main():
-    """Parse and validate arguments, then process data and produce markdown output."""
+    Returns a tuple of (config, import_from, outfile_name, input_files), where input_files lists the
+    supplement, profile, and config files that were read.
+    """
 
     config = {
         'supplemental': {},
@@ -993,50 +1349,8 @@ def main():
         'profile': {}
         }
 
-    help_description = 'Generate documentation for Redfish JSON schema files.\n\n'
-    help_epilog = ('Example:\n   doc_generator.py --format=html\n   doc_generator.py'
-                   ' --format=html'
-                   ' --out=/path/to/output/index.html /path/to/spmf/json-files')
-    parser = argparse.ArgumentParser(description=help_description,
-                                     epilog=help_epilog,
-                                     formatter_class=argparse.RawDescriptionHelpFormatter)
-    parser.add_argument('import_from', metavar='import_from', nargs='*',
-                        help=('Name of a file or directory to process (wild cards are acceptable). '
-                              'Default: json-schema'))
-    parser.add_argument('-n', '--normative', action='store_true', dest='normative', default=False,
-                        help='Produce normative (developer-focused) output')
-    parser.add_argument('--format', dest='format', default='markdown',
-                        choices=['markdown', 'html', 'csv'], help='Output format')
-    parser.add_argument('--property_index', action='store_true', dest='property_index', default=False,
-                        help='Produce Property Index output.')
-    parser.add_argument('--property_index_config_out', dest='property_index_config_out',
-                        metavar='CONFIG_FILE_OUT',
-                        default=False, help='Generate updated config file, with specified filename (property_index mode only).')
-    parser.add_argument('--out', dest='outfile', default='output.md',
-                        help=('Output file (default depends on output format: '
-                              'output.md for Markdown, index.html for HTML, output.csv for CSV'))
-    parser.add_argument('--sup', dest='supfile',
-                        help=('Path to the supplemental material document. '
-                              'Default is usersupplement.md for user-focused documentation, '
-                              'and devsupplement.md for normative documentation.'))
-    parser.add_argument('--config', dest="config_file",
-                        help=('Path to a config file, containing configuration '
-                              ' in JSON format. '
-                              'Used in property_index mode only.'))
-    parser.add_argument('--profile', dest='profile_doc',
-                        help=('Path to a JSON profile document, for profile output.'))
-    parser.add_argument('-t', '--terse', action='store_true', dest='profile_terse',
-                        help=('Terse output (meaningful only with --profile). By default, '
-                              'profile output is verbose and includes all properties regardless of '
-                              'profile requirements. "Terse" output is intended for use by '
-                              'Service developers, including only the subset of properties with '
-                              'profile requirements.'))
-    parser.add_argument('--escape', dest='escape_chars',
-                        help=("Characters to escape (\\) in generated Markdown. "
-                              "For example, --escape=@#. Use --escape=@ if strings with embedded @ "
-                              "are being converted to mailto links."))
+    input_files = []
 
-    args = parser.parse_args()
 
     config['output_format'] = args.format
     if args.property_index:
@@ -1051,7 +1365,7 @@ def main():
     else:
         import_from = [ os.path.join(config.get('cwd'), 'json-schema') ]
 
-    # Determine outfile and verify that it is writeable:
+    # Determine outfile:
     outfile_name = args.outfile
     if outfile_name == 'output.md':
         if config['output_format'] == 'html':
@@ -1067,17 +1381,13 @@ def main():
             if config['output_format'] == 'markdown':
                 outfile_name += '.md'
 
-    try:
-        outfile = open(outfile_name, 'w', encoding="utf8")
-    except (OSError) as ex:
-        warnings.warn('Unable to open ' + outfile_name + ' to write: ' + str(ex))
-
 
     # If property_index mode was specified, get config from args.config_file:
     if config['output_content'] == 'property_index':
         args.supfile = False
         if args.config_file:
             config_file= open(args.config_file, 'r', encoding="utf8")
+            input_files.append(args.config_file)
             config_data = json.load(config_file)
             config['property_index_config'] = config_data # We will amend this on output, if requested
             # Populate the URI mappings
@@ -1106,6 +1416,7 @@ def main():
         try:
             supfile = open(supfile, 'r', encoding="utf8")
             config['supplemental'] = parse_supplement.parse_file(supfile)
+            input_files.append(supfile.name)
         except (OSError) as ex:
             if supfile_expected:
                 warnings.warn('Unable to open ' + supfile + ' to read: ' +  str(ex))
@@ -1124,6 +1435,7 @@ def main():
         try:
             profile = open(profile_doc, 'r', encoding="utf8")
             config['profile_doc'] = profile_doc
+            input_files.append(profile_doc)
         except (OSError) as ex:
             warnings.warn('Unable to open ' + profile_doc + ' to read: ' +  str(ex))
             exit()
@@ -1186,9 +1498,211 @@ def main():
 
     config['normative'] = args.normative
 
+    config['jobs'] = args.jobs
+
+    if args.cache_dir:
+        config['cache_dir'] = args.cache_dir
+
+    config['incremental'] = args.incremental
+
+    config['offline'] = args.offline
+
+    config['stats'] = args.stats
+
+    # The report's destination: a file, or "-" to print it.
+    config['timings'] = args.timings_out or ('-' if args.timings else None)
+
     if args.escape_chars:
         config['escape_chars'] = [x for x in args.escape_chars]
 
+    return config, import_from, outfile_name, input_files
+
+
+def output_formats(text):
+    """ Parse the --format argument: one output format, or several separated by commas. """
+    formats = [x.strip() for x in text.split(',') if x.strip()]
+    for output_format in formats:
+        if output_format not in ['markdown', 'html', 'csv']:
+            raise argparse.ArgumentTypeError("invalid choice: '" + output_format +
+                                             "' (choose from 'markdown', 'html', 'csv')")
+    if not formats:
+        raise argparse.ArgumentTypeError('no output format given')
+    return formats
+
+
+def build_target_configs(args):
+    """Build the configuration for each document in a run that writes several (with several output formats,
+    or --add_property_index).
+
+    Each format gets the full documentation, and --add_property_index adds the property index in the
+    first format listed. Each config is built just as it would be for a separate run with that format, and
+    each document gets its default file name, in the --out directory if one was given.
+    Returns a list of (config, import_from, outfile_name, input_files), as from build_config.
+    """
+    out_dir = '' if args.outfile == 'output.md' else args.outfile
+    target_args = []
+    for output_format in args.format:
+        target_args.append(argparse.Namespace(**dict(vars(args), format=output_format, property_index=False)))
+    if args.add_property_index:
+        target_args.append(argparse.Namespace(**dict(vars(args), format=args.format[0], property_index=True)))
+
+    targets = []
+    for target in target_args:
+        target.outfile = 'output.md'
+        config, import_from, outfile_name, input_files = build_config(target)
+        targets.append((config, import_from, os.path.join(out_dir, outfile_name), input_files))
+    return targets
+
+
+def generate_target_docs(targets):
+    """ Generate the documents for build_target_configs' targets, processing the schemas once for each
+    group of targets that can share a parse (see DocGenerator.parse_config_key). """
+    groups = {}
+    for config, import_from, outfile_name, _ in targets:
+        key = (tuple(import_from), DocGenerator.parse_config_key(config))
+        groups.setdefault(key, []).append((config, import_from, outfile_name))
+
+    for group in groups.values():
+        outputs = []
+        for config, import_from, outfile_name in group:
+            # Verify that outfile is writeable:
+            try:
+                outputs.append((config, open(outfile_name, 'w', encoding="utf8")))
+            except (OSError) as ex:
+                warnings.warn('Unable to open ' + outfile_name + ' to write: ' + str(ex))
+        if outputs:
+            doc_generator = DocGenerator(group[0][1], None, outputs[0][0])
+            doc_generator.generate_targets(outputs)
+
+
+def make_arg_parser():
+    """ The command-line argument parser """
+
+    help_description = 'Generate documentation for Redfish JSON schema files.\n\n'
+    help_epilog = ('Example:\n   doc_generator.py --format=html\n   doc_generator.py'
+                   ' --format=html'
+                   ' --out=/path/to/output/index.html /path/to/spmf/json-files\n   doc_generator.py'
+                   ' --format=markdown,html,csv --add_property_index'
+                   ' --out=/path/to/output /path/to/spmf/json-files')
+    parser = argparse.ArgumentParser(description=help_description,
+                                     epilog=help_epilog,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('import_from', metavar='import_from', nargs='*',
+                        help=('Name of a file or directory to process (wild cards are acceptable). '
+                              'Default: json-schema'))
+    parser.add_argument('-n', '--normative', action='store_true', dest='normative', default=False,
+                        help='Produce normative (developer-focused) output')
+    parser.add_argument('--format', dest='format', default=['markdown'], type=output_formats,
+                        help=('Output format: markdown, html, or csv. Several formats may be given, separated by '
+                              'commas (for example, --format=markdown,html,csv); the schemas are then processed once '
+                              'and a document is written for each format, using its default file name. Default: markdown'))
+    parser.add_argument('--property_index', action='store_true', dest='property_index', default=False,
+                        help=('Produce Property Index output instead of the full documentation. Takes a single '
+                              'output format; see --add_property_index for both.'))
+    parser.add_argument('--add_property_index', action='store_true', dest='add_property_index', default=False,
+                        help=('Produce Property Index output in addition to the full documentation, from the same '
+                              'pass over the schemas, in the first format listed. --out is then a directory.'))
+    parser.add_argument('--property_index_config_out', dest='property_index_config_out',
+                        metavar='CONFIG_FILE_OUT',
+                        default=False, help='Generate updated config file, with specified filename (property_index mode only).')
+    parser.add_argument('--out', dest='outfile', default='output.md',
+                        help=('Output file (default depends on output format: '
+                              'output.md for Markdown, index.html for HTML, output.csv for CSV). '
+                              'With several formats or --add_property_index, the directory to write the documents to.'))
+    parser.add_argument('--sup', dest='supfile',
+                        help=('Path to the supplemental material document. '
+                              'Default is usersupplement.md for user-focused documentation, '
+                              'and devsupplement.md for normative documentation.'))
+    parser.add_argument('--config', dest="config_file",
+                        help=('Path to a config file, containing configuration '
+                              ' in JSON format. '
+                              'Used in property_index mode only.'))
+    parser.add_argument('--profile', dest='profile_doc',
+                        help=('Path to a JSON profile document, for profile output.'))
+    parser.add_argument('-t', '--terse', action='store_true', dest='profile_terse',
+                        help=('Terse output (meaningful only with --profile). By default, '
+                              'profile output is verbose and includes all properties regardless of '
+                              'profile requirements. "Terse" output is intended for use by '
+                              'Service developers, including only the subset of properties with '
+                              'profile requirements.'))
+    parser.add_argument('--escape', dest='escape_chars',
+                        help=("Characters to escape (\\) in generated Markdown. "
+                              "For example, --escape=@#. Use --escape=@ if strings with embedded @ "
+                              "are being converted to mailto links."))
+    parser.add_argument('--jobs', dest='jobs', type=int, default=1, metavar='N',
+                        help=('Number of worker processes to use for loading, processing, and rendering schemas. '
+                              'Output is the same regardless of the number of jobs. Default: 1'))
+    parser.add_argument('--cache-dir', dest='cache_dir',
+                        help=('Directory for a persistent cache of decoded schema files and file groupings. '
+                              'Entries are reused across runs until the underlying files change. '
+                              'Remote content is saved here too, and revalidated with conditional requests.'))
+    parser.add_argument('--incremental', action='store_true', dest='incremental',
+                        help=('Reuse sections rendered by a previous run (saved in the --cache-dir directory), '
+                              'rendering only those affected by changed schema files.'))
+    parser.add_argument('--offline', action='store_true', dest='offline',
+                        help=('Make no network requests; use remote content saved in the --cache-dir directory '
+                              'by earlier runs.'))
+    parser.add_argument('--stats', action='store_true', dest='stats',
+                        help=('After writing the output, print a summary of cache activity, with hit ratios '
+                              '(property expansion, schema and $ref lookups, remote fetches).'))
+    parser.add_argument('--timings', action='store_true', dest='timings',
+                        help=('After writing the output, report the time spent in each phase of the run (file '
+                              'discovery, grouping, processing and rendering each schema, markdown conversion, '
+                              'output), with counts of $ref lookups, remote fetches, cache hits, and bytes written. '
+                              'The report is JSON, printed unless --timings-out is given.'))
+    parser.add_argument('--timings-out', dest='timings_out', metavar='FILE',
+                        help='Write the --timings report to FILE (implies --timings).')
+    parser.add_argument('--profile-out', dest='profile_out', metavar='FILE',
+                        help='Run under cProfile, and write the profile (for the pstats module) to FILE.')
+    parser.add_argument('--watch', action='store_true', dest='watch',
+                        help=('Keep running, and rebuild the output whenever the input schemas or the supplement '
+                              'change.'))
+    parser.add_argument('--watch-interval', dest='watch_interval', type=float, default=1.0, metavar='SECONDS',
+                        help='With --watch, check for changes every SECONDS. Default: 1')
+    return parser
+
+
+def main():
+    """Parse and validate arguments, then process data and produce markdown output."""
+
+    parser = make_arg_parser()
+    args = parser.parse_args()
+    if args.profile_out:
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(generate_from_args, parser, args)
+        finally:
+            profiler.dump_stats(args.profile_out)
+    else:
+        generate_from_args(parser, args)
+
+
+def generate_from_args(parser, args):
+    """ Generate the documentation that the parsed command-line arguments call for """
+    if args.property_index and (len(args.format) > 1 or args.add_property_index):
+        parser.error('--property_index takes a single output format, and no --add_property_index; '
+                     'use --add_property_index for the full documentation and the property index')
+    if len(args.format) > 1 or args.add_property_index:
+        if args.watch:
+            parser.error('--watch writes a single document: one output format, and no --add_property_index')
+        generate_target_docs(build_target_configs(args))
+        return
+    args.format = args.format[0]
+
+    if args.watch:
+        from doc_watcher import DocWatcher
+        watcher = DocWatcher(lambda: build_config(args), args.watch_interval)
+        watcher.run()
+        return
+
+    config, import_from, outfile_name, input_files = build_config(args)
+
+    # Verify that outfile is writeable:
+    try:
+        outfile = open(outfile_name, 'w', encoding="utf8")
+    except (OSError) as ex:
+        warnings.warn('Unable to open ' + outfile_name + ' to write: ' + str(ex))
+
     doc_generator = DocGenerator(import_from, outfile, config)
     doc_generator.generate_doc()
 
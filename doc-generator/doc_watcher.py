@@ -0,0 +1,134 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: doc_watcher.py
+
+Brief: Watch mode for doc_generator.py (--watch). Rebuilds the output whenever the input schemas or
+the supplement change, keeping loaded schemas, processed groups, and rendered sections in memory.
+"""
+
+import os
+import time
+import warnings
+from doc_gen_util import DocGenUtilities
+from doc_generator import DocGenerator
+
+
+class DocWatcher:
+    """ Polls the input files for changes and rebuilds the output when there are any.
+
+    Between builds we keep the decoded schemas (in DocGenUtilities.schema_cache), the processed
+    schema groups, and the rendered sections, so a rebuild redoes only the work affected by the
+    files that changed. A change to the supplement or profile starts over with a fresh configuration.
+    """
+
+    def __init__(self, configure, interval=1.0):
+        """ configure: callable returning (config, import_from, outfile_name, input_files), like
+        doc_generator.build_config. It's called again whenever one of input_files changes.
+        interval: seconds between checks for changes.
+        """
+        self.configure = configure
+        self.interval = interval
+        self.doc_generator = None
+        self.import_from = []
+        self.outfile_name = None
+        self.input_files = []
+        self.file_stats = {}
+        self.section_results = {}
+        self.builds = 0
+
+
+    def run(self, max_builds=None):
+        """ Build, then rebuild whenever something changes, until interrupted (or after max_builds). """
+        self.build()
+        print("Watching for changes. Press Ctrl-C to stop.")
+        try:
+            while max_builds is None or self.builds < max_builds:
+                time.sleep(self.interval)
+                self.poll()
+        except KeyboardInterrupt:
+            print("Stopped watching.")
+
+
+    def poll(self):
+        """ Check for changed files once, rebuilding if there are any. Returns True if we rebuilt. """
+        file_stats = self.get_file_stats()
+        changed = [x for x in set(file_stats) | set(self.file_stats) if file_stats.get(x) != self.file_stats.get(x)]
+        if not changed:
+            return False
+        self.build(sorted(changed))
+        return True
+
+
+    def build(self, changed=None):
+        """ (Re)build the output. changed is a list of files that changed since the last build, if any. """
+        started = time.perf_counter()
+
+        for filename in changed or []:
+            DocGenUtilities.schema_cache.invalidate(filename)
+
+        if self.doc_generator is None or any(x in self.input_files for x in changed or []):
+            config, self.import_from, self.outfile_name, input_files = self.configure()
+            self.input_files = [os.path.abspath(x) for x in input_files]
+            self.doc_generator = DocGenerator(self.import_from, None, config)
+            self.doc_generator.group_results = {}
+            self.doc_generator.section_results = self.section_results
+
+        # Snapshot before building, so that anything changed mid-build is picked up next time.
+        self.file_stats = self.get_file_stats()
+        self.builds += 1
+
+        try:
+            output = self.doc_generator.generate_docs()
+        except Exception as ex:
+            warnings.warn('Build ' + str(self.builds) + ' failed: ' + str(ex))
+            return False
+        generated = time.perf_counter()
+
+        try:
+            with open(self.outfile_name, 'w', encoding="utf8") as outfile:
+                print(output, file=outfile)
+        except OSError as ex:
+            warnings.warn('Unable to write ' + self.outfile_name + ': ' + str(ex))
+            return False
+        finished = time.perf_counter()
+
+        print(self.build_report(changed, generated - started, finished - generated))
+        return True
+
+
+    def build_report(self, changed, generate_time, write_time):
+        """ One-paragraph summary of the last build: what changed, what was redone, and how long it took. """
+        doc_generator = self.doc_generator
+        lines = []
+        if changed:
+            names = [os.path.basename(x) for x in changed]
+            if len(names) > 5:
+                names = names[:5] + [str(len(names) - 5) + ' more']
+            lines.append('Changed: ' + ', '.join(names))
+
+        groups = len(doc_generator.group_results)
+        lines.append('Build %d: %s written in %.2fs (generate %.2fs, write %.2fs).' % (
+            self.builds, self.outfile_name, generate_time + write_time, generate_time, write_time))
+        counts = '  Schema groups processed: %d of %d' % (groups - doc_generator.groups_reused, groups)
+        section_cache = getattr(doc_generator.generator, 'section_cache', None)
+        if section_cache:
+            rendered = len(section_cache.rendered)
+            counts += '; sections rendered: %d of %d' % (rendered, rendered + len(section_cache.reused))
+        lines.append(counts + '.')
+        return '\n'.join(lines)
+
+
+    def get_file_stats(self):
+        """ (mtime, size) for each file we watch: the input schemas and the files in input_files. """
+        file_stats = {}
+        for filename in DocGenerator.get_files(self.import_from) + self.input_files:
+            filename = os.path.abspath(filename)
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            file_stats[filename] = (stat.st_mtime_ns, stat.st_size)
+        return file_stats
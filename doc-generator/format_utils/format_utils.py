@@ -12,6 +12,25 @@ Initial author: Second Rise LLC.
 
 class FormatUtils():
 
+    def __init__(self):
+        self.heading_recordings = [] # lists of headings being recorded, innermost last
+
+    def record_headings(self):
+        """ Start recording the headings made from now on (for a table of contents; see stop_recording_headings) """
+        self.heading_recordings.append([])
+
+    def stop_recording_headings(self):
+        """ End the innermost recording, returning the headings it holds. They are added to the enclosing
+        recording, if there is one. """
+        headings = self.heading_recordings.pop()
+        self.add_headings(headings)
+        return headings
+
+    def add_headings(self, headings):
+        """ Record headings (dicts of level, link_id, and text) made, or output reused from an earlier run """
+        if self.heading_recordings:
+            self.heading_recordings[-1].extend(headings)
+
     def head_one(self, text, level, anchor_id=None):
         """Add a top-level heading, relative to the generator's level"""
         add_level = '' + '#' * level
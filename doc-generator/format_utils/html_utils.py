@@ -9,15 +9,42 @@ Brief : Contains output utilities for Doc Formatters that output HTML.
 
 Initial author: Second Rise LLC.
 """
+import collections
+import html
+import re
 import markdown
+from doc_gen_util import DocGenUtilities
 from . import FormatUtils
 
 class HtmlUtils(FormatUtils):
 
-    @staticmethod
-    def _head_base(text, level, anchor_id=None):
+    toc_levels = ['h1', 'h2'] # headings recorded for the table of contents (see FormatUtils.record_headings)
+
+    def __init__(self, markdown_cache_size=8192):
+        """ markdown_cache_size: maximum number of converted fragments to remember (see markdown_to_html) """
+        super().__init__()
+        self.markdown = None # converter, made on first use and reset between conversions
+
+        # Converted markdown, as (markdown, no_para): (html, headings). LRU, bounded by markdown_cache_size.
+        self.markdown_cache = collections.OrderedDict()
+        self.markdown_cache_size = markdown_cache_size
+        self.markdown_cache_hits = 0
+        self.markdown_cache_misses = 0
+
+
+    def __getstate__(self):
+        """ Support pickling for worker processes. The converter and its cache stay behind. """
+        state = self.__dict__.copy()
+        state['markdown'] = None
+        state['markdown_cache'] = collections.OrderedDict()
+        return state
+
+    def _head_base(self, text, level, anchor_id=None):
         if anchor_id:
             open_tag = '<h' + level + ' id="' + anchor_id + '">'
+            if self.heading_recordings and ('h' + level) in self.toc_levels:
+                self.add_headings([{'level': 'h' + level, 'link_id': anchor_id,
+                                    'text': html.unescape(re.sub(r'<[^>]*>', '', text))}])
         else:
             open_tag = '<h' + level + '>'
         return open_tag + text + '</h' + level + '>'
@@ -111,14 +138,49 @@ class HtmlUtils(FormatUtils):
         return table_tag + '\n' + head + body + '</table>'
 
 
-    @staticmethod
-    def markdown_to_html(markdown_blob, **args):
-        """ Convert markdown to HTML """
-        html_blob = markdown.markdown(markdown_blob,
-                                      extensions=['markdown.extensions.codehilite',
-                                                  'markdown.extensions.fenced_code',
-                                                  'markdown.extensions.tables',
-                                                  'markdown.extensions.toc'])
+    def markdown_to_html(self, markdown_blob, **args):
+        """ Convert markdown to HTML, recording its headings.
+
+        The same descriptions turn up again and again, so conversions are remembered. """
+        cache_key = (markdown_blob, bool(args.get('no_para')))
+        cached = self.markdown_cache.get(cache_key)
+        if cached is not None:
+            self.markdown_cache_hits += 1
+            self.markdown_cache.move_to_end(cache_key)
+        else:
+            self.markdown_cache_misses += 1
+            with DocGenUtilities.timings.phase('markdown_to_html'):
+                cached = self._markdown_to_html(markdown_blob, **args)
+            if self.markdown_cache_size:
+                self.markdown_cache[cache_key] = cached
+                while len(self.markdown_cache) > self.markdown_cache_size:
+                    self.markdown_cache.popitem(last=False)
+
+        html_blob, headings = cached
+        if headings:
+            self.add_headings(headings)
+        return html_blob
+
+
+    def markdown_cache_stats(self):
+        """ Summary of markdown_to_html cache activity, as a dict """
+        return {'entries': len(self.markdown_cache),
+                'max_entries': self.markdown_cache_size,
+                'hits': self.markdown_cache_hits,
+                'misses': self.markdown_cache_misses}
+
+
+    def _markdown_to_html(self, markdown_blob, **args):
+        """ Convert markdown to HTML, returning (html, the headings in it for the table of contents) """
+        if self.markdown is None:
+            self.markdown = markdown.Markdown(extensions=['markdown.extensions.codehilite',
+                                                          'markdown.extensions.fenced_code',
+                                                          'markdown.extensions.tables',
+                                                          'markdown.extensions.toc'])
+        md = self.markdown.reset()
+        html_blob = md.convert(markdown_blob)
+        headings = self.toc_headings(md.toc_tokens)
+
         # Look for empty table rows; used to get tables without headers recognized:
         if '<table>' in html_blob:
             lines = []
@@ -155,4 +217,15 @@ class HtmlUtils(FormatUtils):
             if html_blob[0:3] == '<p>':
                 html_blob = html_blob[3:-4]
 
-        return html_blob
+        return html_blob, headings
+
+
+    def toc_headings(self, toc_tokens):
+        """ Headings for the table of contents, from the nested toc_tokens of the markdown toc extension """
+        headings = []
+        for token in toc_tokens:
+            level = 'h' + str(token['level'])
+            if level in self.toc_levels:
+                headings.append({'level': level, 'link_id': token['id'], 'text': html.unescape(token['name'])})
+            headings.extend(self.toc_headings(token['children']))
+        return headings
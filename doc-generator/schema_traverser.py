@@ -11,8 +11,9 @@ Brief : Provides utilities for resolving references in a set of Redfish json sch
 Initial author: Second Rise LLC.
 """
 
+import collections
 import warnings
-from doc_gen_util import DocGenUtilities
+from doc_gen_util import DocGenUtilities, PrefixMap
 
 # Format user warnings simply
 def simple_warning_format(message, category, filename, lineno, file=None, line=None):
@@ -25,17 +26,26 @@ warnings.formatwarning = simple_warning_format
 class SchemaTraverser:
     """Provides methods for traversing Redfish schemas (imported from JSON into objects). """
 
-    def __init__(self, schema_data, meta_data, uri_to_local):
+    def __init__(self, schema_data, meta_data, uri_to_local, ref_cache_size=8192):
         """Set up the SchemaTraverser.
 
         schema_data: dict of normalized_schema_uri: json_data
         meta_data: metadata (versioning) by schema and property
         uri_to_local: dict of normalized URI: local path
+        ref_cache_size: maximum number of resolved refs to remember (see find_ref_data)
         """
         self.schemas = schema_data
         self.meta = meta_data
         self.uri_to_local = uri_to_local
+        self.uri_to_local_prefixes = PrefixMap(uri_to_local)
         self.remote_schemas = {} # dict of uri:json_data retrieved dynamically
+        self.touched_refs = None # set of schema refs resolved, while recording dependencies
+
+        # Resolved refs, as normalized ref: (schema node, annotations). LRU, bounded by ref_cache_size.
+        self.ref_cache = collections.OrderedDict()
+        self.ref_cache_size = ref_cache_size
+        self.ref_cache_hits = 0
+        self.ref_cache_misses = 0
 
 
     def copy(self):
@@ -43,7 +53,9 @@ class SchemaTraverser:
         schema_data = self.schemas.copy()
         meta_data = self.meta.copy()
         uri_to_local = self.uri_to_local.copy()
-        return SchemaTraverser(schema_data, meta_data, uri_to_local)
+        traverser = SchemaTraverser(schema_data, meta_data, uri_to_local, self.ref_cache_size)
+        traverser.touched_refs = self.touched_refs
+        return traverser
 
 
     def add_schema(self, uri, data):
@@ -55,11 +67,48 @@ class SchemaTraverser:
 
 
     def find_ref_data(self, ref):
-        """Find data identified by ref within self.schemas."""
+        """Find data identified by ref within self.schemas.
+
+        Returns a new dict with the data's top-level properties plus these annotations: _from_schema_ref,
+        _schema_name (unless the data has its own), _prop_name, _doc_generator_meta, and _ref_uri.
+        Annotating a copy leaves the schema data itself untouched, so resolved refs can be cached
+        and shared. Nested data is not copied.
+        """
 
+        DocGenUtilities.timings.count('find_ref_data')
         if '#' not in ref:
             return None
         schema_ref, path = self.get_schema_ref_and_path(ref)
+        if self.touched_refs is not None:
+            self.touched_refs.add(schema_ref)
+
+        cache_key = schema_ref + '#' + path
+        cached = self.ref_cache.get(cache_key)
+        if cached is not None:
+            self.ref_cache_hits += 1
+            self.ref_cache.move_to_end(cache_key)
+        else:
+            self.ref_cache_misses += 1
+            cached = self.resolve_ref(ref, schema_ref, path)
+            if cached is None:
+                return None
+            if self.ref_cache_size:
+                self.ref_cache[cache_key] = cached
+                while len(self.ref_cache) > self.ref_cache_size:
+                    self.ref_cache.popitem(last=False)
+
+        schema, annotations = cached
+        ref_data = dict(schema)
+        ref_data.update(annotations)
+        ref_data['_ref_uri'] = ref
+        return ref_data
+
+
+    def resolve_ref(self, ref, schema_ref, path):
+        """Look up the data for ref (already split into schema_ref and path).
+
+        Returns a tuple of (the schema node, a dict of the annotations find_ref_data adds), or None.
+        """
         if self.ref_to_own_schema(ref):
             schema = self.schemas.get(schema_ref, None)
             if not schema:
@@ -81,13 +130,20 @@ class SchemaTraverser:
             else:
                 return None
 
-        schema['_from_schema_ref'] = schema_ref
+        annotations = {'_from_schema_ref': schema_ref,
+                       '_prop_name': element,
+                       '_doc_generator_meta': meta}
         if '_schema_name' not in schema:
-            schema['_schema_name'] = self.get_schema_name(schema_ref)
-        schema['_prop_name'] = element
-        schema['_doc_generator_meta'] = meta
-        schema['_ref_uri'] = ref
-        return schema
+            annotations['_schema_name'] = self.get_schema_name(schema_ref)
+        return schema, annotations
+
+
+    def ref_cache_stats(self):
+        """ Summary of find_ref_data cache activity, as a dict """
+        return {'entries': len(self.ref_cache),
+                'max_entries': self.ref_cache_size,
+                'hits': self.ref_cache_hits,
+                'misses': self.ref_cache_misses}
 
 
     def find_meta_data(self, ref):
@@ -112,6 +168,8 @@ class SchemaTraverser:
     def get_schema_name(self, ref):
         """Get the schema name for the given ref."""
         schema_ref, path = self.get_schema_ref_and_path(ref)
+        if self.touched_refs is not None:
+            self.touched_refs.add(schema_ref)
         schema = self.schemas.get(schema_ref)
         if schema:
             return schema.get('_schema_name')
@@ -207,13 +265,12 @@ class SchemaTraverser:
             protocol, uri_part = uri.split('://')
         else:
             uri_part = uri
-        for partial_uri in self.uri_to_local.keys():
-            if uri_part.startswith(partial_uri):
-                local_uri = self.uri_to_local[partial_uri] + uri_part[len(partial_uri):]
-                schema_data = DocGenUtilities.load_as_json(local_uri)
-                # This will fall through to getting the schema remotely if this fails. Correct?
-                if schema_data:
-                    return schema_data
+        for partial_uri, local_path in self.uri_to_local_prefixes.matches(uri_part):
+            local_uri = local_path + uri_part[len(partial_uri):]
+            schema_data = DocGenUtilities.load_as_json(local_uri)
+            # This will fall through to getting the schema remotely if this fails. Correct?
+            if schema_data:
+                return schema_data
 
         schema_data = DocGenUtilities.http_load_as_json(uri)
         if schema_data:
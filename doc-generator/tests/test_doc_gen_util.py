@@ -3,10 +3,12 @@
 # License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
 
 import os
+import pickle
 import urllib.request
 import pytest
 from unittest.mock import patch
-from doc_gen_util import DocGenUtilities
+from doc_gen_util import (DocGenUtilities, SchemaCache, PrefixMap, NameMatcher, UriReplacementIndex, Version,
+                          VersionIndex)
 
 sampledir = os.path.join('tests', 'samples', 'json')
 
@@ -33,7 +35,132 @@ def test_html_get_links(mockRequest):
                       'https://testing.mock/schemas/AccountService_v1.xml',
                       'https://testing.mock/schemas/ActionInfo.v1_0_3.json',
                       'https://testing.mock/schemas/ActionInfo_v1.xml']
-    mockRequest.urlopen.return_value = sampleFile
+    mockRequest.build_opener.return_value.open.return_value = sampleFile # HttpFetcher's keep-alive opener
     links = DocGenUtilities.html_get_links("https://testing.mock/foo.html");
     links.sort()
     assert links == expected_links
+
+
+def test_load_as_json_decodes_once():
+    filename = os.path.join(sampledir, '1.json')
+    DocGenUtilities.schema_cache.clear()
+    data1 = DocGenUtilities.load_as_json(filename)
+    data2 = DocGenUtilities.load_as_json(os.path.abspath(filename))
+    assert DocGenUtilities.schema_cache.stats()['misses'] == 1
+    assert DocGenUtilities.schema_cache.stats()['hits'] == 1
+
+    # Each caller gets its own copy to annotate:
+    assert data1 == data2 and data1 is not data2
+    data1['baz'].append('qux')
+    assert DocGenUtilities.load_as_json(filename)['baz'] == ['foo', 'bar', 'baz']
+
+
+def test_schema_cache_is_bounded():
+    cache = SchemaCache(max_entries=2)
+    cache.put('a.json', {'a': 1})
+    cache.put('b.json', {'b': 1})
+    cache.get('a.json')
+    cache.put('c.json', {'c': 1})
+    assert cache.get('b.json') is None
+    assert cache.get('a.json') == {'a': 1}
+    assert cache.stats()['entries'] == 2
+
+
+def test_prefix_map_matches_longest_first():
+    mapping = {'redfish.dmtf.org/schemas/v1': '/local/dmtf',
+               'redfish.dmtf.org/schemas/v1/Oem': '/local/oem',
+               'redfish.dmtf.org/schemas/v1/OemContoso': '/local/contoso',
+               'contoso.com/schemas': '/local/contoso-site',
+               'redfish.dmtf.org/schemas/v1/Oe': '/local/oe'}
+    prefix_map = PrefixMap(mapping)
+    texts = ['redfish.dmtf.org/schemas/v1/OemContoso.json', 'redfish.dmtf.org/schemas/v1/OemFabrikam.json',
+             'redfish.dmtf.org/schemas/v1/Chassis.json', 'redfish.dmtf.org/schemas/v2/Chassis.json',
+             'contoso.com/schemas/Thing.json', 'redfish.dmtf.org/schemas/v1', '', 'zzz']
+
+    for text in texts:
+        expected = sorted([(k, v) for k, v in mapping.items() if text.startswith(k)], key=lambda x: -len(x[0]))
+        assert list(prefix_map.matches(text)) == expected, text
+        assert prefix_map.longest_match(text) == (expected[0] if expected else None), text
+
+
+def test_name_matcher_agrees_with_substring_loop():
+    exact = ['@odata.id', '@odata.type', 'Oem']
+    substrings = ['@odata.count', '@odata.navigationLink', 'Collection', 'a.b*c', 'Col']
+    names = ['@odata.id', 'Members@odata.count', 'Links@odata.navigationLink', 'ChassisCollection', 'Oem',
+             'OemActions', 'Name', 'xa.b*cx', 'xa.bbcx', '', 'Collected']
+    matcher = NameMatcher(exact, substrings)
+
+    for name in names:
+        expected = name in exact or any([x in name for x in substrings])
+        assert matcher.matches(name) == expected, name
+        assert matcher.matches(name) == expected, name
+    assert matcher.exclude(names) == ['OemActions', 'Name', 'xa.bbcx', '']
+    assert NameMatcher().exclude(names) == names
+    assert NameMatcher(None, ['']).exclude(names) == []
+
+
+def test_uri_replacement_index_agrees_with_key_loop():
+    import re
+    import parse_supplement
+    uri_replacements = parse_supplement.parse_documentation_links('\n'.join([
+        '## http://redfish.dmtf.org/schemas/v1/Chassis.json | http://docs.example.com/Chassis.html',
+        '## http://redfish.dmtf.org/schemas/v1/Chassis*.json | http://docs.example.com/ChassisAny.html',
+        '## http://redfish.dmtf.org/schemas/v1/*Collection.json | http://docs.example.com/Collections.html',
+        '## *.json | http://docs.example.com/Any.html',
+        '## http://contoso.com/schemas/Widget.json | http://contoso.com/Widget.html',
+        '## http://contoso.com/schemas/*/v1 | http://contoso.com/v1.html']))
+
+    def key_loop(ref_uri):
+        # The per-key loop UriReplacementIndex replaced.
+        replacement = None
+        for key in sorted(uri_replacements.keys(), key=len, reverse=True):
+            if key in ref_uri:
+                for match_spec in uri_replacements[key]:
+                    if match_spec.get('full_match') and match_spec['full_match'] == ref_uri:
+                        replacement = match_spec.get('replace_with')
+                    elif match_spec.get('wild_match'):
+                        if re.search('.*' + ''.join(match_spec['wild_match']) + '.*', ref_uri):
+                            replacement = match_spec.get('replace_with')
+        return replacement
+
+    index = UriReplacementIndex(uri_replacements)
+    uris = ['http://redfish.dmtf.org/schemas/v1/Chassis.json', 'http://redfish.dmtf.org/schemas/v1/Chassis.v1_2_0.json',
+            'http://redfish.dmtf.org/schemas/v1/ChassisCollection.json', 'http://contoso.com/schemas/Widget.json',
+            'http://contoso.com/schemas/Widget/v1', 'http://contoso.com/schemas/Widget.yaml', 'Thing.json', '']
+    for uri in uris:
+        assert index.lookup(uri) == key_loop(uri), uri
+        assert index.lookup(uri) == key_loop(uri), uri
+    assert UriReplacementIndex().lookup('http://contoso.com/schemas/Widget.json') is None
+
+
+def test_version_index_finds_latest_compatible():
+    repo = 'http://redfish.dmtf.org/registries'
+    links = [repo + '/' + x for x in ['Base.1.0.0.json', 'Base.1.9.0.json', 'Base.1.10.0.json', 'Base.2.0.0.json',
+                                      'Base.1.10.0.html', 'TaskEvent.1.0.1.json', 'OemBase.1.11.0.json']]
+    links += ['http://elsewhere.example.com/registries/Base.1.12.0.json',
+              'http://redfish.dmtf.org/profiles/OCPBaseServer.v1_0_0.json']
+    version_index = VersionIndex(repo, links)
+
+    assert version_index.find('Base', '1.0.0') == repo + '/Base.1.10.0.json'
+    assert version_index.find('Base', '1.10.0') == repo + '/Base.1.10.0.json'
+    assert version_index.find('Base', '1.10.1') is None
+    assert version_index.find('Base', '2.0.0') == repo + '/Base.2.0.0.json'
+    assert version_index.find('Base', '3.0.0') is None
+    assert version_index.find('TaskEvent', '1.0') == repo + '/TaskEvent.1.0.1.json'
+    assert version_index.find('Event', '1.0.0') is None
+
+    profiles = VersionIndex('http://redfish.dmtf.org/profiles', links)
+    assert profiles.find('OCPBaseServer', '1_0_0') == 'http://redfish.dmtf.org/profiles/OCPBaseServer.v1_0_0.json'
+
+
+def test_versions_compare_numerically():
+    assert DocGenUtilities.compare_versions('1.10.0', '1.9.0') == 1
+    assert DocGenUtilities.compare_versions('1_2_0', '1.10.0') == -1
+    assert DocGenUtilities.compare_versions('1.2', '1.2.0') == 0
+    assert sorted(['1.10.0', '1.2.0', '1.9.1', '1.9.0'], key=Version.parse) == ['1.2.0', '1.9.0', '1.9.1', '1.10.0']
+
+    assert Version.parse('v1_2_0') == Version.parse('1.2.0')
+    assert hash(Version.parse('v1_2_0')) == hash(Version.parse('1.2'))
+    assert Version.parse('1.2.0') is Version.parse('1.2.0')
+    assert str(Version.parse('v1_2_0')) == '1.2.0'
+    assert pickle.loads(pickle.dumps(Version.parse('1.10.1'))) == Version.parse('1.10.1')
@@ -0,0 +1,84 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: test_doc_watcher.py
+
+Brief: Tests for watch mode (--watch), which rebuilds the output when input files change.
+"""
+
+import os
+import copy
+import shutil
+from unittest.mock import patch
+import pytest
+from doc_gen_util import DocGenUtilities, SchemaCache
+from doc_generator import DocGenerator
+from doc_watcher import DocWatcher
+
+testcase_path = os.path.join('tests', 'samples', 'generate_docs_cases', 'general')
+
+base_config = {
+    'expand_defs_from_non_output_schemas': False,
+    'excluded_by_match': ['@odata.count', '@odata.navigationLink'],
+    'profile_resources': {},
+    'units_translation': {},
+    'excluded_annotations_by_match': ['@odata.count', '@odata.navigationLink'],
+    'excluded_schemas': [],
+    'excluded_properties': ['@odata.id', '@odata.context', '@odata.type'],
+    'uri_replacements': {},
+    'profile': {},
+    'escape_chars': [],
+    'output_format': 'markdown',
+}
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_watcher_rebuilds_changed_schemas(mockRequest, tmp_path):
+
+    input_dir = str(tmp_path / 'input')
+    shutil.copytree(os.path.join(testcase_path, 'input'), input_dir)
+    outfile_name = str(tmp_path / 'output.md')
+
+    config = copy.deepcopy(base_config)
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+    def configure():
+        return copy.deepcopy(config), [input_dir], outfile_name, []
+
+    def full_build():
+        DocGenUtilities.schema_cache = SchemaCache()
+        return DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config)).generate_docs()
+
+    saved_cache = DocGenUtilities.schema_cache
+    try:
+        DocGenUtilities.schema_cache = SchemaCache()
+        watcher = DocWatcher(configure, interval=0)
+        watcher.build()
+        with open(outfile_name) as f:
+            first_output = f.read()
+        assert not watcher.poll(), "Rebuilt with no changes"
+
+        port_file = os.path.join(input_dir, 'NetworkPort.v1_1_0.json')
+        with open(port_file) as f:
+            port_text = f.read()
+        with open(port_file, 'w') as f:
+            f.write(port_text.replace('Wake on LAN (WoL) is enabled for', 'Wake on LAN (WoL) (edited) is enabled for'))
+
+        assert watcher.poll()
+        with open(outfile_name) as f:
+            output = f.read()
+        assert output != first_output
+        assert 'Wake on LAN (WoL) (edited) is enabled for' in output
+
+        # Only the NetworkPort group was processed again:
+        doc_generator = watcher.doc_generator
+        assert len(doc_generator.group_results) - doc_generator.groups_reused == 1
+
+        expected_output = full_build()
+        assert output == expected_output + '\n'
+
+    finally:
+        DocGenUtilities.schema_cache = saved_cache
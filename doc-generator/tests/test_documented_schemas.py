@@ -0,0 +1,62 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: test_documented_schemas.py
+
+Brief: Tests for DocFormatter's documented-schema lookups (is_documented_schema,
+get_ref_for_documented_schema_name), at scale.
+"""
+
+import time
+from doc_formatter import DocFormatter
+
+num_schemas = 5000
+
+
+def make_property_data(count):
+    """ property_data for count schemas, with some undocumented, some excluded, and some names repeated """
+    property_data = {}
+    for i in range(count):
+        schema_name = 'Resource' + str(i)
+        properties = {'Id': {'type': 'string'}} if i % 10 else {}
+        property_data['http://redfish.dmtf.org/schemas/v1/' + schema_name + '.json'] = {
+            'schema_name': schema_name, 'properties': properties}
+        if i % 100 == 1:
+            property_data['http://contoso.com/schemas/' + schema_name + '.json'] = {
+                'schema_name': schema_name, 'properties': properties}
+    property_data['http://redfish.dmtf.org/schemas/v1/ExcludedCollection.json'] = {
+        'schema_name': 'ExcludedCollection', 'properties': {'Id': {}}}
+    return property_data
+
+
+def test_documented_schema_lookups_scale():
+    property_data = make_property_data(num_schemas)
+    config = {'excluded_schemas_by_match': ['Collection']}
+    formatter = DocFormatter(property_data, None, config)
+    documented = sorted([x for x, y in property_data.items()
+                         if y['properties'] and 'Collection' not in x], key=str.lower)
+    assert formatter.documented_schemas == documented
+
+    schema_refs = list(property_data.keys()) + ['http://redfish.dmtf.org/schemas/v1/Missing.json']
+    schema_names = ['Resource' + str(i) for i in range(num_schemas)] + ['Missing', 'ExcludedCollection', 'Resource']
+
+    start = time.perf_counter()
+    for schema_ref in schema_refs:
+        assert formatter.is_documented_schema(schema_ref) == (schema_ref in documented)
+    found = {x: formatter.get_ref_for_documented_schema_name(x) for x in schema_names}
+    elapsed = time.perf_counter() - start
+
+    for schema_name in schema_names[::50] + schema_names[-3:]:
+        # The scan that the name index replaced:
+        expected = False
+        for x in [x for x in documented if schema_name in x]:
+            if property_data[x]['schema_name'] == schema_name:
+                expected = x
+                break
+        assert found[schema_name] == expected, schema_name
+    assert found['Resource1'] == 'http://contoso.com/schemas/Resource1.json'
+
+    # Scanning the documented list for each lookup took several seconds at this size.
+    assert elapsed < 1.0
@@ -15,6 +15,7 @@ complete output document for a small schema set.
 
 import os
 import copy
+import concurrent.futures
 from unittest.mock import patch
 import pytest
 from doc_generator import DocGenerator
@@ -151,3 +152,46 @@ def test_csv_output(mockRequest):
     output = output.replace('\r\n', '\n').strip()
 
     assert output == expected_output, "Failed on: " + name
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_parallel_output_matches_serial(mockRequest):
+    """ Output with schema processing spread across worker processes (--jobs) must match a serial run exactly. """
+
+    for output_format in ['markdown', 'html', 'csv']:
+        for dirname, name in cases.items():
+            config = copy.deepcopy(base_config)
+            config['output_format'] = output_format
+            dirpath = os.path.abspath(os.path.join(testcase_path, dirname))
+            input_dir = os.path.join(dirpath, 'input')
+
+            config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+            config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+            serial_output = DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config)).generate_docs()
+
+            config['jobs'] = 2
+            parallel_output = DocGenerator([ input_dir ], '/dev/null', config).generate_docs()
+
+            assert parallel_output == serial_output, "Failed on: " + name + ', ' + output_format
+
+
+class ProcessPoolExecutorWithoutInitializer(concurrent.futures.ProcessPoolExecutor):
+    """ A ProcessPoolExecutor as of Python 3.5 and 3.6, which take no initializer """
+    def __init__(self, max_workers=None):
+        super().__init__(max_workers=max_workers)
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_parallel_output_without_pool_initializer(mockRequest):
+    """ --jobs doesn't depend on ProcessPoolExecutor features newer than the Python versions we support. """
+    input_dir = os.path.abspath(os.path.join(testcase_path, 'general', 'input'))
+    config = copy.deepcopy(base_config)
+    config['output_format'] = 'markdown'
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+    serial_output = DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config)).generate_docs()
+
+    config['jobs'] = 2
+    with patch('concurrent.futures.ProcessPoolExecutor', ProcessPoolExecutorWithoutInitializer):
+        assert DocGenerator([ input_dir ], '/dev/null', config).generate_docs() == serial_output
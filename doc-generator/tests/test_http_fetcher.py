@@ -0,0 +1,251 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+import copy
+import http.server
+import json
+import os
+import threading
+import warnings
+from unittest.mock import patch
+import pytest
+from doc_gen_util import DocGenUtilities, HttpFetcher
+from doc_gen_util import http_fetcher
+from doc_gen_util.http_fetcher import connection_pool
+from doc_generator import DocGenerator
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    """ Serves /schemas/<name>.json as a small JSON document, with an ETag (or, under /dated/, a Last-Modified
+    date) for conditional requests; /missing/... is a 404; /moved/... redirects; /unavailable/... is a 503. """
+    protocol_version = 'HTTP/1.1'
+    last_modified = 'Mon, 01 Jan 2018 00:00:00 GMT'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path.startswith('/schemas/') or self.path.startswith('/dated/'):
+            etag = '"%d"' % self.server.revision
+            if self.path.startswith('/dated/'):
+                unchanged = self.headers.get('If-Modified-Since') == self.last_modified
+            else:
+                unchanged = self.headers.get('If-None-Match') == etag
+            if unchanged:
+                self.server.not_modified += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+            body = json.dumps({'title': self.path, 'revision': self.server.revision}).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            if self.path.startswith('/dated/'):
+                self.send_header('Last-Modified', self.last_modified)
+            else:
+                self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path.startswith('/moved/'):
+            self.send_response(301)
+            self.send_header('Location', self.path.replace('/moved/', '/schemas/'))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.path.startswith('/unavailable/'):
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.requests = []
+    server.revision = 1
+    server.not_modified = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, 'http://127.0.0.1:%d' % server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_reuses_connection(stub_server):
+    server, base_uri = stub_server
+    fetcher = HttpFetcher()
+    for i in range(5):
+        text = fetcher.fetch(base_uri + '/schemas/Thing%d.json' % i)
+        assert json.loads(text)['title'] == '/schemas/Thing%d.json' % i
+
+    assert len(server.requests) == 5
+    assert server.connections == 1
+
+    # Repeats are served from memory:
+    fetcher.fetch(base_uri + '/schemas/Thing0.json')
+    assert len(server.requests) == 5
+    assert fetcher.stats()['hits'] == 1
+
+
+def test_fetch_failure_is_cached_and_reported_once(stub_server):
+    server, base_uri = stub_server
+    fetcher = HttpFetcher()
+    uri = base_uri + '/missing/Thing.json'
+
+    with pytest.warns(UserWarning):
+        assert fetcher.fetch(uri) is None
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert fetcher.fetch(uri) is None
+    assert server.requests == ['/missing/Thing.json']
+
+
+def test_fetch_follows_redirect(stub_server):
+    server, base_uri = stub_server
+    fetcher = HttpFetcher()
+    text = fetcher.fetch(base_uri + '/moved/Thing.json')
+    assert json.loads(text)['title'] == '/schemas/Thing.json'
+    assert server.requests == ['/moved/Thing.json', '/schemas/Thing.json']
+
+
+def test_prefetch(stub_server):
+    server, base_uri = stub_server
+    fetcher = HttpFetcher(max_workers=4)
+    uris = [base_uri + '/schemas/Thing%d.json' % i for i in range(10)]
+    missing_uri = base_uri + '/missing/Thing.json'
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert fetcher.prefetch(uris + [missing_uri] + uris) == 11
+    assert len(server.requests) == 11
+    assert server.connections <= 4
+
+    for uri in uris:
+        assert fetcher.fetch(uri) is not None
+    assert len(server.requests) == 11
+
+    # The prefetch failure is reported when the URI is actually wanted:
+    with pytest.warns(UserWarning):
+        assert fetcher.fetch(missing_uri) is None
+    assert len(server.requests) == 11
+
+
+def test_mirror_revalidates(stub_server, tmpdir):
+    server, base_uri = stub_server
+    mirror_dir = str(tmpdir)
+    uris = [base_uri + '/schemas/Thing.json', base_uri + '/dated/Thing.json']
+    first = [HttpFetcher(mirror_dir=mirror_dir).fetch(uri) for uri in uris]
+
+    # A later run gets "not modified" for each, and uses the saved content:
+    fetcher = HttpFetcher(mirror_dir=mirror_dir)
+    assert [fetcher.fetch(uri) for uri in uris] == first
+    assert server.not_modified == 2
+    assert fetcher.stats()['revalidated'] == 2
+
+    # Changed content is retrieved, and replaces what was saved:
+    server.revision = 2
+    fetcher = HttpFetcher(mirror_dir=mirror_dir)
+    assert json.loads(fetcher.fetch(uris[0]))['revision'] == 2
+    assert json.loads(HttpFetcher(mirror_dir=mirror_dir, offline=True).fetch(uris[0]))['revision'] == 2
+
+
+def test_mirror_offline(stub_server, tmpdir):
+    server, base_uri = stub_server
+    mirror_dir = str(tmpdir)
+    uri = base_uri + '/schemas/Thing.json'
+    text = HttpFetcher(mirror_dir=mirror_dir).fetch(uri)
+    requests = len(server.requests)
+
+    fetcher = HttpFetcher(mirror_dir=mirror_dir, offline=True)
+    assert fetcher.fetch(uri) == text
+    assert fetcher.prefetch([base_uri + '/schemas/Other.json']) == 1
+    with pytest.warns(UserWarning):
+        assert fetcher.fetch(base_uri + '/schemas/Other.json') is None
+    assert len(server.requests) == requests
+
+
+def test_mirror_used_when_server_unreachable(stub_server, tmpdir):
+    server, base_uri = stub_server
+    mirror_dir = str(tmpdir)
+    uri = base_uri + '/schemas/Thing.json'
+    text = HttpFetcher(mirror_dir=mirror_dir).fetch(uri)
+    server.shutdown()
+    server.server_close()
+    connection_pool.clear()
+
+    fetcher = HttpFetcher(mirror_dir=mirror_dir)
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert fetcher.fetch(uri) == text
+    assert fetcher.stats()['mirror_hits'] == 1
+
+
+def test_mirror_not_used_when_content_is_gone(stub_server, tmpdir):
+    server, base_uri = stub_server
+    fetcher = HttpFetcher(mirror_dir=str(tmpdir))
+    missing_uri = base_uri + '/missing/Thing.json'
+    unavailable_uri = base_uri + '/unavailable/Thing.json'
+    fetcher.mirror.put(missing_uri, '{"saved": true}', '"1"', None)
+    fetcher.mirror.put(unavailable_uri, '{"saved": true}', '"1"', None)
+
+    # A 404 means the content is gone, so the saved copy isn't used, and the failure is reported:
+    with pytest.warns(UserWarning):
+        assert fetcher.fetch(missing_uri) is None
+
+    # A 5xx is (we hope) temporary, so the saved copy is used:
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        assert fetcher.fetch(unavailable_uri) == '{"saved": true}'
+    assert fetcher.stats()['mirror_hits'] == 1
+
+
+def test_global_opener_left_alone(stub_server):
+    server, base_uri = stub_server
+    with patch.object(http_fetcher, '_keep_alive_opener', (None, None)), \
+         patch('urllib.request.install_opener') as install_opener:
+        fetcher = HttpFetcher()
+        fetcher.fetch(base_uri + '/schemas/Thing.json')
+        fetcher.fetch(base_uri + '/schemas/Other.json')
+        assert not install_opener.called
+    assert server.connections == 1
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_prefetch_skips_input_files(mockRequest):
+    """ Versioned refs to input files aren't prefetched, even with no URI mapping between the two. """
+    input_dir = os.path.abspath(os.path.join('tests', 'samples', 'version_added', 'Chassis'))
+    config = {'expand_defs_from_non_output_schemas': False,
+              'excluded_by_match': ['@odata.count', '@odata.navigationLink'],
+              'profile_resources': {},
+              'units_translation': {},
+              'excluded_annotations_by_match': ['@odata.count', '@odata.navigationLink'],
+              'excluded_schemas': [],
+              'excluded_properties': ['@odata.id', '@odata.context', '@odata.type'],
+              'uri_replacements': {},
+              'profile': {},
+              'escape_chars': [],
+              'output_format': 'markdown',
+              'uri_to_local': {},
+              'local_to_uri': {}}
+    input_files = os.listdir(input_dir)
+
+    for local_to_uri in [{}, {input_dir: 'redfish.dmtf.org/schemas/v1'}]:
+        config['local_to_uri'] = local_to_uri
+        prefetched = []
+        doc_gen = DocGenerator([input_dir], '/dev/null', copy.deepcopy(config))
+        with patch.object(DocGenUtilities.http_fetcher, 'prefetch', prefetched.extend), warnings.catch_warnings():
+            warnings.simplefilter('ignore') # about the (mocked) remote schemas
+            doc_gen.process_schemas()
+        assert prefetched
+        assert [x for x in prefetched if x.rpartition('/')[2] in input_files] == []
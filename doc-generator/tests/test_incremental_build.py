@@ -0,0 +1,93 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: test_incremental_build.py
+
+Brief: Tests for incremental builds (--incremental), which reuse unaffected sections from a previous run.
+"""
+
+import os
+import copy
+import shutil
+from unittest.mock import patch
+import pytest
+from doc_gen_util import DocGenUtilities, SchemaCache
+from doc_generator import DocGenerator
+
+testcase_path = os.path.join('tests', 'samples', 'generate_docs_cases', 'general')
+
+base_config = {
+    'expand_defs_from_non_output_schemas': False,
+    'excluded_by_match': ['@odata.count', '@odata.navigationLink'],
+    'profile_resources': {},
+    'units_translation': {},
+    'excluded_annotations_by_match': ['@odata.count', '@odata.navigationLink'],
+    'excluded_schemas': [],
+    'excluded_properties': ['@odata.id', '@odata.context', '@odata.type'],
+    'uri_replacements': {},
+    'profile': {},
+    'escape_chars': [],
+}
+
+
+def _build(input_dir, config):
+    """ Run a build with a fresh in-memory schema cache, as a new process would. Returns the DocGenerator and output. """
+    DocGenUtilities.schema_cache = SchemaCache()
+    doc_gen = DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config))
+    output = doc_gen.generate_docs()
+    return doc_gen, output
+
+
+@pytest.mark.parametrize('output_format', ['markdown', 'html', 'csv'])
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_incremental_build_rerenders_only_changed_sections(mockRequest, output_format, tmp_path):
+
+    input_dir = str(tmp_path / 'input')
+    shutil.copytree(os.path.join(testcase_path, 'input'), input_dir)
+
+    config = copy.deepcopy(base_config)
+    config['output_format'] = output_format
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+    config['cache_dir'] = str(tmp_path / 'cache')
+    incremental_config = copy.deepcopy(config)
+    incremental_config['incremental'] = True
+
+    saved_cache = DocGenUtilities.schema_cache
+    try:
+        _, full_output = _build(input_dir, config)
+
+        doc_gen, cold_output = _build(input_dir, incremental_config)
+        section_cache = doc_gen.generator.section_cache
+        assert cold_output == full_output
+        assert section_cache.reused == []
+        all_sections = [x for x in section_cache.rendered if x[0] == 'sections']
+        assert len(all_sections) > 1
+
+        doc_gen, warm_output = _build(input_dir, incremental_config)
+        section_cache = doc_gen.generator.section_cache
+        assert warm_output == full_output
+        assert section_cache.rendered == []
+
+        # Change one schema. Its section, and the section that links to it, should be rendered again.
+        port_file = os.path.join(input_dir, 'NetworkPort.v1_1_0.json')
+        with open(port_file) as f:
+            port_text = f.read()
+        assert 'Wake on LAN (WoL) is enabled for' in port_text
+        with open(port_file, 'w') as f:
+            f.write(port_text.replace('Wake on LAN (WoL) is enabled for', 'Wake on LAN (WoL) (edited) is enabled for'))
+
+        _, full_output = _build(input_dir, config)
+        doc_gen, output = _build(input_dir, incremental_config)
+        section_cache = doc_gen.generator.section_cache
+        assert output == full_output
+        assert 'Wake on LAN (WoL) (edited) is enabled for' in output
+        assert [x for x in section_cache.rendered if x[0] == 'sections'] == [
+            ('sections', 'redfish.dmtf.org/schemas/v1/NetworkDeviceFunction.json'),
+            ('sections', 'redfish.dmtf.org/schemas/v1/NetworkPort.json')]
+        assert ('sections', 'redfish.dmtf.org/schemas/v1/NetworkDeviceFunctionCollection.json') in section_cache.reused
+
+    finally:
+        DocGenUtilities.schema_cache = saved_cache
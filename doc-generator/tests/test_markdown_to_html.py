@@ -0,0 +1,57 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: test_markdown_to_html.py
+
+Brief: Tests for the converter reuse and fragment cache in HtmlUtils.markdown_to_html.
+"""
+
+import pickle
+from format_utils import HtmlUtils
+
+
+def test_repeated_fragments_are_converted_once():
+    formatter = HtmlUtils()
+    first = formatter.markdown_to_html('The unique identifier for a resource.')
+    assert formatter.markdown_to_html('The unique identifier for a resource.') == first
+    assert first == '<p>The unique identifier for a resource.</p>'
+    assert formatter.markdown_to_html('The unique identifier for a resource.', no_para=True) == \
+        'The unique identifier for a resource.'
+    assert formatter.markdown_cache_stats() == {'entries': 2, 'max_entries': 8192, 'hits': 1, 'misses': 2}
+
+
+def test_cache_is_bounded_lru():
+    formatter = HtmlUtils(markdown_cache_size=2)
+    formatter.markdown_to_html('one')
+    formatter.markdown_to_html('two')
+    formatter.markdown_to_html('one')
+    formatter.markdown_to_html('three')
+    assert list(formatter.markdown_cache) == [('one', False), ('three', False)]
+
+
+def test_cached_fragments_still_record_headings():
+    formatter = HtmlUtils()
+    blob = '# Heading One\n\nText.\n\n### Not Listed\n'
+    formatter.markdown_to_html(blob)
+    formatter.record_headings()
+    formatter.markdown_to_html(blob)
+    headings = formatter.stop_recording_headings()
+    assert headings == [{'level': 'h1', 'link_id': 'heading-one', 'text': 'Heading One'}]
+
+
+def test_conversions_match_fresh_converter():
+    formatter = HtmlUtils()
+    blobs = ['| | |\n| --- | --- |\n| a | b |\n', '```\ncode\n```\n', '*text*', '| | |\n| --- | --- |\n| c | d |\n']
+    for blob in blobs:
+        assert formatter.markdown_to_html(blob) == HtmlUtils(markdown_cache_size=0).markdown_to_html(blob)
+
+
+def test_pickled_formatter_leaves_cache_behind():
+    formatter = HtmlUtils()
+    formatter.markdown_to_html('text')
+    copied = pickle.loads(pickle.dumps(formatter))
+    assert copied.markdown is None
+    assert len(copied.markdown_cache) == 0
+    assert copied.markdown_to_html('text') == '<p>text</p>'
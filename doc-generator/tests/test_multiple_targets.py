@@ -0,0 +1,124 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: test_multiple_targets.py
+
+Brief: Tests for generating several output formats from one pass over the schemas (DocGenerator.generate_targets).
+"""
+
+import os
+import copy
+import argparse
+import warnings
+from unittest.mock import patch
+import pytest
+import doc_generator
+from doc_generator import DocGenerator
+from doc_formatter import MarkdownGenerator, HtmlGenerator
+
+testcase_path = os.path.join('tests', 'samples', 'referenced_objects', 'network_sample')
+
+base_config = {
+    'expand_defs_from_non_output_schemas': False,
+    'excluded_by_match': ['@odata.count', '@odata.navigationLink'],
+    'profile_resources': {},
+    'units_translation': {},
+    'excluded_annotations_by_match': ['@odata.count', '@odata.navigationLink'],
+    'excluded_schemas': [],
+    'excluded_properties': ['@odata.id', '@odata.context', '@odata.type'],
+    'uri_replacements': {},
+    'wants_common_objects': True,
+    'profile': {},
+    'escape_chars': [],
+    'profile_mode': False,
+    'supplemental': {},
+}
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_targets_match_separate_runs(mockRequest, tmp_path):
+    input_dir = os.path.abspath(testcase_path)
+    configs = []
+    for output_format in ['markdown', 'html', 'csv', 'markdown']:
+        config = copy.deepcopy(base_config)
+        config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+        config['local_to_uri'] = {input_dir: 'redfish.dmtf.org/schemas/v1'}
+        config['output_format'] = output_format
+        configs.append(config)
+    configs[-1]['output_content'] = 'property_index'
+    configs[-1]['property_index_config'] = {'DescriptionOverrides': {}, 'ExcludedProperties': []}
+
+    expected_outputs = [DocGenerator([input_dir], '/dev/null', copy.deepcopy(x)).generate_docs() for x in configs]
+    assert len(set([DocGenerator.parse_config_key(x) for x in configs])) == 1
+
+    outfile_names = [str(tmp_path / ('output' + str(i))) for i in range(len(configs))]
+    targets = [(x, open(y, 'w', encoding='utf8')) for x, y in zip(configs, outfile_names)]
+    with patch.object(DocGenerator, 'process_schemas', autospec=True,
+                      side_effect=DocGenerator.process_schemas) as process_schemas:
+        DocGenerator([input_dir], None, configs[0]).generate_targets(targets)
+    assert process_schemas.call_count == 1
+
+    for outfile_name, expected_output in zip(outfile_names, expected_outputs):
+        with open(outfile_name, encoding='utf8', newline='') as result:
+            # write_output adds a final newline.
+            assert result.read() == (expected_output or '') + '\n', outfile_name
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_render_same_data_twice(mockRequest):
+    """ Formatting leaves the processed schemas as it found them, so they can be formatted again
+    (action parameters, for example, are extended in a copy). """
+    for sample in [os.path.join('version_added', 'Chassis'), os.path.join('version_deprecated', 'Chassis')]:
+        input_dir = os.path.abspath(os.path.join('tests', 'samples', sample))
+        config = copy.deepcopy(base_config)
+        config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+        config['local_to_uri'] = {input_dir: 'redfish.dmtf.org/schemas/v1'}
+        config['output_format'] = 'markdown'
+
+        doc_gen = DocGenerator([input_dir], '/dev/null', config)
+        output = doc_gen.generate_docs()
+        traverser = doc_gen.generator.traverser
+        assert MarkdownGenerator(doc_gen.property_data, traverser, copy.deepcopy(config), 0).generate_output() == output
+
+        html_config = copy.deepcopy(config)
+        html_config['output_format'] = 'html'
+        expected_html = DocGenerator([input_dir], '/dev/null', copy.deepcopy(html_config)).generate_docs()
+        assert HtmlGenerator(doc_gen.property_data, traverser, html_config, 0).generate_output() == expected_html
+
+
+def test_build_target_configs(tmp_path):
+    args = argparse.Namespace(format=['markdown', 'html', 'csv'], property_index=False, add_property_index=True,
+                              property_index_config_out=False, outfile=str(tmp_path), import_from=['json-schema'],
+                              supfile=None, normative=False,
+                              config_file=None, profile_doc=None, profile_terse=False, escape_chars=None, jobs=1,
+                              cache_dir=None, incremental=False, offline=False, stats=False, timings=False,
+                              timings_out=None, profile_out=None, watch=False, watch_interval=1.0)
+    targets = doc_generator.build_target_configs(args)
+
+    assert [os.path.basename(x[2]) for x in targets] == ['output.md', 'index.html', 'output.csv', 'property_index.md']
+    assert [x[0]['output_format'] for x in targets] == ['markdown', 'html', 'csv', 'markdown']
+    assert [x[0]['output_content'] for x in targets] == ['full_doc'] * 3 + ['property_index']
+    assert all([os.path.dirname(x[2]) == str(tmp_path) for x in targets])
+    assert args.format == ['markdown', 'html', 'csv'] and args.supfile is None
+
+
+def test_property_index_has_one_meaning():
+    """ --property_index is the property index instead of the full documentation, so it can't go with several
+    formats; --add_property_index asks for both. """
+    parser = doc_generator.make_arg_parser()
+    for argv in [['--format=markdown,html', '--property_index'], ['--property_index', '--add_property_index']]:
+        with patch.object(doc_generator, 'generate_target_docs') as generate_target_docs:
+            with pytest.raises(SystemExit):
+                doc_generator.generate_from_args(parser, parser.parse_args(argv))
+            assert not generate_target_docs.called
+
+    for argv, formats in [(['--format=markdown,html', '--add_property_index'], ['markdown', 'html', 'markdown']),
+                          (['--add_property_index'], ['markdown', 'markdown'])]:
+        with patch.object(doc_generator, 'generate_target_docs') as generate_target_docs, warnings.catch_warnings():
+            warnings.simplefilter('ignore') # about the missing supplement
+            doc_generator.generate_from_args(parser, parser.parse_args(argv))
+        targets = generate_target_docs.call_args[0][0]
+        assert [x[0]['output_format'] for x in targets] == formats
+        assert [x[0]['output_content'] for x in targets] == ['full_doc'] * (len(formats) - 1) + ['property_index']
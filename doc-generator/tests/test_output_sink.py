@@ -0,0 +1,137 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: test_output_sink.py
+
+Brief: Tests for OutputSink, and for documents written to a file as they are generated.
+"""
+
+import os
+import re
+import copy
+from unittest.mock import patch
+import pytest
+from doc_formatter import OutputSink, ToCParser
+from doc_generator import DocGenerator
+
+testcase_path = os.path.join('tests', 'samples', 'referenced_objects', 'network_sample')
+
+base_config = {
+    'expand_defs_from_non_output_schemas': False,
+    'excluded_by_match': ['@odata.count', '@odata.navigationLink'],
+    'profile_resources': {},
+    'units_translation': {},
+    'excluded_annotations_by_match': ['@odata.count', '@odata.navigationLink'],
+    'excluded_schemas': [],
+    'excluded_properties': ['@odata.id', '@odata.context', '@odata.type'],
+    'uri_replacements': {},
+    'wants_common_objects': True,
+    'profile': {},
+    'escape_chars': [],
+}
+
+
+def test_slots_are_filled_in_place(tmp_path):
+    for outfile_name in [None, 'out.txt']:
+        outfile = outfile_name and open(str(tmp_path / outfile_name), 'w', encoding='utf8')
+        sink = OutputSink(outfile)
+        sink.write('head\n')
+        sink.slot('top')
+        sink.add_marker('objects', '<p>[objects]</p>', '[objects]')
+        sink.add_marker('toc', '[toc]')
+        sink.add_marker('unused', '[unused]')
+        sink.write('<p>[objects]</p> [toc] [objects] ')
+        sink.write('[toc] body')
+        sink.fill('objects', 'OBJECTS')
+        assert list(sink.chunks()) == ['head\n', 'OBJECTS', ' ', '[toc]', ' [objects] [toc] body']
+        sink.fill('top', 'TOP ')
+        assert sink.has_slot('toc') and not sink.has_slot('unused')
+
+        expected = 'head\nTOP OBJECTS [toc] [objects] [toc] body'
+        if outfile:
+            assert sink.finish() is None
+            outfile.close()
+            with open(str(tmp_path / outfile_name), encoding='utf8') as result:
+                assert result.read() == expected
+        else:
+            assert sink.finish() == expected
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_streamed_output_matches_returned_output(mockRequest, tmp_path):
+    input_dir = os.path.abspath(testcase_path)
+    for output_format in ['markdown', 'html', 'csv']:
+        config = copy.deepcopy(base_config)
+        config['output_format'] = output_format
+        config['add_toc'] = True
+        config['supplemental'] = {'Introduction': "# Contents\n\n[add_toc]\n\n# Common Objects\n\n[insert_common_objects]\n",
+                                  'Postscript': "# Collections\n\n[insert_collections]\n"}
+        config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+        config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+        expected_output = DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config)).generate_docs()
+
+        outfile_name = str(tmp_path / ('output.' + output_format))
+        with open(outfile_name, 'w', encoding='utf8') as outfile:
+            assert DocGenerator([ input_dir ], '/dev/null', config).generate_docs(outfile=outfile) is None
+        with open(outfile_name, encoding='utf8', newline='') as result:
+            output = result.read()
+
+        assert output == expected_output, "Failed on: " + output_format
+        assert '[insert_common_objects]' not in output and '[insert_collections]' not in output
+        if output_format == 'html':
+            assert '[add_toc]' not in output and '<div class="toc">' in output
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_toc_lists_headings_in_document_order(mockRequest):
+    input_dir = os.path.abspath(testcase_path)
+    for jobs in [1, 2]:
+        config = copy.deepcopy(base_config)
+        config['output_format'] = 'html'
+        config['add_toc'] = True
+        config['jobs'] = jobs
+        config['supplemental'] = {'Introduction': "# Contents\n\n[add_toc]\n\n# Common Objects\n\n[insert_common_objects]\n",
+                                  'Postscript': "# Collections &amp; More\n\n[insert_collections]\n"}
+        config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+        config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+        output = DocGenerator([ input_dir ], '/dev/null', config).generate_docs()
+
+        toc_start = output.index('<div class="toc">')
+        toc_end = output.index('</div>', toc_start)
+        toc_links = re.findall(r'<a href="#([^"]+)">([^<]*)</a>', output[toc_start:toc_end])
+
+        parser = ToCParser(['h1', 'h2'])
+        parser.feed(output)
+        headings = [(x['link_id'], x['text']) for x in parser.close()]
+
+        assert toc_links == headings, "Failed with jobs=%d" % jobs
+        assert toc_links[-1] == ('collections-more', 'Collections & More')
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_toc_includes_raw_html_supplement_headings(mockRequest):
+    input_dir = os.path.abspath(testcase_path)
+    config = copy.deepcopy(base_config)
+    config['output_format'] = 'html'
+    config['add_toc'] = True
+    config['supplemental'] = {'Introduction': ('# Contents\n\n[add_toc]\n\n<h2 id="rawhead">Raw Heading</h2>\n\n'
+                                               '# Common Objects\n\n[insert_common_objects]\n'),
+                              'Postscript': '<h1 id="rawpost">Raw Postscript</h1>\n\n# Collections\n\n[insert_collections]\n'}
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+    output = DocGenerator([ input_dir ], '/dev/null', config).generate_docs()
+
+    toc_start = output.index('<div class="toc">')
+    toc_end = output.index('</div>', toc_start)
+    toc_links = re.findall(r'<a href="#([^"]+)">([^<]*)</a>', output[toc_start:toc_end])
+
+    parser = ToCParser(['h1', 'h2'])
+    parser.feed(output)
+    assert toc_links == [(x['link_id'], x['text']) for x in parser.close()]
+    assert toc_links[:3] == [('contents', 'Contents'), ('rawhead', 'Raw Heading'), ('common-objects', 'Common Objects')]
+    assert toc_links[-2:] == [('rawpost', 'Raw Postscript'), ('collections', 'Collections')]
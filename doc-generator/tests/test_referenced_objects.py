@@ -120,3 +120,70 @@ def test_html_output(mockRequest):
     output = docGen.generate_docs()
 
     assert expected_output in output, "Failed on: HTML output of Referenced Objects"
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_parallel_rendering_matches_serial(mockRequest):
+    """ Sections rendered in worker processes must merge back, common objects included, exactly as a serial run. """
+
+    for output_format in ['markdown', 'html', 'csv']:
+        for sample in ['network_sample', 'ipaddresses']:
+            config = copy.deepcopy(base_config)
+            config['output_format'] = output_format
+            config['supplemental'] = {'Introduction': "# Common Objects\n\n[insert_common_objects]\n"}
+
+            input_dir = os.path.abspath(os.path.join(testcase_path, sample))
+            config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+            config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+            serial_gen = DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config))
+            serial_output = serial_gen.generate_docs()
+
+            config['jobs'] = 3
+            parallel_gen = DocGenerator([ input_dir ], '/dev/null', config)
+            parallel_output = parallel_gen.generate_docs()
+
+            assert parallel_output == serial_output, "Failed on: " + sample + ', ' + output_format
+            assert (list(parallel_gen.generator.common_properties.keys()) ==
+                    list(serial_gen.generator.common_properties.keys()))
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_extend_property_info_memo(mockRequest):
+    """ Memoized property expansion must produce the same document, and respect the context it was computed in. """
+
+    def extend_property_info_unmemoized(self, schema_ref, prop_info, context_meta=None):
+        return self._extend_property_info(schema_ref, prop_info, context_meta or {})
+
+    input_dir = os.path.abspath(os.path.join(testcase_path, 'network_sample'))
+    for output_format in ['markdown', 'html']:
+        config = copy.deepcopy(base_config)
+        config['output_format'] = output_format
+        config['supplemental'] = {'Introduction': "# Common Objects\n\n[insert_common_objects]\n"}
+        config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+        config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+        with patch('doc_formatter.DocFormatter.extend_property_info', extend_property_info_unmemoized):
+            expected_output = DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config)).generate_docs()
+
+        docGen = DocGenerator([ input_dir ], '/dev/null', config)
+        output = docGen.generate_docs()
+        assert output == expected_output, "Failed on: " + output_format
+        assert docGen.cache_stats()['extend_property_info']['hits'] > 0
+
+    generator = docGen.generator
+    schema_ref = 'redfish.dmtf.org/schemas/v1/NetworkDeviceFunction.json'
+    prop_info = generator.property_data[schema_ref]['properties']['Actions']
+    context_meta = generator.property_data[schema_ref]['doc_generator_meta']
+
+    first = generator.extend_property_info(schema_ref, prop_info, context_meta)
+    stats = generator.memo_stats()
+    second = generator.extend_property_info(schema_ref, prop_info, context_meta)
+    assert generator.memo_stats()['hits'] == stats['hits'] + 1
+    assert first == second and first[0] is not second[0]
+
+    older_context = dict(context_meta, Actions={'version': '1.0.0'})
+    older = generator.extend_property_info(schema_ref, prop_info, older_context)
+    assert generator.memo_stats()['misses'] == stats['misses'] + 1
+    assert older[0]['_doc_generator_meta']['version'] == '1.0.0'
+    assert first[0]['_doc_generator_meta']['version'] == '1.1.0'
@@ -0,0 +1,83 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: test_schema_cache.py
+
+Brief: Tests for the persistent (--cache-dir) schema cache.
+"""
+
+import os
+import copy
+import json
+from unittest.mock import patch
+import pytest
+from doc_gen_util import DocGenUtilities, SchemaCache
+from doc_generator import DocGenerator
+
+testcase_path = os.path.join('tests', 'samples', 'generate_docs_cases', 'general')
+
+base_config = {
+    'expand_defs_from_non_output_schemas': False,
+    'excluded_by_match': ['@odata.count', '@odata.navigationLink'],
+    'profile_resources': {},
+    'units_translation': {},
+    'excluded_annotations_by_match': ['@odata.count', '@odata.navigationLink'],
+    'excluded_schemas': [],
+    'excluded_properties': ['@odata.id', '@odata.context', '@odata.type'],
+    'uri_replacements': {},
+    'profile': {},
+    'escape_chars': [],
+    'output_format': 'markdown',
+}
+
+
+def test_persisted_entry_survives_touch_but_not_edit(tmp_path):
+    schema_file = tmp_path / 'Sample.json'
+    schema_file.write_text('{"title": "#Sample.Sample"}')
+    cache_dir = str(tmp_path / 'cache')
+
+    cache = SchemaCache(cache_dir=cache_dir)
+    cache.put(str(schema_file), {'title': '#Sample.Sample'})
+
+    # A new cache (a new run) picks up the persisted entry:
+    cache = SchemaCache(cache_dir=cache_dir)
+    assert cache.get(str(schema_file)) == {'title': '#Sample.Sample'}
+    assert cache.stats()['disk_hits'] == 1
+
+    # Touching the file without changing it keeps the entry valid:
+    stat = os.stat(str(schema_file))
+    os.utime(str(schema_file), ns=(stat.st_atime_ns, stat.st_mtime_ns + 5000000000))
+    cache = SchemaCache(cache_dir=cache_dir)
+    assert cache.get(str(schema_file)) == {'title': '#Sample.Sample'}
+
+    # Changing the content invalidates it:
+    schema_file.write_text('{"title": "#Sample.Changed"}')
+    cache = SchemaCache(cache_dir=cache_dir)
+    assert cache.get(str(schema_file)) is None
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_warm_run_skips_json_decoding(mockRequest, tmp_path):
+
+    config = copy.deepcopy(base_config)
+    input_dir = os.path.abspath(os.path.join(testcase_path, 'input'))
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+    config['cache_dir'] = str(tmp_path)
+
+    saved_cache = DocGenUtilities.schema_cache
+    try:
+        DocGenUtilities.schema_cache = SchemaCache()
+        cold_output = DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config)).generate_docs()
+
+        # Start over in memory, as a new process would:
+        DocGenUtilities.schema_cache = SchemaCache()
+        with patch('json.load', side_effect=AssertionError('JSON decoded on a warm run')):
+            warm_output = DocGenerator([ input_dir ], '/dev/null', copy.deepcopy(config)).generate_docs()
+
+        assert warm_output == cold_output
+        assert DocGenUtilities.schema_cache.stats()['misses'] == 0
+    finally:
+        DocGenUtilities.schema_cache = saved_cache
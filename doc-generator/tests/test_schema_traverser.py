@@ -29,6 +29,29 @@ class TestSchemaTraverser(unittest.TestCase):
         self.assertIsNone(ref_data)
 
 
+    def test_find_ref_data_leaves_schema_unannotated(self):
+        ref_data = self.schemaTraverser.find_ref_data('Resource#/definitions/Oem')
+        ref_data['description'] = 'Changed by caller'
+        self.assertNotIn('_from_schema_ref', simple_schema['Resource']['definitions']['Oem'])
+
+        ref_data = self.schemaTraverser.find_ref_data('Resource#/definitions/Oem')
+        self.assertEqual(ref_data['description'], 'Oem extension object.')
+        self.assertEqual(ref_data['_prop_name'], 'Oem')
+
+
+    def test_find_ref_data_cache(self):
+        traverser = schema_traverser.SchemaTraverser(simple_schema, {}, {}, ref_cache_size=1)
+        traverser.find_ref_data('Resource#/definitions/Oem')
+        traverser.find_ref_data('Resource#/definitions/Oem')
+        self.assertEqual(traverser.ref_cache_stats(), {'entries': 1, 'max_entries': 1, 'hits': 1, 'misses': 1})
+
+        traverser.find_ref_data('Resource#/definitions/Health')
+        traverser.find_ref_data('Resource#/definitions/Oem')
+        stats = traverser.ref_cache_stats()
+        self.assertEqual(stats['entries'], 1)
+        self.assertEqual(stats['misses'], 3)
+
+
     def test_parse_relative_ref(self):
         self.assertEqual(self.schemaTraverser.parse_ref('#/definitions/Fan', 'Thermal'),
                          'Thermal#/definitions/Fan')
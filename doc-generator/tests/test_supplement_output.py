@@ -13,6 +13,7 @@ import copy
 from unittest.mock import patch
 import pytest
 from doc_generator import DocGenerator
+from doc_formatter import DocFormatter
 
 testcase_path = os.path.join('tests', 'samples', 'supplement_tests')
 
@@ -144,3 +145,31 @@ def test_supplement_description_vs_full_html (mockRequest):
     # Verify that the full description overrides DID NOT retain the reference to the common property:
     ipv6_failed_overrides = [x for x in ipv6_rows if "for details on this property" in x]
     assert len(ipv6_failed_overrides) == 0, "Property full description override incorrectly included reference to common property " + str(len(ipv6_failed_overrides)) + " mentions of Ipv6Address"
+
+
+def test_apply_overrides_precedence():
+    """ Schema overrides beat property overrides; full description overrides beat description overrides.
+    The schema node itself is left alone. """
+
+    config = copy.deepcopy(base_config)
+    config['schema_supplement'] = {'Endpoint': {'description overrides': {'Id': 'Endpoint Id.'},
+                                                'fulldescription overrides': {'Name': 'Endpoint Name.'}}}
+    config['property_description_overrides'] = {'Id': 'Any Id.', 'Name': 'Any Name.', 'Speed': 'Any Speed.'}
+    config['property_fulldescription_overrides'] = {'Speed': 'Full Speed.'}
+    config['units_translation'] = {'Mbit/s': 'Mbps'}
+    formatter = DocFormatter({}, None, config)
+
+    speed = {'description': 'Speed.', 'units': 'Mbit/s', 'properties': {'Value': {'type': 'integer'}}}
+    overridden = formatter.apply_overrides(speed, 'Endpoint', 'Speed')
+    assert overridden['description'] == overridden['longDescription'] == 'Full Speed.'
+    assert overridden['fulldescription_override'] is True
+    assert overridden['units'] == 'Mbps'
+    assert overridden['properties'] is speed['properties']
+    assert speed == {'description': 'Speed.', 'units': 'Mbit/s', 'properties': {'Value': {'type': 'integer'}}}
+
+    # Schema overrides skip units translation:
+    overridden = formatter.apply_overrides({'units': 'Mbit/s'}, 'Endpoint', 'Id')
+    assert (overridden['description'], overridden['fulldescription_override'], overridden['units']) == ('Endpoint Id.', False, 'Mbit/s')
+    assert formatter.apply_overrides({}, 'Endpoint', 'Name')['description'] == 'Endpoint Name.'
+    assert formatter.apply_overrides({}, 'Chassis', 'Name')['description'] == 'Any Name.'
+    assert formatter.apply_overrides({'description': 'Mine.'}, 'Chassis', 'Other')['description'] == 'Mine.'
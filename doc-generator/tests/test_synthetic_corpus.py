@@ -0,0 +1,44 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: test_synthetic_corpus.py
+
+Brief: Tests for the synthetic schema corpus and the benchmark scenarios that run against it.
+"""
+
+import os
+from unittest.mock import patch
+from benchmarks import synthetic_corpus
+from benchmarks.suite import Scenarios, make_config
+from doc_generator import DocGenerator
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_corpus_shape_is_documented(mockRequest, tmp_path):
+    schema_dir = str(tmp_path)
+    count = synthetic_corpus.write_corpus(schema_dir, 3, 2, depth=3, num_common=2, fanout=4)
+    assert count == 3 * (1 + 2) + 2 * (1 + 4)
+
+    output = DocGenerator([schema_dir], os.devnull, make_config(schema_dir)).generate_docs()
+
+    # Every resource, at its latest version, with its nested objects:
+    for r in range(3):
+        assert '# Resource' + str(r) + ' 1.1.0' in output
+    assert output.count('The value at level 3.') == 3
+    # The common objects, documented once each, with a field from each of their versions:
+    for c in range(2):
+        assert output.count('# Common' + str(c) + '\n') == 1
+    assert output.count('| **Field3** *(v1.3+)* |') == 2
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_scenarios_run(mockRequest, tmp_path):
+    schema_dir = str(tmp_path)
+    synthetic_corpus.write_corpus(schema_dir, 2, 2, depth=2, num_common=1, fanout=2)
+    scenarios = Scenarios(schema_dir)
+    assert scenarios.refs
+
+    for name in Scenarios.names:
+        assert scenarios.time(name, repeat=1, min_time=0) > 0, name
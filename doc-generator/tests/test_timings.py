@@ -0,0 +1,102 @@
+# Copyright Notice:
+# Copyright 2018 Distributed Management Task Force, Inc. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Tools/blob/master/LICENSE.md
+
+"""
+File: test_timings.py
+
+Brief: Tests for phase timings and counters (--timings).
+"""
+
+import os
+import copy
+import json
+from unittest.mock import patch
+import doc_generator
+from doc_gen_util import DocGenUtilities, Timings
+from doc_generator import DocGenerator
+
+testcase_path = os.path.join('tests', 'samples', 'referenced_objects', 'network_sample')
+
+base_config = {
+    'expand_defs_from_non_output_schemas': False,
+    'excluded_by_match': ['@odata.count', '@odata.navigationLink'],
+    'profile_resources': {},
+    'units_translation': {},
+    'excluded_annotations_by_match': ['@odata.count', '@odata.navigationLink'],
+    'excluded_schemas': [],
+    'excluded_properties': ['@odata.id', '@odata.context', '@odata.type'],
+    'uri_replacements': {},
+    'wants_common_objects': True,
+    'profile': {},
+    'escape_chars': [],
+    'profile_mode': False,
+}
+
+
+def test_timings_record_only_when_enabled():
+    timings = Timings()
+    # contextlib.nullcontext is new in Python 3.7; phase() runs on every run, so it mustn't need it.
+    with patch('contextlib.nullcontext', side_effect=AssertionError('Python 3.7+ only')):
+        with timings.phase('render_section', 'Chassis'):
+            timings.count('find_ref_data')
+    assert timings.report() == {'phases': {}, 'counters': {}}
+
+    timings.enabled = True
+    for item in ['Chassis', 'Chassis', 'Power']:
+        with timings.phase('render_section', item):
+            timings.count('find_ref_data', 2)
+    with timings.phase('total'):
+        pass
+    report = timings.report()
+    assert report['phases']['render_section']['calls'] == 3
+    assert sorted(report['phases']['render_section']['items']) == ['Chassis', 'Power']
+    assert 'items' not in report['phases']['total']
+    assert report['counters'] == {'find_ref_data': 6}
+
+    timings.reset()
+    assert timings.report() == {'phases': {}, 'counters': {}}
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_timings_report(mockRequest, tmp_path):
+    input_dir = os.path.abspath(testcase_path)
+    config = copy.deepcopy(base_config)
+    config['output_format'] = 'html'
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = {input_dir: 'redfish.dmtf.org/schemas/v1'}
+    config['timings'] = str(tmp_path / 'timings.json')
+    outfile_name = str(tmp_path / 'index.html')
+
+    DocGenUtilities.timings.reset()
+    try:
+        DocGenerator([input_dir], open(outfile_name, 'w', encoding='utf8'), config).generate_doc()
+    finally:
+        DocGenUtilities.timings.enabled = False
+        DocGenUtilities.timings.reset()
+
+    with open(config['timings'], encoding='utf8') as report_file:
+        report = json.load(report_file)
+    for phase in ['total', 'discover_files', 'group_files', 'process_files', 'process_unversioned_files',
+                  'render', 'render_section', 'common_objects', 'markdown_to_html', 'write_output']:
+        assert phase in report['phases'], phase
+    assert 'redfish.dmtf.org/schemas/v1/NetworkPort.json' in report['phases']['render_section']['items']
+    assert report['counters']['find_ref_data'] > 0
+    assert report['counters']['bytes_written'] == os.path.getsize(outfile_name)
+    assert report['caches']['markdown_to_html']['misses'] == report['phases']['markdown_to_html']['calls']
+
+
+def test_timings_arguments():
+    """ --timings doesn't take a value, so it can't swallow the input path that follows it. """
+    parser = doc_generator.make_arg_parser()
+    args = parser.parse_args(['--timings', 'path/to/schemas'])
+    assert args.timings and args.timings_out is None
+    assert args.import_from == ['path/to/schemas']
+
+    args = parser.parse_args(['--timings-out', 'timings.json', 'path/to/schemas'])
+    assert args.timings_out == 'timings.json'
+    assert args.import_from == ['path/to/schemas']
+
+    args = parser.parse_args(['--watch', 'path/to/schemas'])
+    assert args.watch and args.watch_interval == 1.0
+    assert args.import_from == ['path/to/schemas']
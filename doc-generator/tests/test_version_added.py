@@ -13,6 +13,7 @@ import copy
 from unittest.mock import patch
 import pytest
 from doc_generator import DocGenerator
+from doc_formatter import DocFormatter
 from .discrepancy_list import DiscrepancyList
 
 testcase_path = os.path.join('tests', 'samples')
@@ -173,3 +174,27 @@ def test_version_added_output_Chassis(mockRequest):
             discrepancies.append('"' + expected + '" not found')
 
     assert [] == discrepancies
+
+
+def test_merge_full_metadata_shares_unchanged_nodes():
+    formatter = DocFormatter({}, None, copy.deepcopy(base_config))
+    meta_a = {'version': '1.2.0',
+              'Status': {'version': '1.0.0', 'Health': {'version': '1.0.0'}},
+              'Links': {'version': '1.10.0'}}
+    meta_b = {'version': '1.10.0',
+              'Status': {'version': '1.1.0', 'Health': {'version': '1.1.0'}},
+              'Links': {'version': '1.9.0', 'Oem': {'version': '1.9.0'}},
+              'Actions': {'version': '1.3.0'}}
+    snapshot_a, snapshot_b = copy.deepcopy(meta_a), copy.deepcopy(meta_b)
+
+    merged = formatter.merge_full_metadata(meta_a, meta_b)
+
+    assert merged == {'version': '1.2.0',
+                      'Status': {'version': '1.0.0', 'Health': {'version': '1.0.0'}},
+                      'Links': {'version': '1.9.0', 'Oem': {'version': '1.9.0'}},
+                      'Actions': {'version': '1.3.0'}}
+    # Neither input is modified; unchanged nodes are shared rather than copied:
+    assert meta_a == snapshot_a and meta_b == snapshot_b
+    assert merged['Status'] is meta_a['Status']
+    assert merged['Actions'] is meta_b['Actions']
+    assert formatter.merge_full_metadata(meta_a, meta_a) is meta_a
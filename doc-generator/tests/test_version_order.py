@@ -59,3 +59,26 @@ def test_version_order(mockRequest):
     cos_filenames = [x['filename'] for x in cos_group]
     assert cos_filenames == ['ClassOfService.v1_0_0.json', 'ClassOfService.v1_0_1.json',
                              'ClassOfService.v1_0_2.json', 'ClassOfService.v1_1_0.json', 'ClassOfService.v1_1_1.json']
+
+
+@patch('urllib.request') # so we don't make HTTP requests. NB: samples should not call for outside resources.
+def test_unversioned_ref_group(mockRequest):
+    """ An unversioned schema whose definition is an anyOf with a $ref to another unversioned file groups
+    that file (which has no version to sort by) and renders it.
+    """
+
+    config = copy.deepcopy(base_config)
+    input_dir = os.path.abspath(os.path.join(testcase_path, 'unversioned_ref'))
+
+    config['uri_to_local'] = {'redfish.dmtf.org/schemas/v1': input_dir}
+    config['local_to_uri'] = { input_dir : 'redfish.dmtf.org/schemas/v1'}
+
+    docGen = DocGenerator([ input_dir ], '/dev/null', config)
+
+    files_to_process = docGen.get_files(docGen.import_from)
+    grouped_files, schema_data = docGen.group_files(files_to_process)
+    foo_group = grouped_files['redfish.dmtf.org/schemas/v1/Foo.json']
+    assert [x['filename'] for x in foo_group] == ['Bar.json']
+
+    output = docGen.generate_docs()
+    assert '| **Name** | string<br><br>*read-only* | The name of the Bar. |' in output